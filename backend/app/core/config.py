@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_AUTH_PER_MINUTE: int = 5  # Stricter for auth endpoints
+    BCRYPT_ROUNDS: int = 12  # bcrypt cost factor; hashes with another cost are upgraded on login
+    PASSWORD_HASH_MAX_WORKERS: int = 4  # Threads dedicated to bcrypt hashing and verification
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Queued + running bcrypt calls before new ones get a 503
     
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:3001", "http://localhost:5173"]
@@ -40,6 +43,12 @@ class Settings(BaseSettings):
     DYNAMODB_AUDIT_TABLE: str = "time_tracking_audit"
     DYNAMODB_HOLIDAYS_TABLE: str = "time_tracking_holidays"
     DYNAMODB_LEAVE_REQUESTS_TABLE: str = "time_tracking_leave_requests"
+    DYNAMODB_DAILY_TOTALS_TABLE: str = "time_tracking_daily_totals"
+    DYNAMODB_MIGRATIONS_TABLE: str = "time_tracking_migrations"  # Completion markers of one-off migrations
+    DYNAMODB_MAX_WORKERS: int = 16  # Thread pool size for blocking boto3 calls
+    DYNAMODB_SCAN_SEGMENTS: int = 4  # Parallel segments for full-table timelog scans
+    DYNAMODB_MAX_PARALLEL_READS: int = 4  # Queries or scan segments of one read that run at a time
+    DYNAMODB_MONTH_SHARDS: int = 4  # Write shards per month in the timelog month index (re-run the backfill after changing)
     
     # Time Tracking Settings
     OVERTIME_THRESHOLD_HOURS: float = 8.0  # Hours per day before overtime
@@ -47,6 +56,26 @@ class Settings(BaseSettings):
     MAX_HOURS_PER_DAY: float = 24.0  # Maximum hours that can be logged per day
     MAX_EDIT_DAYS: int = 30  # Days after which employees can't edit logs
     ALLOW_MULTIPLE_LOGS_PER_DAY: bool = True  # Allow multiple time logs per day (False = only one log per day)
+    HOLIDAY_CACHE_TTL_SECONDS: int = 3600  # How long each process keeps the holiday calendar in memory
+    HOLIDAYS_JP_API_URL: str = "https://holidays-jp.github.io/api/v1/date.json"
+    HOLIDAYS_JP_FILE: str = ""  # Local holidays-jp style JSON file for offline syncs
+    
+    # Caches
+    USER_CACHE_TTL_SECONDS: int = 60  # How long an authenticated user is served from memory
+    USER_CACHE_MAX_ENTRIES: int = 1024
+    JWT_CACHE_MAX_ENTRIES: int = 4096  # Verified access tokens kept to skip repeat signature checks
+    REPORT_CACHE_TTL_SECONDS: int = 300  # Bounds staleness from time log writes made by other processes
+    REPORT_CACHE_MAX_ENTRIES: int = 256
+    
+    # Audit log
+    AUDIT_QUEUE_MAX_SIZE: int = 10000  # Queued audit entries before new ones are dropped
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0  # Longest an audit entry waits before being written
+    
+    # Export jobs
+    EXPORT_DIR: str = ""  # Where finished exports are kept; defaults to a folder in the system temp dir
+    EXPORT_JOB_TTL_SECONDS: int = 3600  # How long a finished export can be downloaded
+    EXPORT_MAX_CONCURRENT_JOBS: int = 2
+    EXPORT_CLEANUP_INTERVAL_SECONDS: int = 300
     
     # Pagination
     DEFAULT_PAGE_SIZE: int = 50
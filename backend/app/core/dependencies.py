@@ -1,13 +1,22 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.security import decode_access_token
 from app.models.user import UserRole
-from app.db.dynamodb import get_user_by_id
+from app.db.dynamodb import get_cached_user_by_id
 
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Get the current authenticated user."""
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Get the current authenticated user.
+    
+    The user is resolved once per request and kept on request.state, and
+    across requests it comes from the in-process user cache.
+    """
+    memoized = getattr(request.state, "current_user", None)
+    if memoized is not None:
+        return memoized
+    
     token = credentials.credentials
     payload = decode_access_token(token)
     if payload is None:
@@ -23,13 +32,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = await get_user_by_id(user_id)
+    user = await get_cached_user_by_id(user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    request.state.current_user = user
     return user
 
 async def get_current_admin_user(current_user = Depends(get_current_user)):
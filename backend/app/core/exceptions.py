@@ -78,3 +78,14 @@ class DatabaseError(AppException):
             error_code=error_code
         )
 
+
+class ServiceUnavailableError(AppException):
+    """Temporary overload error; the client should retry later."""
+    def __init__(self, detail: str = "Service temporarily unavailable",
+                 error_code: str = "SERVICE_UNAVAILABLE", retry_after: Optional[int] = None):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)} if retry_after else None,
+            error_code=error_code
+        )
@@ -1,8 +1,17 @@
+import asyncio
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Any, Callable, Optional, Dict, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+
+T = TypeVar("T")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -11,8 +20,58 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+    """Hash a password with the configured bcrypt cost."""
+    return pwd_context.handler("bcrypt").using(rounds=settings.BCRYPT_ROUNDS).hash(password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a bcrypt hash was made with a cost other than BCRYPT_ROUNDS."""
+    try:
+        return pwd_context.handler("bcrypt").from_string(hashed_password).rounds != settings.BCRYPT_ROUNDS
+    except ValueError:
+        return False
+
+# bcrypt is deliberately slow CPU work (hundreds of ms per call), so async
+# handlers run it on a dedicated pool instead of the event loop. bcrypt
+# releases the GIL while hashing, so threads run in parallel. The number of
+# queued and running calls is capped so a login burst is shed with 503s
+# instead of building an unbounded backlog.
+_password_executor: Optional[ThreadPoolExecutor] = None
+_pending_password_tasks = 0
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+            thread_name_prefix="bcrypt"
+        )
+    return _password_executor
+
+async def _run_password_task(func: Callable[..., T], *args: Any) -> T:
+    global _pending_password_tasks
+    if _pending_password_tasks >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise ServiceUnavailableError("Too many password operations in progress, please retry", retry_after=1)
+    _pending_password_tasks += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_password_executor(), functools.partial(func, *args))
+    finally:
+        _pending_password_tasks -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt pool without blocking the event loop."""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bcrypt pool without blocking the event loop."""
+    return await _run_password_task(get_password_hash, password)
+
+def shutdown_password_executor(wait: bool = True) -> None:
+    """Shut down the bcrypt pool. A new one is created on the next call."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=wait)
+        _password_executor = None
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -39,16 +98,38 @@ def create_refresh_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Access tokens that already passed verification, keyed by their SHA-256
+# digest. A session reuses its token for every request, so repeat requests
+# skip the signature check; each entry expires with the token's exp.
+verified_token_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_MAX_ENTRIES,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and verify a JWT access token."""
+    """Decode and verify a JWT access token, reusing recent verifications."""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    cached = verified_token_cache.get(digest)
+    if cached is not None:
+        return dict(cached)
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         # Verify it's an access token
         if payload.get("type") != "access":
             return None
-        return payload
     except JWTError:
         return None
+    
+    if "exp" in payload:
+        # exp is wall-clock time; the cache counts in monotonic time
+        expires_at = time.monotonic() + (payload["exp"] - time.time())
+        verified_token_cache.set(digest, dict(payload), expires_at=expires_at)
+    return payload
+
+def token_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the verified access token cache."""
+    return verified_token_cache.stats()
 
 def decode_refresh_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT refresh token."""
@@ -0,0 +1,109 @@
+"""
+Buffered background writer for audit log entries.
+
+Mutating endpoints only append their audit entry to an in-memory queue; a
+background task started with the application drains it in BatchWriteItem
+batches, so audit writes stay off the request path. The queue is bounded:
+when it is full new entries are dropped and counted rather than slowing
+requests down. Remaining entries are flushed at shutdown.
+"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class AuditLogWriter:
+    """In-process audit queue drained by a background task."""
+
+    def __init__(self, write_batch: Callable[[List[dict]], Awaitable[Any]],
+                 max_queue_size: int, flush_interval: float, batch_size: int = 25):
+        """
+        Args:
+            write_batch: Coroutine function that stores a list of audit items
+            max_queue_size: Entries held before new ones are dropped
+            flush_interval: Seconds between flushes when the queue is not full
+            batch_size: Entries per write_batch call
+        """
+        self.write_batch = write_batch
+        self.max_queue_size = max_queue_size
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: Deque[dict] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def enqueue(self, item: dict) -> bool:
+        """
+        Queue an audit item without waiting for it to be written.
+
+        Returns:
+            False if the queue was full and the item was dropped
+        """
+        if len(self._queue) >= self.max_queue_size:
+            self.dropped += 1
+            logger.warning("Audit queue full, dropping entry", action=item.get("action"), dropped=self.dropped)
+            return False
+        self._queue.append(item)
+        self.enqueued += 1
+        if self._wakeup is not None and len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> None:
+        """Write every queued item now, in batches."""
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await self.write_batch(batch)
+                self.written += len(batch)
+            except Exception as e:
+                # Audit logging must never take the application down
+                self.failed += len(batch)
+                logger.error("Failed to write audit batch", entries=len(batch), error=str(e))
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background task on the running event loop."""
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and flush whatever is still queued."""
+        if self._task is not None:
+            # Let the task finish the batch it is writing instead of cancelling
+            # it mid-write, which would lose the entries already taken off the queue
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and counters, for health and metrics endpoints."""
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_size": self.max_queue_size,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
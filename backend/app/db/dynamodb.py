@@ -1,25 +1,41 @@
+import asyncio
 import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 from datetime import datetime, date
 import uuid
+import zlib
 from app.core.config import settings
 from app.models.user import UserRole
 from app.core.logging_config import get_logger
-from app.core.exceptions import DatabaseError
+from app.core.cache import TTLCache
+from app.core.exceptions import ConflictError, DatabaseError, ValidationError
+from app.db.audit_writer import AuditLogWriter
+from app.db.executor import run_in_executor
+from app.db.pagination import paginate, parallel_paginate, parallel_scan, fill_page, fill_page_sequential
+from app.db.query_planner import TimelogQueryPlan, USER_START_TIME_INDEX_NAME, plan_timelog_query, month_shard_key
 from decimal import Decimal
 
 logger = get_logger(__name__)
 
 
 # Initialize DynamoDB client
+# boto3 is blocking, so every table call below goes through run_in_executor.
+# The HTTP connection pool matches the executor size so worker threads never
+# queue up waiting for a free connection.
 dynamodb_kwargs = {
     'region_name': settings.AWS_REGION,
-    'endpoint_url': settings.DYNAMODB_ENDPOINT_URL,
     'aws_access_key_id': 'dummy',
-    'aws_secret_access_key': 'dummy'
+    'aws_secret_access_key': 'dummy',
+    'config': Config(max_pool_connections=settings.DYNAMODB_MAX_WORKERS)
 }
 
+# Add endpoint URL for DynamoDB Local if provided
+if settings.DYNAMODB_ENDPOINT_URL:
+    dynamodb_kwargs['endpoint_url'] = settings.DYNAMODB_ENDPOINT_URL
+
 dynamodb = boto3.resource('dynamodb', **dynamodb_kwargs)
 
 # Get table references
@@ -28,6 +44,59 @@ timelogs_table = dynamodb.Table(settings.DYNAMODB_TIMELOGS_TABLE)
 audit_table = dynamodb.Table(settings.DYNAMODB_AUDIT_TABLE)
 holidays_table = dynamodb.Table(settings.DYNAMODB_HOLIDAYS_TABLE)
 leave_requests_table = dynamodb.Table(settings.DYNAMODB_LEAVE_REQUESTS_TABLE)
+daily_totals_table = dynamodb.Table(settings.DYNAMODB_DAILY_TOTALS_TABLE)
+
+# Maximum number of actions in a single TransactWriteItems request
+TRANSACT_WRITE_MAX_ITEMS = 100
+
+# Maximum number of puts in a single BatchWriteItem request, and how many
+# times a batch's unprocessed items are resent before giving up
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_ATTEMPTS = 5
+
+async def batch_put_items(table_name: str, items: List[dict]) -> List[int]:
+    """
+    Put many items with BatchWriteItem, BATCH_WRITE_MAX_ITEMS per request.
+    
+    DynamoDB may leave part of a batch unprocessed when throttled; those
+    items are resent with exponential backoff up to BATCH_WRITE_MAX_ATTEMPTS.
+    Puts are unconditional, so an existing item with the same key is replaced.
+    
+    Returns:
+        Number of items written by each batch, in order
+    """
+    batch_counts = []
+    for start in range(0, len(items), BATCH_WRITE_MAX_ITEMS):
+        batch = items[start:start + BATCH_WRITE_MAX_ITEMS]
+        request_items = {table_name: [{"PutRequest": {"Item": item}} for item in batch]}
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            try:
+                response = await run_in_executor(dynamodb.batch_write_item, RequestItems=request_items)
+            except ClientError as e:
+                logger.error("Failed to batch write items", table=table_name, error=str(e))
+                raise DatabaseError("Failed to write items") from e
+            request_items = response.get("UnprocessedItems") or {}
+            if not request_items:
+                break
+            logger.warning(
+                "Retrying unprocessed batch items",
+                table=table_name,
+                unprocessed=len(request_items.get(table_name, [])),
+                attempt=attempt + 1
+            )
+            await asyncio.sleep(0.05 * 2 ** attempt)
+        else:
+            logger.error("Batch items still unprocessed after retries", table=table_name)
+            raise DatabaseError("Failed to write items")
+        batch_counts.append(len(batch))
+    return batch_counts
+
+def timelog_month_attributes(log_id: str, start_time: datetime) -> Dict[str, str]:
+    """Return the month and month_shard attributes that place a time log in the month index."""
+    # Same prefix as the stored ISO start_time, so month and day queries agree
+    month = start_time.isoformat()[:7]
+    shard = zlib.crc32(log_id.encode()) % settings.DYNAMODB_MONTH_SHARDS
+    return {"month": month, "month_shard": month_shard_key(month, shard)}
 
 def normalize_timelog_item(item: dict) -> dict:
     """Convert DynamoDB item to a normalized dict with proper types."""
@@ -59,67 +128,170 @@ def normalize_timelog_item(item: dict) -> dict:
     return normalized
 
 # Holiday operations
-async def create_holiday(holiday_data: dict) -> dict:
-    """Create a new holiday in DynamoDB."""
-    holiday_id = str(uuid.uuid4())
+def holiday_id_for_date(holiday_date: date) -> str:
+    """Holiday key derived from its date, so each date can hold only one holiday."""
+    return f"holiday-{holiday_date.isoformat()}"
+
+def _holiday_date(value: Any) -> date:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).date()
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+async def _put_holiday_if_absent(holiday_data: dict) -> Tuple[dict, bool]:
+    """
+    Write a holiday with a conditional put on its date-derived key.
+    
+    Returns:
+        (holiday, was_created); the stored holiday if the date was taken
+    """
+    holiday_date = _holiday_date(holiday_data["date"])
     item = {
-        "id": holiday_id,
+        "id": holiday_id_for_date(holiday_date),
         "name": holiday_data["name"],
-        "date": holiday_data["date"].isoformat(),
+        "date": holiday_date.isoformat(),
         "created_at": datetime.utcnow().isoformat()
     }
-    holidays_table.put_item(Item=item)
-    return item
+    try:
+        await run_in_executor(
+            holidays_table.put_item,
+            Item=item,
+            ConditionExpression="attribute_not_exists(id)",
+            # A duplicate returns the stored holiday with the error, no extra read
+            ReturnValuesOnConditionCheckFailure="ALL_OLD"
+        )
+        return item, True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            # Error responses are not deserialized by the Table resource
+            stored = e.response.get("Item")
+            if stored:
+                deserializer = TypeDeserializer()
+                item = {key: deserializer.deserialize(value) for key, value in stored.items()}
+            return item, False
+        logger.error("Failed to create holiday", date=item["date"], error=str(e))
+        raise DatabaseError("Failed to create holiday") from e
+
+async def create_holiday(holiday_data: dict) -> dict:
+    """Create a new holiday in DynamoDB, rejecting a second holiday on the same date."""
+    holiday, was_created = await _put_holiday_if_absent(holiday_data)
+    if not was_created:
+        raise ConflictError(f"A holiday already exists on {holiday['date']}")
+    return holiday
+
+async def iter_holidays() -> AsyncIterator[dict]:
+    """Stream all holidays page by page."""
+    async for item in paginate(holidays_table.scan):
+        yield item
 
 async def get_all_holidays() -> List[dict]:
     """Get all holidays."""
-    response = holidays_table.scan()
-    return response.get("Items", [])
+    return [item async for item in iter_holidays()]
 
 async def get_holiday_by_date(holiday_date: date) -> Optional[dict]:
-    """Get a holiday by date. Since date is not a key, we need to scan and filter."""
-    # Use ExpressionAttributeNames to escape reserved keyword "date"
-    response = holidays_table.scan(
-        FilterExpression="#date = :date",
-        ExpressionAttributeNames={"#date": "date"},
-        ExpressionAttributeValues={":date": holiday_date.isoformat()}
-    )
+    """Get a holiday by date through the date-index GSI."""
+    try:
+        response = await run_in_executor(
+            holidays_table.query,
+            IndexName="date-index",
+            # "date" is a reserved word
+            KeyConditionExpression="#date = :date",
+            ExpressionAttributeNames={"#date": "date"},
+            ExpressionAttributeValues={":date": holiday_date.isoformat()},
+            Limit=1
+        )
+    except ClientError as e:
+        logger.error("Failed to get holiday by date", date=holiday_date.isoformat(), error=str(e))
+        raise DatabaseError("Failed to retrieve holiday") from e
     items = response.get("Items", [])
     return items[0] if items else None
 
 async def create_holiday_if_not_exists(holiday_data: dict) -> Tuple[dict, bool]:
     """
     Create a holiday only if it doesn't already exist for that date.
-    Returns (holiday_dict, was_created: bool)
-    """
-    holiday_date = holiday_data["date"]
-    if isinstance(holiday_date, str):
-        holiday_date = datetime.fromisoformat(holiday_date).date()
-    elif isinstance(holiday_date, datetime):
-        holiday_date = holiday_date.date()
     
-    existing = await get_holiday_by_date(holiday_date)
-    if existing:
-        return existing, False  # Return existing holiday, not created
+    The duplicate check is the conditional put itself, so this costs one
+    write whether or not the holiday exists.
     
-    # Create new holiday
-    new_holiday = await create_holiday(holiday_data)
-    return new_holiday, True  # Return new holiday, was created
+    Returns (holiday_dict, was_created: bool)
+    """
+    return await _put_holiday_if_absent(holiday_data)
 
 async def get_holidays_as_dates() -> List[date]:
     """Get all holidays as a list of date objects."""
-    holidays = await get_all_holidays()
-    return [datetime.fromisoformat(h["date"]).date() for h in holidays]
+    return [datetime.fromisoformat(h["date"]).date() async for h in iter_holidays()]
+
+async def batch_create_holidays(holidays: List[dict]) -> List[int]:
+    """
+    Write new holidays in batches, keyed by date like create_holiday.
+    
+    Callers are expected to leave out dates that already have a holiday;
+    a date written twice simply keeps the later name.
+    
+    Returns:
+        Number of holidays written by each batch, in order
+    """
+    created_at = datetime.utcnow().isoformat()
+    items = []
+    for holiday in holidays:
+        holiday_date = _holiday_date(holiday["date"])
+        items.append({
+            "id": holiday_id_for_date(holiday_date),
+            "name": holiday["name"],
+            "date": holiday_date.isoformat(),
+            "created_at": created_at
+        })
+    return await batch_put_items(settings.DYNAMODB_HOLIDAYS_TABLE, items)
 
 async def delete_holiday(holiday_id: str) -> bool:
     """Delete a holiday by ID."""
     try:
-        holidays_table.delete_item(Key={"id": holiday_id})
+        await run_in_executor(holidays_table.delete_item, Key={"id": holiday_id})
         return True
     except ClientError as e:
         logger.error("Failed to delete holiday", holiday_id=holiday_id, error=str(e))
         raise DatabaseError("Failed to delete holiday") from e
 
+async def migrate_holiday_id(holiday: dict) -> bool:
+    """
+    Move a holiday stored under an older random id to its date-derived key.
+    
+    The conditional puts in create_holiday only see holidays keyed by
+    holiday_id_for_date, so holidays created before that still need moving.
+    If the date-derived key is already taken, the older item is a duplicate
+    and is only deleted.
+    
+    Returns:
+        True if the holiday was moved, False if it was a duplicate or already keyed by date
+    """
+    new_id = holiday_id_for_date(_holiday_date(holiday["date"]))
+    if holiday["id"] == new_id:
+        return False
+    delete = {"Delete": {"TableName": settings.DYNAMODB_HOLIDAYS_TABLE, "Key": {"id": holiday["id"]}}}
+    try:
+        await run_in_executor(
+            dynamodb.meta.client.transact_write_items,
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": settings.DYNAMODB_HOLIDAYS_TABLE,
+                        "Item": dict(holiday, id=new_id),
+                        "ConditionExpression": "attribute_not_exists(id)",
+                    }
+                },
+                delete,
+            ]
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+            logger.error("Failed to migrate holiday", holiday_id=holiday["id"], error=str(e))
+            raise DatabaseError("Failed to migrate holiday") from e
+    # The date already has a holiday under its date-derived key
+    await delete_holiday(holiday["id"])
+    return False
+
 # User operations
 async def create_user(user_data: dict) -> dict:
     """Create a new user in DynamoDB."""
@@ -134,35 +306,56 @@ async def create_user(user_data: dict) -> dict:
         "created_at": datetime.utcnow().isoformat(),
         "updated_at": None
     }
-    users_table.put_item(Item=item)
+    await run_in_executor(users_table.put_item, Item=item)
     return item
 
 async def get_user_by_email(email: str) -> Optional[dict]:
-    """Get a user by email."""
+    """Get a user by email using the email-index GSI."""
     try:
-        response = users_table.scan(
-            FilterExpression="email = :email",
-            ExpressionAttributeValues={":email": email}
+        response = await run_in_executor(
+            users_table.query,
+            IndexName="email-index",
+            KeyConditionExpression="email = :email",
+            ExpressionAttributeValues={":email": email},
+            Limit=1
         )
         items = response.get("Items", [])
         return items[0] if items else None
-    except ClientError:
-        return None
+    except ClientError as e:
+        # Tables created before the index existed need `python migrate_dynamodb.py`
+        logger.error("Failed to get user by email", error=str(e), error_code=e.response.get("Error", {}).get("Code"))
+        raise DatabaseError("Failed to retrieve user") from e
 
 async def get_user_by_id(user_id: str) -> Optional[dict]:
     """Get a user by ID."""
     try:
-        response = users_table.get_item(Key={"user_id": user_id})
+        response = await run_in_executor(users_table.get_item, Key={"user_id": user_id})
         if "Item" in response:
             return response["Item"]
         return None
     except ClientError:
         return None
 
+# Users resolved for authenticated requests. Entries are dropped by update_user
+# and delete_user; other processes see changes once USER_CACHE_TTL_SECONDS pass.
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+async def get_cached_user_by_id(user_id: str) -> Optional[dict]:
+    """Get a user by ID through the in-process user cache, without the password hash."""
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await get_user_by_id(user_id)
+        if user is None:
+            return None
+        user = {key: value for key, value in user.items() if key != "password_hash"}
+        user_cache.set(user_id, user)
+    # Callers get their own copy so they cannot change the cached entry
+    return dict(user)
+
 async def get_user_by_id_with_secret(user_id: str) -> Optional[dict]:
     """Get a user by ID including password hash (for authentication)."""
     try:
-        response = users_table.get_item(Key={"user_id": user_id})
+        response = await run_in_executor(users_table.get_item, Key={"user_id": user_id})
         if "Item" in response:
             return response["Item"]
         return None
@@ -191,43 +384,45 @@ async def update_user(user_id: str, update_data: dict) -> Optional[dict]:
     update_expression = "SET " + ", ".join(update_expression_parts)
     
     try:
-        users_table.update_item(
+        response = await run_in_executor(
+            users_table.update_item,
             Key={"user_id": user_id},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
             ExpressionAttributeNames=expression_attribute_names,
             ReturnValues="ALL_NEW"
         )
-        return await get_user_by_id(user_id)
     except ClientError as e:
         logger.error("Failed to update user", user_id=user_id, error=str(e))
         raise DatabaseError("Failed to update user") from e
+    finally:
+        # Role, profile and password changes must not be served from the cache
+        user_cache.invalidate(user_id)
+    # ALL_NEW already holds the updated item, so no follow-up read is needed
+    return response["Attributes"]
 
 async def delete_user(user_id: str) -> bool:
     """Delete a user."""
     try:
-        users_table.delete_item(Key={"user_id": user_id})
+        await run_in_executor(users_table.delete_item, Key={"user_id": user_id})
         return True
     except ClientError as e:
         logger.error("Failed to delete user", user_id=user_id, error=str(e))
         raise DatabaseError("Failed to delete user") from e
+    finally:
+        user_cache.invalidate(user_id)
 
 async def get_all_users(page: Optional[int] = None, page_size: Optional[int] = None,
                         last_evaluated_key: Optional[Dict[str, Any]] = None) -> tuple[List[dict], Optional[Dict[str, Any]]]:
-    """Get all users with pagination."""
-    scan_kwargs = {}
-    
-    if page_size:
-        scan_kwargs["Limit"] = page_size
-    if last_evaluated_key:
-        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+    """
+    Get all users with pagination.
     
+    Without page_size every user is returned and the returned key is None.
+    """
     try:
-        response = users_table.scan(**scan_kwargs)
-        items = response.get("Items", [])
-        last_key = response.get("LastEvaluatedKey")
-        
-        return items, last_key
+        if not page_size:
+            return [item async for item in paginate(users_table.scan)], None
+        return await fill_page(users_table.scan, ["user_id"], page_size, last_evaluated_key)
     except ClientError as e:
         logger.error("Failed to get users", error=str(e), error_code=e.response.get("Error", {}).get("Code"))
         raise DatabaseError("Failed to retrieve users") from e
@@ -248,143 +443,171 @@ async def create_timelog(timelog_data: dict) -> dict:
         "context": timelog_data.get("context"),
         "attendance_type": timelog_data.get("attendance_type", "work"),
         "work_location": timelog_data.get("work_location"),
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow().isoformat(),
+        **timelog_month_attributes(log_id, timelog_data["start_time"])
     }
-    timelogs_table.put_item(Item=item)
+    await run_in_executor(timelogs_table.put_item, Item=item)
+    await apply_daily_total_changes(None, item)
     return normalize_timelog_item(item)
 
 async def get_timelog_by_id(log_id: str) -> Optional[dict]:
     """Get a time log by ID."""
     try:
-        response = timelogs_table.get_item(Key={"log_id": log_id})
+        response = await run_in_executor(timelogs_table.get_item, Key={"log_id": log_id})
         if "Item" in response:
             return normalize_timelog_item(response["Item"])
         return None
     except ClientError:
         return None
 
+async def iter_timelogs_by_user(user_id: str, start_date: Optional[datetime] = None,
+                                end_date: Optional[datetime] = None) -> AsyncIterator[dict]:
+    """Stream time logs for a user, optionally limited to a start_time range."""
+    async for log in iter_all_timelogs(start_date, end_date, user_id=user_id):
+        yield log
+
 async def get_timelogs_by_user(user_id: str, start_date: Optional[datetime] = None, 
                                end_date: Optional[datetime] = None) -> List[dict]:
-    """Get time logs for a user."""
-    try:
-        # Query using GSI on user_id
-        key_condition = "user_id = :user_id"
-        expression_values = {":user_id": user_id}
-        
-        if start_date or end_date:
-            filter_expression_parts = []
-            if start_date:
-                filter_expression_parts.append("start_time >= :start_date")
-                expression_values[":start_date"] = start_date.isoformat()
-            if end_date:
-                filter_expression_parts.append("start_time <= :end_date")
-                expression_values[":end_date"] = end_date.isoformat()
-            
-            response = timelogs_table.query(
-                IndexName="user_id-index",
-                KeyConditionExpression=key_condition,
-                FilterExpression=" AND ".join(filter_expression_parts) if filter_expression_parts else None,
-                ExpressionAttributeValues=expression_values
-            )
-        else:
-            response = timelogs_table.query(
-                IndexName="user_id-index",
-                KeyConditionExpression=key_condition,
-                ExpressionAttributeValues=expression_values
-            )
-        
-        items = response.get("Items", [])
-        return [normalize_timelog_item(item) for item in items]
-    except ClientError:
-        # Fallback to scan if GSI doesn't exist
-        filter_expression = "user_id = :user_id"
-        expression_values = {":user_id": user_id}
-        
-        if start_date:
-            filter_expression += " AND start_time >= :start_date"
-            expression_values[":start_date"] = start_date.isoformat()
-        if end_date:
-            filter_expression += " AND start_time <= :end_date"
-            expression_values[":end_date"] = end_date.isoformat()
-        
-        response = timelogs_table.scan(
-            FilterExpression=filter_expression,
-            ExpressionAttributeValues=expression_values
+    """Get time logs for a user, optionally limited to a start_time range."""
+    return [log async for log in iter_timelogs_by_user(user_id, start_date, end_date)]
+
+async def get_timelogs_by_user_for_day(user_id: str, day: date) -> List[dict]:
+    """
+    Get time logs for a user that start on a given calendar day.
+    
+    start_time is stored as an ISO string, so its date prefix is the local
+    date of the entry and a begins_with key condition reads only that day.
+    """
+    return [
+        normalize_timelog_item(item)
+        async for item in paginate(
+            timelogs_table.query,
+            IndexName=USER_START_TIME_INDEX_NAME,
+            KeyConditionExpression="user_id = :user_id AND begins_with(start_time, :day)",
+            ExpressionAttributeValues={
+                ":user_id": user_id,
+                ":day": day.isoformat(),
+            }
         )
-        items = response.get("Items", [])
-        return [normalize_timelog_item(item) for item in items]
+    ]
 
 async def get_timelogs_by_user_and_exact_time(user_id: str, start_time: datetime, end_time: datetime) -> List[dict]:
     """Get time logs for a user within an exact start and end time."""
-    response = timelogs_table.query(
-        IndexName="user_id-index",
-        KeyConditionExpression="user_id = :user_id",
-        FilterExpression="start_time = :start_time AND end_time = :end_time",
-        ExpressionAttributeValues={
-            ":user_id": user_id,
-            ":start_time": start_time.isoformat(),
-            ":end_time": end_time.isoformat(),
-        }
+    return [
+        normalize_timelog_item(item)
+        async for item in paginate(
+            timelogs_table.query,
+            IndexName=USER_START_TIME_INDEX_NAME,
+            KeyConditionExpression="user_id = :user_id AND start_time = :start_time",
+            FilterExpression="end_time = :end_time",
+            ExpressionAttributeValues={
+                ":user_id": user_id,
+                ":start_time": start_time.isoformat(),
+                ":end_time": end_time.isoformat(),
+            }
+        )
+    ]
+
+def _log_access_path(plan: TimelogQueryPlan, **filters: Any) -> None:
+    logger.info(
+        "Timelog access path",
+        path=plan.path.value,
+        requests=len(plan.requests),
+        **{name: value is not None for name, value in filters.items()}
     )
-    items = response.get("Items", [])
-    return [normalize_timelog_item(item) for item in items]
+
+async def iter_all_timelogs(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    is_overtime: Optional[bool] = None,
+    segments: Optional[int] = None
+) -> AsyncIterator[dict]:
+    """
+    Stream every time log matching the filters.
+    
+    The access path comes from ``plan_timelog_query``: a user index query
+    when user_id is given, month index queries (run concurrently) for a
+    bounded date range across all users, otherwise a parallel scan.
+    Errors are raised, never answered with a slower fallback read.
+    
+    Args:
+        segments: Number of parallel scan segments (defaults to DYNAMODB_SCAN_SEGMENTS)
+    """
+    plan = plan_timelog_query(start_date, end_date, user_id, is_overtime)
+    _log_access_path(plan, start_date=start_date, end_date=end_date, user_id=user_id, is_overtime=is_overtime)
+    try:
+        if plan.is_scan:
+            items = parallel_scan(
+                timelogs_table.scan,
+                segments or settings.DYNAMODB_SCAN_SEGMENTS,
+                **plan.requests[0]
+            )
+        else:
+            items = parallel_paginate(timelogs_table.query, plan.requests)
+        async for item in items:
+            yield normalize_timelog_item(item)
+    except ClientError as e:
+        logger.error("Failed to get timelogs", path=plan.path.value, error=str(e),
+                     error_code=e.response.get("Error", {}).get("Code"))
+        raise DatabaseError("Failed to retrieve time logs") from e
 
 async def get_all_timelogs(
     start_date: Optional[datetime] = None, 
-                          end_date: Optional[datetime] = None,
-                          user_id: Optional[str] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None,
     is_overtime: Optional[bool] = None,
     page: Optional[int] = None,
     page_size: Optional[int] = None,
-    last_evaluated_key: Optional[Dict[str, Any]] = None
+    last_evaluated_key: Optional[Dict[str, Any]] = None,
+    segments: Optional[int] = None
 ) -> tuple[List[dict], Optional[Dict[str, Any]]]:
     """
     Get all time logs with optional filters and pagination.
     
+    Without ``page_size`` (or with ``segments``) every matching item is
+    returned through ``iter_all_timelogs`` and the returned key is always
+    None. With ``page_size`` one page is read along the same access path,
+    except that a scan is not split into segments.
+    
     Returns:
         Tuple of (items, last_evaluated_key for pagination)
     """
-    filter_parts = []
-    expression_values = {}
+    if segments or not page_size:
+        items = [log async for log in iter_all_timelogs(start_date, end_date, user_id, is_overtime, segments)]
+        return items, None
     
-    if user_id:
-        filter_parts.append("user_id = :user_id")
-        expression_values[":user_id"] = user_id
-    if start_date:
-        filter_parts.append("start_time >= :start_date")
-        expression_values[":start_date"] = start_date.isoformat()
-    if end_date:
-        filter_parts.append("start_time <= :end_date")
-        expression_values[":end_date"] = end_date.isoformat()
-    if is_overtime is not None:
-        filter_parts.append("is_overtime = :is_overtime")
-        expression_values[":is_overtime"] = is_overtime
-    
-    scan_kwargs = {}
-    if filter_parts:
-        scan_kwargs["FilterExpression"] = " AND ".join(filter_parts)
-        scan_kwargs["ExpressionAttributeValues"] = expression_values
-    
-    # Add pagination
-    if page_size:
-        scan_kwargs["Limit"] = page_size
-    if last_evaluated_key:
-        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+    plan = plan_timelog_query(start_date, end_date, user_id, is_overtime)
+    _log_access_path(plan, start_date=start_date, end_date=end_date, user_id=user_id, is_overtime=is_overtime)
+    if last_evaluated_key and set(last_evaluated_key) != set(plan.key_attributes):
+        # A cursor from a request with other filters
+        raise ValidationError("Invalid pagination cursor")
     
     try:
-        response = timelogs_table.scan(**scan_kwargs)
-        items = response.get("Items", [])
-        last_key = response.get("LastEvaluatedKey")
-        
-        # Normalize all items
-        normalized_items = [normalize_timelog_item(item) for item in items]
-        return normalized_items, last_key
+        # Keep reading until the page is full, even with a selective filter
+        if plan.partition_attribute:
+            items, last_key = await fill_page_sequential(
+                timelogs_table.query, plan.requests, plan.key_attributes,
+                plan.partition_attribute, page_size, last_evaluated_key
+            )
+        else:
+            operation = timelogs_table.scan if plan.is_scan else timelogs_table.query
+            items, last_key = await fill_page(
+                operation, plan.key_attributes, page_size, last_evaluated_key, **plan.requests[0]
+            )
     except ClientError as e:
-        logger.error("Failed to get timelogs", error=str(e), error_code=e.response.get("Error", {}).get("Code"))
+        logger.error("Failed to get timelogs", path=plan.path.value, error=str(e),
+                     error_code=e.response.get("Error", {}).get("Code"))
         raise DatabaseError("Failed to retrieve time logs") from e
+    
+    return [normalize_timelog_item(item) for item in items], last_key
 
 async def update_timelog(log_id: str, update_data: dict) -> Optional[dict]:
     """Update a time log."""
+    if isinstance(update_data.get("start_time"), datetime):
+        # Keep the month index in step with the new start time
+        update_data = {**update_data, **timelog_month_attributes(log_id, update_data["start_time"])}
+    
     update_expression_parts = []
     expression_attribute_values = {}
     expression_attribute_names = {}
@@ -423,43 +646,480 @@ async def update_timelog(log_id: str, update_data: dict) -> Optional[dict]:
     update_expression = "SET " + ", ".join(update_expression_parts)
     
     try:
-        timelogs_table.update_item(
+        response = await run_in_executor(
+            timelogs_table.update_item,
             Key={"log_id": log_id},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
             ExpressionAttributeNames=expression_attribute_names,
-            ReturnValues="ALL_NEW"
+            ReturnValues="ALL_OLD"
         )
-        return await get_timelog_by_id(log_id)
     except ClientError as e:
         logger.error("Failed to update timelog", log_id=log_id, error=str(e))
         raise DatabaseError("Failed to update time log") from e
+    
+    # The daily totals need the previous values, so ask for ALL_OLD and apply
+    # the SET values on top of it instead of reading the item back
+    old_item = response.get("Attributes")
+    new_item = dict(old_item or {}, log_id=log_id)
+    for attribute_name in expression_attribute_names.values():
+        new_item[attribute_name] = expression_attribute_values[f":{attribute_name}"]
+    
+    await apply_daily_total_changes(old_item, new_item)
+    return normalize_timelog_item(new_item)
+
+async def update_timelogs_overtime(logs: List[dict], user_id: Optional[str] = None,
+                                   day: Optional[date] = None,
+                                   daily_overtime_hours: Optional[float] = None,
+                                   work_logs: Optional[List[dict]] = None,
+                                   new_daily_total: Optional[dict] = None) -> bool:
+    """
+    Write new overtime values for several time logs in one transaction.
+    
+    Each log dict must hold log_id, total_hours, is_overtime and overtime_hours.
+    Every update is conditional on the log still existing with the total_hours
+    it was read with, so a concurrent edit or delete cancels the transaction
+    instead of leaving the day half-updated. Batches larger than
+    TRANSACT_WRITE_MAX_ITEMS are split into several transactions.
+    
+    If user_id, day and daily_overtime_hours are given, the day's total
+    overtime is stored in its daily totals item within the same transaction.
+    Pass the day's WORK logs the overtime was computed from as work_logs: the
+    totals update is then conditional on the item still counting exactly
+    those hours and entries, so a log added to the day in the meantime, which
+    the per-log conditions cannot see, also cancels the transaction.
+    If the day has no totals item yet, pass the complete item to create as
+    new_daily_total instead (see daily_total_item); the transaction is then
+    cancelled if another write creates the item first.
+    
+    Returns:
+        True if all updates were applied, False if a transaction was cancelled
+        because one of the logs changed in the meantime
+    """
+    updated_at = datetime.utcnow().isoformat()
+    transact_items = [
+        {
+            "Update": {
+                "TableName": settings.DYNAMODB_TIMELOGS_TABLE,
+                "Key": {"log_id": log["log_id"]},
+                "UpdateExpression": "SET is_overtime = :is_overtime, overtime_hours = :overtime_hours, updated_at = :updated_at",
+                "ConditionExpression": "attribute_exists(log_id) AND total_hours = :total_hours",
+                "ExpressionAttributeValues": {
+                    ":is_overtime": log["is_overtime"],
+                    ":overtime_hours": Decimal(str(log["overtime_hours"])),
+                    ":updated_at": updated_at,
+                    ":total_hours": Decimal(str(log["total_hours"])),
+                },
+            }
+        }
+        for log in logs
+    ]
+    if new_daily_total is not None:
+        transact_items.insert(0, {
+            "Put": {
+                "TableName": settings.DYNAMODB_DAILY_TOTALS_TABLE,
+                "Item": new_daily_total,
+                "ConditionExpression": "attribute_not_exists(user_id)",
+            }
+        })
+    elif daily_overtime_hours is not None:
+        totals_update = {
+            "TableName": settings.DYNAMODB_DAILY_TOTALS_TABLE,
+            "Key": {"user_id": user_id, "date": day.isoformat()},
+            "UpdateExpression": "SET overtime_hours = :overtime_hours, updated_at = :updated_at",
+            "ExpressionAttributeValues": {
+                ":overtime_hours": Decimal(str(daily_overtime_hours)),
+                ":updated_at": updated_at,
+            },
+        }
+        if work_logs is not None:
+            # Summed as Decimals like the ADD counters, so equal totals compare equal
+            totals_update["ConditionExpression"] = "work_entry_count = :work_entry_count AND work_hours = :work_hours"
+            totals_update["ExpressionAttributeValues"].update({
+                ":work_entry_count": len(work_logs),
+                ":work_hours": sum((Decimal(str(log.get("total_hours", 0))) for log in work_logs), Decimal(0)),
+            })
+        transact_items.insert(0, {"Update": totals_update})
+    
+    for start in range(0, len(transact_items), TRANSACT_WRITE_MAX_ITEMS):
+        try:
+            # The resource's client serializes plain Python values like the Table API
+            await run_in_executor(
+                dynamodb.meta.client.transact_write_items,
+                TransactItems=transact_items[start:start + TRANSACT_WRITE_MAX_ITEMS]
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "TransactionCanceledException":
+                logger.warning("Overtime update cancelled by a concurrent change", error=str(e))
+                return False
+            logger.error("Failed to update overtime", error=str(e))
+            raise DatabaseError("Failed to update time log overtime") from e
+    return True
+
+async def set_timelog_month(log_id: str, start_time: datetime) -> bool:
+    """
+    Write the month index attributes of an existing time log.
+    
+    Returns:
+        False if the log was deleted in the meantime
+    """
+    attributes = timelog_month_attributes(log_id, start_time)
+    try:
+        await run_in_executor(
+            timelogs_table.update_item,
+            Key={"log_id": log_id},
+            UpdateExpression="SET #month = :month, month_shard = :month_shard",
+            ConditionExpression="attribute_exists(log_id)",
+            ExpressionAttributeNames={"#month": "month"},
+            ExpressionAttributeValues={
+                ":month": attributes["month"],
+                ":month_shard": attributes["month_shard"],
+            }
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        logger.error("Failed to set timelog month", log_id=log_id, error=str(e))
+        raise DatabaseError("Failed to update time log") from e
 
 async def delete_timelog(log_id: str) -> bool:
     """Delete a time log."""
     try:
-        timelogs_table.delete_item(Key={"log_id": log_id})
-        return True
+        response = await run_in_executor(
+            timelogs_table.delete_item,
+            Key={"log_id": log_id},
+            ReturnValues="ALL_OLD"
+        )
     except ClientError as e:
         logger.error("Failed to delete timelog", log_id=log_id, error=str(e))
         raise DatabaseError("Failed to delete time log") from e
+    
+    await apply_daily_total_changes(response.get("Attributes"), None)
+    return True
+
+# Daily totals operations
+# One item per user and calendar day holds the day's hours and entry counts.
+# Every time log write adjusts it with atomic ADD counters, so the overtime
+# calculation and reports can read a single item instead of the day's logs.
+# rebuild_daily_totals.py recomputes the table from the logs to repair drift.
+DAILY_TOTAL_COUNTERS = ("total_hours", "entry_count", "work_hours", "work_entry_count")
+
+def _daily_total_contribution(item: Optional[dict]) -> Optional[Tuple[Tuple[str, str], Dict[str, Decimal]]]:
+    """Return the (user_id, day) key and counter values a raw time log item adds to its day."""
+    if not item or not item.get("user_id") or not item.get("start_time"):
+        return None
+    hours = Decimal(str(item.get("total_hours", 0)))
+    is_work = item.get("attendance_type", "work") == "work"
+    # start_time is an ISO string, so its first ten characters are the day
+    key = (item["user_id"], str(item["start_time"])[:10])
+    return key, {
+        "total_hours": hours,
+        "entry_count": Decimal(1),
+        "work_hours": hours if is_work else Decimal(0),
+        "work_entry_count": Decimal(1 if is_work else 0),
+    }
+
+def daily_total_item(user_id: str, day: date, logs: List[dict],
+                     overtime_hours: Optional[float] = None) -> dict:
+    """
+    Build a complete daily totals item from all of a user's logs for one day.
+    
+    Args:
+        logs: Every log of the day, of any attendance type
+        overtime_hours: The day's overtime; defaults to the sum stored on its WORK logs
+    """
+    counters = {name: Decimal(0) for name in DAILY_TOTAL_COUNTERS}
+    for log in logs:
+        contribution = _daily_total_contribution(log)
+        if contribution is None:
+            continue
+        for name, value in contribution[1].items():
+            counters[name] += value
+    if overtime_hours is None:
+        overtime_hours = sum(
+            float(log.get("overtime_hours", 0)) for log in logs
+            if log.get("attendance_type", "work") == "work"
+        )
+    return dict(
+        counters,
+        user_id=user_id,
+        date=day.isoformat(),
+        overtime_hours=Decimal(str(round(overtime_hours, 2))),
+        updated_at=datetime.utcnow().isoformat()
+    )
+
+async def _create_daily_total(user_id: str, day: str, item: dict) -> bool:
+    """
+    Create a missing daily totals item holding one log's contribution.
+    
+    Returns:
+        False if another write created the item first
+    """
+    try:
+        await run_in_executor(
+            daily_totals_table.put_item,
+            Item=daily_total_item(user_id, date.fromisoformat(day), [item]),
+            ConditionExpression="attribute_not_exists(user_id)"
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        raise
+
+async def apply_daily_total_changes(old_item: Optional[dict], new_item: Optional[dict]) -> None:
+    """
+    Move a time log's contribution in the daily totals from its old to its new values.
+    
+    Deltas are only added to existing totals items, so an edit or delete of a
+    log on a day without one cannot leave negative counters. A day without
+    one that the log now falls on gets it created from the log's own values;
+    the day's logs are not read for it, since the index they are read from
+    may not show this write yet. Days whose older logs predate the totals
+    are repaired with rebuild_daily_totals.py.
+    
+    Args:
+        old_item: Raw log item before the write (None for a create)
+        new_item: Raw log item after the write (None for a delete)
+    """
+    deltas: Dict[Tuple[str, str], Dict[str, Decimal]] = {}
+    new_contribution = _daily_total_contribution(new_item)
+    new_key = new_contribution[0] if new_contribution else None
+    for item, sign in ((old_item, -1), (new_item, 1)):
+        contribution = _daily_total_contribution(item)
+        if contribution is None:
+            continue
+        key, counters = contribution
+        day_deltas = deltas.setdefault(key, {name: Decimal(0) for name in DAILY_TOTAL_COUNTERS})
+        for name, value in counters.items():
+            day_deltas[name] += sign * value
+    
+    updated_at = datetime.utcnow().isoformat()
+    for (user_id, day), day_deltas in deltas.items():
+        if not any(day_deltas.values()):
+            continue
+        expression_values = {f":{name}": value for name, value in day_deltas.items()}
+        expression_values[":updated_at"] = updated_at
+        try:
+            # If another write creates the missing item first, add the delta to it
+            for _ in range(2):
+                try:
+                    await run_in_executor(
+                        daily_totals_table.update_item,
+                        Key={"user_id": user_id, "date": day},
+                        UpdateExpression=(
+                            "ADD " + ", ".join(f"{name} :{name}" for name in DAILY_TOTAL_COUNTERS)
+                            + " SET updated_at = :updated_at"
+                        ),
+                        ConditionExpression="attribute_exists(user_id)",
+                        ExpressionAttributeValues=expression_values
+                    )
+                    break
+                except ClientError as e:
+                    if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                        raise
+                # Nothing to subtract from on a day the log no longer falls on
+                if (user_id, day) != new_key or await _create_daily_total(user_id, day, new_item):
+                    break
+        except ClientError as e:
+            # The log write already succeeded; rebuild_daily_totals.py repairs the drift
+            logger.error("Failed to update daily totals", user_id=user_id, date=day, error=str(e))
+
+def normalize_daily_total_item(item: dict) -> dict:
+    """Convert a daily totals item's counters to float hours and int counts."""
+    normalized = dict(item)
+    for name in ("total_hours", "work_hours", "overtime_hours"):
+        normalized[name] = float(item.get(name, 0))
+    for name in ("entry_count", "work_entry_count"):
+        normalized[name] = int(item.get(name, 0))
+    return normalized
+
+async def get_daily_total(user_id: str, day: date) -> Optional[dict]:
+    """Get a user's totals for one day, or None if nothing was logged that day."""
+    try:
+        response = await run_in_executor(
+            daily_totals_table.get_item,
+            Key={"user_id": user_id, "date": day.isoformat()},
+            ConsistentRead=True
+        )
+    except ClientError as e:
+        logger.error("Failed to get daily totals", user_id=user_id, date=day.isoformat(), error=str(e))
+        raise DatabaseError("Failed to retrieve daily totals") from e
+    item = response.get("Item")
+    return normalize_daily_total_item(item) if item else None
+
+async def iter_daily_totals(user_id: str, start_date: Optional[date] = None,
+                            end_date: Optional[date] = None) -> AsyncIterator[dict]:
+    """Stream a user's daily totals, optionally limited to a date range."""
+    key_condition = "user_id = :user_id"
+    expression_values = {":user_id": user_id}
+    
+    if start_date and end_date:
+        key_condition += " AND #date BETWEEN :start_date AND :end_date"
+    elif start_date:
+        key_condition += " AND #date >= :start_date"
+    elif end_date:
+        key_condition += " AND #date <= :end_date"
+    if start_date:
+        expression_values[":start_date"] = start_date.isoformat()
+    if end_date:
+        expression_values[":end_date"] = end_date.isoformat()
+    
+    query_kwargs = {
+        "KeyConditionExpression": key_condition,
+        "ExpressionAttributeValues": expression_values,
+    }
+    if start_date or end_date:
+        # "date" is a reserved word
+        query_kwargs["ExpressionAttributeNames"] = {"#date": "date"}
+    
+    try:
+        async for item in paginate(daily_totals_table.query, **query_kwargs):
+            yield normalize_daily_total_item(item)
+    except ClientError as e:
+        logger.error("Failed to query daily totals", user_id=user_id, error=str(e))
+        raise DatabaseError("Failed to retrieve daily totals") from e
+
+async def get_daily_totals(user_id: str, start_date: Optional[date] = None,
+                           end_date: Optional[date] = None) -> List[dict]:
+    """Get a user's daily totals, optionally limited to a date range."""
+    return [item async for item in iter_daily_totals(user_id, start_date, end_date)]
+
+async def iter_all_daily_totals() -> AsyncIterator[dict]:
+    """Stream the raw daily totals of every user."""
+    async for item in paginate(daily_totals_table.scan):
+        yield item
+
+def _write_daily_totals(items: List[dict], stale_keys: List[dict]) -> None:
+    """Blocking batch write of daily totals; run through run_in_executor."""
+    with daily_totals_table.batch_writer(overwrite_by_pkeys=["user_id", "date"]) as batch:
+        for item in items:
+            batch.put_item(Item=item)
+        for key in stale_keys:
+            batch.delete_item(Key=key)
+
+async def replace_daily_totals(items: List[dict], stale_keys: List[dict]) -> None:
+    """
+    Overwrite daily totals in bulk and delete the ones that no longer have logs.
+    
+    Args:
+        items: Complete daily total items (user_id, date and all counters)
+        stale_keys: {"user_id", "date"} keys of totals to delete
+    """
+    try:
+        await run_in_executor(_write_daily_totals, items, stale_keys)
+    except ClientError as e:
+        logger.error("Failed to write daily totals", error=str(e))
+        raise DatabaseError("Failed to write daily totals") from e
 
 # Audit log operations
-async def create_audit_log(action: str, user_id: str, details: dict):
-    """Create an audit log entry."""
+# Entries are found by who acted (user_id) or what was acted on (entity_id),
+# each ordered by timestamp within the partition
+AUDIT_ACTOR_INDEX_NAME = "user_id-timestamp-index"
+AUDIT_ENTITY_INDEX_NAME = "entity_id-timestamp-index"
+
+audit_writer = AuditLogWriter(
+    lambda items: batch_put_items(settings.DYNAMODB_AUDIT_TABLE, items),
+    max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    batch_size=BATCH_WRITE_MAX_ITEMS,
+)
+
+def _audit_value(value: Any) -> Any:
+    """Convert an audit detail value to a type DynamoDB can store."""
+    if isinstance(value, dict):
+        return {str(key): _audit_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_audit_value(item) for item in value]
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (str, int, bool, Decimal)) or value is None:
+        return value
+    return str(value)
+
+async def create_audit_log(action: str, user_id: str, details: dict,
+                           entity_type: Optional[str] = None, entity_id: Optional[str] = None):
+    """
+    Queue an audit log entry for the background audit writer.
+
+    Returns as soon as the entry is queued; details are stored as a map.
+
+    Args:
+        user_id: The actor who performed the action
+        entity_type: Kind of record acted on, such as "timelog"
+        entity_id: Key of the record acted on
+    """
+    item = {
+        "audit_id": str(uuid.uuid4()),
+        "action": action,
+        "user_id": user_id,
+        "details": _audit_value(details or {}),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    # Omitted rather than null, so entries without an entity stay out of the entity index
+    if entity_id:
+        item["entity_type"] = entity_type
+        item["entity_id"] = entity_id
+    # Don't raise - audit logging should not break the main flow
+    audit_writer.enqueue(item)
+
+async def get_audit_logs(
+    actor_id: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    page_size: int = settings.DEFAULT_PAGE_SIZE,
+    last_evaluated_key: Optional[Dict[str, Any]] = None
+) -> Tuple[List[dict], Optional[Dict[str, Any]]]:
+    """
+    Get one page of audit entries for an actor or an entity, newest first.
+
+    Reads a single partition of the actor or entity index, narrowed to the
+    time window by its timestamp sort key.
+
+    Raises:
+        ValidationError: If neither or both of actor_id and entity_id are given
+    """
+    if bool(actor_id) == bool(entity_id):
+        raise ValidationError("Specify either actor_id or entity_id")
+    partition_attribute, partition_value, index_name = (
+        ("user_id", actor_id, AUDIT_ACTOR_INDEX_NAME) if actor_id
+        else ("entity_id", entity_id, AUDIT_ENTITY_INDEX_NAME)
+    )
+    key_attributes = ["audit_id", partition_attribute, "timestamp"]
+    if last_evaluated_key and set(last_evaluated_key) != set(key_attributes):
+        raise ValidationError("Invalid pagination cursor")
+
+    key_condition = f"{partition_attribute} = :partition"
+    expression_values: Dict[str, Any] = {":partition": partition_value}
+    if start_time and end_time:
+        key_condition += " AND #timestamp BETWEEN :start_time AND :end_time"
+    elif start_time:
+        key_condition += " AND #timestamp >= :start_time"
+    elif end_time:
+        key_condition += " AND #timestamp <= :end_time"
+    if start_time:
+        expression_values[":start_time"] = start_time.isoformat()
+    if end_time:
+        expression_values[":end_time"] = end_time.isoformat()
+    query_kwargs = {
+        "IndexName": index_name,
+        "KeyConditionExpression": key_condition,
+        "ExpressionAttributeValues": expression_values,
+        "ScanIndexForward": False,
+    }
+    if start_time or end_time:
+        # timestamp is a DynamoDB reserved word
+        query_kwargs["ExpressionAttributeNames"] = {"#timestamp": "timestamp"}
+
     try:
-        audit_id = str(uuid.uuid4())
-        item = {
-            "audit_id": audit_id,
-            "action": action,
-            "user_id": user_id,
-            "details": str(details),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        audit_table.put_item(Item=item)
+        return await fill_page(audit_table.query, key_attributes, page_size, last_evaluated_key, **query_kwargs)
     except ClientError as e:
-        logger.error("Failed to create audit log", error=str(e))
-        # Don't raise - audit logging should not break the main flow
+        logger.error("Failed to get audit logs", error=str(e), index=index_name)
+        raise DatabaseError("Failed to retrieve audit logs") from e
 
 # Leave Request operations
 async def create_leave_request(leave_request_data: dict) -> dict:
@@ -480,13 +1140,13 @@ async def create_leave_request(leave_request_data: dict) -> dict:
         "reviewed_at": None,
         "reviewed_by": None
     }
-    leave_requests_table.put_item(Item=item)
+    await run_in_executor(leave_requests_table.put_item, Item=item)
     return item
 
 async def get_leave_request_by_id(request_id: str) -> Optional[dict]:
     """Get a leave request by ID."""
     try:
-        response = leave_requests_table.get_item(Key={"request_id": request_id})
+        response = await run_in_executor(leave_requests_table.get_item, Key={"request_id": request_id})
         if "Item" in response:
             return response["Item"]
         return None
@@ -494,42 +1154,48 @@ async def get_leave_request_by_id(request_id: str) -> Optional[dict]:
         logger.error("Failed to get leave request by ID", request_id=request_id, error=str(e))
         raise DatabaseError("Failed to retrieve leave request") from e
 
-async def get_leave_requests_by_user(user_id: str, status: Optional[str] = None) -> List[dict]:
-    """Get leave requests for a user, optionally filtered by status."""
+async def iter_leave_requests_by_user(user_id: str, status: Optional[str] = None) -> AsyncIterator[dict]:
+    """Stream leave requests for a user, optionally filtered by status."""
+    if status:
+        # Use GSI to query by user_id and status
+        query_kwargs = {
+            "IndexName": "user_id-status-index",
+            "KeyConditionExpression": "user_id = :user_id AND #status = :status",
+            "ExpressionAttributeValues": {
+                ":user_id": user_id,
+                ":status": status
+            },
+            "ExpressionAttributeNames": {
+                "#status": "status"
+            }
+        }
+    else:
+        # Query by user_id only
+        query_kwargs = {
+            "IndexName": "user_id-index",
+            "KeyConditionExpression": "user_id = :user_id",
+            "ExpressionAttributeValues": {
+                ":user_id": user_id
+            }
+        }
     try:
-        if status:
-            # Use GSI to query by user_id and status
-            response = leave_requests_table.query(
-                IndexName="user_id-status-index",
-                KeyConditionExpression="user_id = :user_id AND #status = :status",
-                ExpressionAttributeValues={
-                    ":user_id": user_id,
-                    ":status": status
-                },
-                ExpressionAttributeNames={
-                    "#status": "status"
-                }
-            )
-        else:
-            # Query by user_id only
-            response = leave_requests_table.query(
-                IndexName="user_id-index",
-                KeyConditionExpression="user_id = :user_id",
-                ExpressionAttributeValues={
-                    ":user_id": user_id
-                }
-            )
-        return response.get("Items", [])
+        async for item in paginate(leave_requests_table.query, **query_kwargs):
+            yield item
     except ClientError as e:
         logger.error("Failed to get leave requests by user", user_id=user_id, error=str(e))
         raise DatabaseError("Failed to retrieve leave requests") from e
 
-async def get_all_leave_requests(status: Optional[str] = None) -> List[dict]:
-    """Get all leave requests, optionally filtered by status."""
+async def get_leave_requests_by_user(user_id: str, status: Optional[str] = None) -> List[dict]:
+    """Get leave requests for a user, optionally filtered by status."""
+    return [item async for item in iter_leave_requests_by_user(user_id, status=status)]
+
+async def iter_leave_requests(status: Optional[str] = None) -> AsyncIterator[dict]:
+    """Stream all leave requests, optionally filtered by status."""
     try:
         if status:
             # Use GSI to query by status
-            response = leave_requests_table.query(
+            items = paginate(
+                leave_requests_table.query,
                 IndexName="status-index",
                 KeyConditionExpression="#status = :status",
                 ExpressionAttributeValues={
@@ -541,12 +1207,17 @@ async def get_all_leave_requests(status: Optional[str] = None) -> List[dict]:
             )
         else:
             # Scan all requests
-            response = leave_requests_table.scan()
-        return response.get("Items", [])
+            items = paginate(leave_requests_table.scan)
+        async for item in items:
+            yield item
     except ClientError as e:
         logger.error("Failed to get all leave requests", error=str(e))
         raise DatabaseError("Failed to retrieve leave requests") from e
 
+async def get_all_leave_requests(status: Optional[str] = None) -> List[dict]:
+    """Get all leave requests, optionally filtered by status."""
+    return [item async for item in iter_leave_requests(status=status)]
+
 async def update_leave_request(request_id: str, update_data: dict) -> Optional[dict]:
     """Update a leave request."""
     update_expression_parts = []
@@ -576,14 +1247,15 @@ async def update_leave_request(request_id: str, update_data: dict) -> Optional[d
     update_expression = "SET " + ", ".join(update_expression_parts)
     
     try:
-        leave_requests_table.update_item(
+        response = await run_in_executor(
+            leave_requests_table.update_item,
             Key={"request_id": request_id},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
             ExpressionAttributeNames=expression_attribute_names,
             ReturnValues="ALL_NEW"
         )
-        return await get_leave_request_by_id(request_id)
+        return response["Attributes"]
     except ClientError as e:
         logger.error("Failed to update leave request", request_id=request_id, error=str(e))
         raise DatabaseError("Failed to update leave request") from e
@@ -591,7 +1263,7 @@ async def update_leave_request(request_id: str, update_data: dict) -> Optional[d
 async def delete_leave_request(request_id: str) -> bool:
     """Delete a leave request."""
     try:
-        leave_requests_table.delete_item(Key={"request_id": request_id})
+        await run_in_executor(leave_requests_table.delete_item, Key={"request_id": request_id})
         return True
     except ClientError as e:
         logger.error("Failed to delete leave request", request_id=request_id, error=str(e))
@@ -0,0 +1,51 @@
+"""
+Bounded thread pool for blocking DynamoDB calls.
+
+boto3 has no native asyncio support, so the data layer hands every request
+to this executor instead of calling it on the event loop. The pool size is
+controlled by ``settings.DYNAMODB_MAX_WORKERS``.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared DynamoDB executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DYNAMODB_MAX_WORKERS,
+            thread_name_prefix="dynamodb"
+        )
+    return _executor
+
+
+async def run_in_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call in the DynamoDB thread pool.
+
+    Args:
+        func: Blocking callable (usually a boto3 table method)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the executor. A new one is created on the next call."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
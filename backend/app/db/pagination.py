@@ -1,40 +1,88 @@
 """
 Pagination utilities for DynamoDB operations.
 """
-from typing import List, Dict, Optional, Any
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from typing import List, Dict, Optional, Any, AsyncIterator, Callable, Generic, Tuple, TypeVar
+from pydantic import BaseModel
 from app.core.config import settings
+from app.core.exceptions import ValidationError
 from app.core.logging_config import get_logger
+from app.db.executor import run_in_executor
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
 
-class PaginatedResponse:
-    """Paginated response wrapper."""
-    def __init__(
-        self,
-        items: List[Dict[str, Any]],
-        total: int,
-        page: int,
-        page_size: int,
-        has_next: bool = False,
-        last_evaluated_key: Optional[Dict[str, Any]] = None
-    ):
-        self.items = items
-        self.total = total
-        self.page = page
-        self.page_size = page_size
-        self.has_next = has_next
-        self.last_evaluated_key = last_evaluated_key
-    
-    def to_dict(self):
-        """Convert to dictionary."""
-        return {
-            "items": self.items,
-            "total": self.total,
-            "page": self.page,
-            "page_size": self.page_size,
-            "has_next": self.has_next
-        }
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    """Paginated response envelope returned by list endpoints."""
+    items: List[T]
+    page_size: int
+    has_next: bool = False
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
+    
+    @classmethod
+    def from_page(cls, items: List[Any], page_size: int,
+                  last_evaluated_key: Optional[Dict[str, Any]] = None) -> "PaginatedResponse":
+        """Build a response from a page of items and the key to resume after it."""
+        return cls(
+            items=items,
+            page_size=page_size,
+            has_next=last_evaluated_key is not None,
+            next_cursor=encode_cursor(last_evaluated_key) if last_evaluated_key else None
+        )
+
+
+def _sign(payload: bytes) -> str:
+    """Sign a cursor payload with the application secret."""
+    digest = hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def encode_cursor(last_evaluated_key: Dict[str, Any]) -> str:
+    """
+    Encode a DynamoDB LastEvaluatedKey as an opaque, signed continuation token.
+    
+    Args:
+        last_evaluated_key: Key to resume the query or scan after
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True).encode()
+    encoded = base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+    return f"{encoded}.{_sign(payload)}"
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode and verify a continuation token produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string from a previous response
+        
+    Returns:
+        The ExclusiveStartKey to resume from
+        
+    Raises:
+        ValidationError: If the cursor is malformed or its signature does not match
+    """
+    try:
+        encoded, signature = cursor.split(".", 1)
+        payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("signature mismatch")
+        key = json.loads(payload)
+        if not isinstance(key, dict):
+            raise ValueError("cursor is not a key")
+        return key
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.warning("Rejected pagination cursor", error=str(e))
+        raise ValidationError("Invalid pagination cursor")
 
 
 def validate_pagination_params(page: Optional[int] = None, page_size: Optional[int] = None) -> tuple[int, int]:
@@ -58,3 +106,226 @@ def validate_pagination_params(page: Optional[int] = None, page_size: Optional[i
     
     return page, page_size
 
+
+
+async def fill_page(
+    operation: Callable[..., Dict[str, Any]],
+    key_attributes: List[str],
+    page_size: int,
+    exclusive_start_key: Optional[Dict[str, Any]] = None,
+    **kwargs: Any
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Read up to page_size matching items from a query or scan.
+    
+    DynamoDB applies Limit before FilterExpression, so a single filtered
+    request can return far fewer items than asked for. This keeps reading
+    until the page is full or the results run out. When the page fills up
+    part-way through a response, the resume key is built from the last
+    returned item so no items are skipped or repeated.
+    
+    Args:
+        operation: Table method such as ``table.query`` or ``table.scan``
+        key_attributes: Table and index key attributes that make up a LastEvaluatedKey
+        page_size: Number of items to return
+        exclusive_start_key: Key to resume after, from a previous call
+        **kwargs: Request parameters passed to every request
+        
+    Returns:
+        Tuple of (items, key to resume after or None when there are no more items)
+    """
+    items: List[Dict[str, Any]] = []
+    kwargs["Limit"] = page_size
+    if exclusive_start_key:
+        kwargs["ExclusiveStartKey"] = exclusive_start_key
+    
+    while True:
+        response = await run_in_executor(operation, **kwargs)
+        page = response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        remaining = page_size - len(items)
+        
+        if len(page) > remaining:
+            items.extend(page[:remaining])
+            return items, {attribute: items[-1][attribute] for attribute in key_attributes}
+        
+        items.extend(page)
+        if not last_key or len(items) == page_size:
+            return items, last_key
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+async def fill_page_sequential(
+    operation: Callable[..., Dict[str, Any]],
+    requests: List[Dict[str, Any]],
+    key_attributes: List[str],
+    partition_attribute: str,
+    page_size: int,
+    exclusive_start_key: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Read up to page_size items from several partition queries as if they were one.
+    
+    Requests are read in order, each through ``fill_page``. The resume key
+    carries the partition attribute, which tells the next call the request
+    to continue with; each request must bind its partition value to
+    ``:<partition_attribute>``.
+    
+    Args:
+        operation: Table query method
+        requests: Query parameters, one set per partition
+        key_attributes: Table and index key attributes that make up a LastEvaluatedKey
+        partition_attribute: Index partition key attribute
+        page_size: Number of items to return
+        exclusive_start_key: Key to resume after, from a previous call
+        
+    Returns:
+        Tuple of (items, key to resume after or None when there are no more items)
+    """
+    placeholder = f":{partition_attribute}"
+    first = 0
+    if exclusive_start_key:
+        partitions = [request["ExpressionAttributeValues"][placeholder] for request in requests]
+        if exclusive_start_key.get(partition_attribute) not in partitions:
+            raise ValidationError("Invalid pagination cursor")
+        first = partitions.index(exclusive_start_key[partition_attribute])
+    
+    items: List[Dict[str, Any]] = []
+    start_key = exclusive_start_key
+    for request in requests[first:]:
+        page, last_key = await fill_page(operation, key_attributes, page_size - len(items), start_key, **request)
+        items.extend(page)
+        start_key = None
+        if last_key:
+            return items, last_key
+        if len(items) == page_size:
+            # Full at the end of a partition: resume after its last item
+            return items, {attribute: items[-1][attribute] for attribute in key_attributes}
+    return items, None
+
+
+async def paginate_pages(operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream the pages of a DynamoDB query or scan, following LastEvaluatedKey.
+    
+    Args:
+        operation: Table method such as ``table.query`` or ``table.scan``
+        **kwargs: Request parameters passed to every page request
+        
+    Yields:
+        Lists of raw DynamoDB items, one per response page
+    """
+    while True:
+        response = await run_in_executor(operation, **kwargs)
+        yield response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+async def paginate(operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream every item of a DynamoDB query or scan, following LastEvaluatedKey.
+    
+    Pages are fetched one at a time as the caller consumes items, so memory
+    stays bounded by a single response page regardless of the result size.
+    
+    Args:
+        operation: Table method such as ``table.query`` or ``table.scan``
+        **kwargs: Request parameters passed to every page request
+        
+    Yields:
+        Raw DynamoDB items
+    """
+    async for page in paginate_pages(operation, **kwargs):
+        for item in page:
+            yield item
+
+
+async def parallel_paginate(operation: Callable[..., Dict[str, Any]],
+                            requests: List[Dict[str, Any]],
+                            max_concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream every item of several queries or scans that are read concurrently.
+    
+    A fixed number of workers take the requests in turn and paginate them,
+    so a long list of requests (such as one query per month shard) never
+    holds more than ``max_concurrency`` executor threads. Pages are merged
+    through a queue of the same size in arrival order, so memory does not
+    grow with the number of requests. Item order across requests is not defined.
+    
+    Args:
+        operation: Table method such as ``table.query`` or ``table.scan``
+        requests: Request parameters, one set per stream
+        max_concurrency: Requests read at a time (default: DYNAMODB_MAX_PARALLEL_READS)
+        
+    Yields:
+        Raw DynamoDB items
+    """
+    worker_count = min(len(requests), max(1, max_concurrency or settings.DYNAMODB_MAX_PARALLEL_READS))
+    if worker_count <= 1:
+        for kwargs in requests:
+            async for item in paginate(operation, **kwargs):
+                yield item
+        return
+    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+    pending = iter(requests)
+    worker_done = object()
+    
+    async def read_requests() -> None:
+        try:
+            # Workers share the iterator; each takes the next request when it is free
+            for kwargs in pending:
+                async for page in paginate_pages(operation, **dict(kwargs)):
+                    await queue.put(page)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(worker_done)
+    
+    workers = [asyncio.create_task(read_requests()) for _ in range(worker_count)]
+    remaining = worker_count
+    try:
+        while remaining:
+            page = await queue.get()
+            if page is worker_done:
+                remaining -= 1
+                continue
+            if isinstance(page, Exception):
+                raise page
+            for item in page:
+                yield item
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+
+async def parallel_scan(scan: Callable[..., Dict[str, Any]], total_segments: int, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream every item of a scan split into segments that are read concurrently.
+    
+    Segments are merged by ``parallel_paginate``, so at most
+    DYNAMODB_MAX_PARALLEL_READS segments are read and buffered at a time.
+    Item order across segments is not defined.
+    
+    Args:
+        scan: Table scan method
+        total_segments: Number of segments (TotalSegments); 1 means a plain scan
+        **kwargs: Scan parameters passed to every segment
+        
+    Yields:
+        Raw DynamoDB items
+    """
+    if total_segments <= 1:
+        async for item in paginate(scan, **kwargs):
+            yield item
+        return
+    
+    requests = [
+        dict(kwargs, Segment=segment, TotalSegments=total_segments)
+        for segment in range(total_segments)
+    ]
+    async for item in parallel_paginate(scan, requests):
+        yield item
@@ -0,0 +1,156 @@
+"""
+Access path planning for time log reads.
+
+Callers describe a read as filters (user, start_time range, overtime flag)
+and the planner picks the cheapest way DynamoDB can serve it:
+
+- a query on the user_id + start_time index when a user is given, with the
+  date range as a key condition when there is one
+- one query per month shard on the month index for a bounded date range
+  across all users
+- a parallel scan only when no index can narrow the read
+
+The planner only builds request parameters; running them is up to the data
+layer, which logs the chosen path.
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from app.core.config import settings
+
+USER_START_TIME_INDEX_NAME = "user_id-start_time-index"
+
+# GSI partitioning time logs by month across all users. The partition key is
+# the YYYY-MM month plus a shard number derived from log_id, so one busy month
+# is spread over DYNAMODB_MONTH_SHARDS partitions instead of a single hot one.
+MONTH_INDEX_NAME = "month_shard-start_time-index"
+
+
+class AccessPath(str, Enum):
+    USER_INDEX_QUERY = "user_index_query"
+    USER_INDEX_RANGE_QUERY = "user_index_range_query"
+    MONTH_INDEX_RANGE_QUERY = "month_index_range_query"
+    PARALLEL_SCAN = "parallel_scan"
+
+
+class TimelogQueryPlan(BaseModel):
+    """Requests that read the time logs matching a set of filters."""
+    path: AccessPath
+    # Query parameters, one set per partition, or the single scan's parameters
+    requests: List[Dict[str, Any]]
+    # Attributes that make up a LastEvaluatedKey for this path
+    key_attributes: List[str]
+    # Index partition key when requests span several partitions; each request
+    # binds its partition value to ":<partition_attribute>"
+    partition_attribute: Optional[str] = None
+
+    @property
+    def is_scan(self) -> bool:
+        return self.path == AccessPath.PARALLEL_SCAN
+
+
+def month_shard_key(month: str, shard: int) -> str:
+    """Build the month index partition key for a YYYY-MM month and shard number."""
+    return f"{month}#{shard}"
+
+
+def months_between(start_date: datetime, end_date: datetime) -> List[str]:
+    """List the YYYY-MM months from start_date to end_date inclusive."""
+    months = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _range_condition(start_date: Optional[datetime], end_date: Optional[datetime]) -> str:
+    if start_date and end_date:
+        return " AND start_time BETWEEN :start_date AND :end_date"
+    if start_date:
+        return " AND start_time >= :start_date"
+    if end_date:
+        return " AND start_time <= :end_date"
+    return ""
+
+
+def _range_values(start_date: Optional[datetime], end_date: Optional[datetime]) -> Dict[str, Any]:
+    values = {}
+    if start_date:
+        values[":start_date"] = start_date.isoformat()
+    if end_date:
+        values[":end_date"] = end_date.isoformat()
+    return values
+
+
+def _with_overtime_filter(request: Dict[str, Any], is_overtime: Optional[bool]) -> Dict[str, Any]:
+    if is_overtime is not None:
+        request["FilterExpression"] = "is_overtime = :is_overtime"
+        request["ExpressionAttributeValues"][":is_overtime"] = is_overtime
+    return request
+
+
+def plan_timelog_query(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    is_overtime: Optional[bool] = None
+) -> TimelogQueryPlan:
+    """
+    Choose the access path for a time log read.
+
+    Returns:
+        The plan; its requests apply every filter given
+    """
+    if user_id:
+        request = {
+            "IndexName": USER_START_TIME_INDEX_NAME,
+            "KeyConditionExpression": "user_id = :user_id" + _range_condition(start_date, end_date),
+            "ExpressionAttributeValues": {":user_id": user_id, **_range_values(start_date, end_date)},
+        }
+        return TimelogQueryPlan(
+            path=AccessPath.USER_INDEX_RANGE_QUERY if start_date or end_date else AccessPath.USER_INDEX_QUERY,
+            requests=[_with_overtime_filter(request, is_overtime)],
+            key_attributes=["log_id", "user_id", "start_time"],
+        )
+
+    if start_date and end_date:
+        requests = [
+            _with_overtime_filter({
+                "IndexName": MONTH_INDEX_NAME,
+                "KeyConditionExpression": "month_shard = :month_shard" + _range_condition(start_date, end_date),
+                "ExpressionAttributeValues": {
+                    ":month_shard": month_shard_key(month, shard),
+                    **_range_values(start_date, end_date),
+                },
+            }, is_overtime)
+            for month in months_between(start_date, end_date)
+            for shard in range(settings.DYNAMODB_MONTH_SHARDS)
+        ]
+        return TimelogQueryPlan(
+            path=AccessPath.MONTH_INDEX_RANGE_QUERY,
+            requests=requests,
+            key_attributes=["log_id", "month_shard", "start_time"],
+            partition_attribute="month_shard",
+        )
+
+    filter_parts = []
+    expression_values = _range_values(start_date, end_date)
+    if start_date:
+        filter_parts.append("start_time >= :start_date")
+    if end_date:
+        filter_parts.append("start_time <= :end_date")
+    if is_overtime is not None:
+        filter_parts.append("is_overtime = :is_overtime")
+        expression_values[":is_overtime"] = is_overtime
+
+    scan_request = {}
+    if filter_parts:
+        scan_request["FilterExpression"] = " AND ".join(filter_parts)
+        scan_request["ExpressionAttributeValues"] = expression_values
+    return TimelogQueryPlan(
+        path=AccessPath.PARALLEL_SCAN,
+        requests=[scan_request],
+        key_attributes=["log_id"],
+    )
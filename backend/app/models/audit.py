@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional, Union
+from datetime import datetime
+
+class AuditLogResponse(BaseModel):
+    """Audit log entry response"""
+    audit_id: str
+    action: str
+    user_id: str  # Actor who performed the action
+    entity_type: Optional[str] = None
+    entity_id: Optional[str] = None
+    details: Union[Dict[str, Any], str, None] = None  # Older entries hold a string
+    timestamp: datetime
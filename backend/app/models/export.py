@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+class ExportFormat(str, Enum):
+    """File formats a time log export can be produced in"""
+    CSV = "csv"
+    EXCEL = "excel"
+    PARQUET = "parquet"
+
+class ExportJobStatus(str, Enum):
+    """Export job lifecycle"""
+    PENDING = "pending"  # Waiting for a worker slot
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ExportJobCreate(BaseModel):
+    """Request a background export"""
+    format: ExportFormat = ExportFormat.CSV
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    user_id: Optional[str] = None
+    gzip: bool = False  # CSV only: produce a .csv.gz file
+
+class ExportJobResponse(BaseModel):
+    """Export job status"""
+    job_id: str
+    format: ExportFormat
+    status: ExportJobStatus
+    rows_written: int = 0  # Progress while running
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    download_url: Optional[str] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date
+from enum import Enum
 
 class HolidayBase(BaseModel):
     name: str
@@ -14,3 +15,10 @@ class HolidayResponse(HolidayBase):
     class Config:
         orm_mode = True
         allow_population_by_field_name = True
+
+
+class HolidaySource(str, Enum):
+    """Where a Japanese holiday sync reads its { "YYYY-MM-DD": "name" } data from."""
+    API = "api"  # holidays-jp API (HOLIDAYS_JP_API_URL)
+    FILE = "file"  # Local JSON file (HOLIDAYS_JP_FILE)
+    BUNDLED = "bundled"  # Dataset shipped in app/data
@@ -0,0 +1,10 @@
+from enum import Enum
+
+class SummaryGroupBy(str, Enum):
+    """Breakdowns available in the summary report"""
+    USER = "user"
+    DAY = "day"
+    WEEK = "week"  # ISO week, e.g. 2024-W03
+    MONTH = "month"
+    ATTENDANCE_TYPE = "attendance_type"
+    WORK_LOCATION = "work_location"
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from datetime import datetime
+from app.models.audit import AuditLogResponse
+from app.core.dependencies import get_current_admin_user
+from app.core.config import settings
+from app.db.dynamodb import get_audit_logs
+from app.db.pagination import PaginatedResponse, validate_pagination_params, decode_cursor
+
+router = APIRouter()
+
+@router.get("/", response_model=PaginatedResponse[AuditLogResponse])
+async def get_audit_logs_endpoint(
+    actor_id: Optional[str] = Query(None, description="User who performed the actions"),
+    entity_id: Optional[str] = Query(None, description="ID of the user, time log or leave request acted on"),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    page_size: int = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Get the audit trail of one actor or one entity, newest first (admin only).
+    Exactly one of actor_id and entity_id is required.
+    """
+    _, page_size = validate_pagination_params(None, page_size)
+    entries, last_key = await get_audit_logs(
+        actor_id=actor_id,
+        entity_id=entity_id,
+        start_time=start_time,
+        end_time=end_time,
+        page_size=page_size,
+        last_evaluated_key=decode_cursor(cursor) if cursor else None
+    )
+    return PaginatedResponse.from_page(entries, page_size, last_key)
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, Request
 from app.models.user import UserLogin, UserCreate, UserResponse
 from app.core.security import (
-    verify_password, get_password_hash, create_token_pair,
-    decode_refresh_token, create_access_token
+    verify_password_async, get_password_hash_async, password_needs_rehash,
+    create_token_pair, decode_refresh_token, create_access_token
 )
 from app.core.security_utils import validate_password_strength, sanitize_string
 from app.core.config import settings
 from app.core.exceptions import (
-    AuthenticationError, ValidationError, NotFoundError, ConflictError
+    AppException, AuthenticationError, ValidationError, NotFoundError, ConflictError
 )
 from app.core.logging_config import get_logger
 from app.db.dynamodb import (
@@ -44,7 +44,7 @@ async def register(request: Request, user_data: UserCreate):
         "name": user_data.name,
         "email": user_data.email,
         "role": user_data.role.value,
-        "password_hash": get_password_hash(user_data.password)
+        "password_hash": await get_password_hash_async(user_data.password)
     }
     
     user = await create_user(user_dict)
@@ -62,10 +62,19 @@ async def login(request: Request, credentials: UserLogin):
         logger.warning("Login attempt with invalid email", email=credentials.email)
         raise AuthenticationError("Incorrect email or password")
     
-    if not verify_password(credentials.password, user["password_hash"]):
+    if not await verify_password_async(credentials.password, user["password_hash"]):
         logger.warning("Login attempt with invalid password", email=credentials.email, user_id=user["user_id"])
         raise AuthenticationError("Incorrect email or password")
     
+    # Upgrade hashes made with an older bcrypt cost while the password is at hand
+    if password_needs_rehash(user["password_hash"]):
+        try:
+            await update_user(user["user_id"], {"password_hash": await get_password_hash_async(credentials.password)})
+            logger.info("Password rehashed", user_id=user["user_id"], rounds=settings.BCRYPT_ROUNDS)
+        except AppException as e:
+            # The login itself succeeded; the upgrade is retried on the next login
+            logger.warning("Password rehash failed", user_id=user["user_id"], error=str(e.detail))
+    
     # Create token pair (access + refresh)
     tokens = create_token_pair(user["user_id"], user["role"])
     
@@ -135,12 +144,12 @@ async def change_password(
     if not user:
         raise NotFoundError("User")
 
-    if not verify_password(payload.current_password, user["password_hash"]):
+    if not await verify_password_async(payload.current_password, user["password_hash"]):
         logger.warning("Password change failed: incorrect current password", user_id=current_user["user_id"])
         raise ValidationError("Current password is incorrect")
 
     await update_user(current_user["user_id"], {
-        "password_hash": get_password_hash(payload.new_password),
+        "password_hash": await get_password_hash_async(payload.new_password),
         "must_change_password": False
     })
     
@@ -48,7 +48,8 @@ async def create_leave_request_endpoint(
     }
     
     leave_request = await create_leave_request(request_data)
-    await create_audit_log("leave_request_created", current_user["user_id"], {"request_id": leave_request["request_id"]})
+    await create_audit_log("leave_request_created", current_user["user_id"], {"request_id": leave_request["request_id"]},
+                           entity_type="leave_request", entity_id=leave_request["request_id"])
     logger.info("Leave request created", request_id=leave_request["request_id"], user_id=current_user["user_id"])
     
     return leave_request
@@ -121,7 +122,8 @@ async def approve_leave_request(
     }
     
     updated_request = await update_leave_request(request_id, update_data)
-    await create_audit_log("leave_request_approved", current_user["user_id"], {"request_id": request_id})
+    await create_audit_log("leave_request_approved", current_user["user_id"], {"request_id": request_id},
+                           entity_type="leave_request", entity_id=request_id)
     logger.info("Leave request approved", request_id=request_id, admin_user_id=current_user["user_id"])
     
     return updated_request
@@ -151,7 +153,8 @@ async def decline_leave_request(
     }
     
     updated_request = await update_leave_request(request_id, update_data)
-    await create_audit_log("leave_request_declined", current_user["user_id"], {"request_id": request_id})
+    await create_audit_log("leave_request_declined", current_user["user_id"], {"request_id": request_id},
+                           entity_type="leave_request", entity_id=request_id)
     logger.info("Leave request declined", request_id=request_id, admin_user_id=current_user["user_id"])
     
     return updated_request
@@ -174,7 +177,8 @@ async def delete_leave_request_endpoint(
             raise ValidationError("Only pending requests can be deleted")
     
     await delete_leave_request(request_id)
-    await create_audit_log("leave_request_deleted", current_user["user_id"], {"request_id": request_id})
+    await create_audit_log("leave_request_deleted", current_user["user_id"], {"request_id": request_id},
+                           entity_type="leave_request", entity_id=request_id)
     logger.info("Leave request deleted", request_id=request_id, user_id=current_user["user_id"])
     
     return None
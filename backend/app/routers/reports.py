@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
-import pandas as pd
-import io
+import asyncio
+from app.core.config import settings
 from app.core.dependencies import get_current_accountant_user
-from app.db.dynamodb import get_all_timelogs, get_all_users
+from app.core.exceptions import ConflictError, NotFoundError
+from app.models.report import SummaryGroupBy
+from app.models.export import ExportJobCreate, ExportJobResponse, ExportJobStatus
+from app.services.report_summary import get_summary
+from app.services.export_jobs import export_file_name, export_jobs, export_media_type
+from app.services.report_export import (
+    FILE_CHUNK_SIZE, EXCEL_MEDIA_TYPE, PARQUET_MEDIA_TYPE,
+    iter_csv, iter_excel, iter_export_rows, iter_parquet
+)
 
 router = APIRouter()
 
@@ -14,95 +22,31 @@ async def get_summary_report(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     user_id: Optional[str] = Query(None),
+    group_by: Optional[SummaryGroupBy] = Query(None, description="Add a breakdown by user, day, week, month, attendance_type or work_location"),
     current_user = Depends(get_current_accountant_user)
 ):
-    """Get summary statistics for time logs."""
-    logs, _ = await get_all_timelogs(
-        start_date=start_date,
-        end_date=end_date,
-        user_id=user_id
-    )
-    
-    if not logs:
-        return {
-            "total_hours": 0,
-            "total_overtime_hours": 0,
-            "total_entries": 0,
-            "average_hours_per_day": 0,
-            "overtime_entries": 0
-        }
-    
-    total_hours = sum(float(log.get("total_hours", 0)) for log in logs)
-    # Use overtime_hours field if available, otherwise fall back to total_hours for overtime logs
-    total_overtime_hours = sum(
-        float(log.get("overtime_hours", log.get("total_hours", 0) if log.get("is_overtime", False) else 0))
-        for log in logs
-    )
-    overtime_logs = [log for log in logs if log.get("is_overtime", False)]
-    
-    # Calculate unique days - handle both datetime objects and strings
-    unique_days_set = set()
-    for log in logs:
-        start_time = log.get("start_time")
-        if start_time:
-            if isinstance(start_time, datetime):
-                # If it's a datetime object, format it as YYYY-MM-DD
-                day_str = start_time.strftime("%Y-%m-%d")
-            elif isinstance(start_time, str):
-                # If it's a string, take first 10 characters
-                day_str = start_time[:10]
-            else:
-                continue
-            unique_days_set.add(day_str)
-    unique_days = len(unique_days_set)
-    avg_hours = total_hours / unique_days if unique_days > 0 else 0
-    
-    return {
-        "total_hours": round(total_hours, 2),
-        "total_overtime_hours": round(total_overtime_hours, 2),
-        "total_entries": len(logs),
-        "average_hours_per_day": round(avg_hours, 2),
-        "overtime_entries": len(overtime_logs)
-    }
+    """
+    Get summary statistics for time logs, computed over every matching log in one pass.
+    Repeated requests are served from the report cache until a matching log changes.
+    """
+    return await get_summary(start_date, end_date, user_id, group_by)
 
 @router.get("/export/csv")
 async def export_csv(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     user_id: Optional[str] = Query(None),
+    gzip: bool = Query(False, description="Compress the response with gzip content encoding"),
     current_user = Depends(get_current_accountant_user)
 ):
-    """Export time logs to CSV."""
-    logs, _ = await get_all_timelogs(
-        start_date=start_date,
-        end_date=end_date,
-        user_id=user_id
-    )
-    users, _ = await get_all_users()
-    user_map = {user["user_id"]: user["name"] for user in users}
-    
-    # Prepare data
-    data = []
-    for log in logs:
-        data.append({
-            "Date": log.get("start_time", "")[:10],
-            "Employee": user_map.get(log.get("user_id", ""), "Unknown"),
-            "Start Time": log.get("start_time", ""),
-            "End Time": log.get("end_time", ""),
-            "Break Duration (hours)": log.get("break_duration", 0),
-            "Total Hours": log.get("total_hours", 0),
-            "Overtime": "Yes" if log.get("is_overtime", False) else "No"
-        })
-    
-    df = pd.DataFrame(data)
-    output = io.StringIO()
-    df.to_csv(output, index=False)
-    output.seek(0)
-    
+    """Export time logs to CSV, streamed while the logs are read."""
+    headers = {"Content-Disposition": "attachment; filename=timelogs_export.csv"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
     return StreamingResponse(
-        io.BytesIO(output.getvalue().encode()),
+        iter_csv(iter_export_rows(start_date, end_date, user_id), compress=gzip),
         media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=timelogs_export.csv"}
+        headers=headers
     )
 
 @router.get("/export/excel")
@@ -112,37 +56,123 @@ async def export_excel(
     user_id: Optional[str] = Query(None),
     current_user = Depends(get_current_accountant_user)
 ):
-    """Export time logs to Excel."""
-    logs, _ = await get_all_timelogs(
-        start_date=start_date,
-        end_date=end_date,
-        user_id=user_id
-    )
-    users, _ = await get_all_users()
-    user_map = {user["user_id"]: user["name"] for user in users}
-    
-    # Prepare data
-    data = []
-    for log in logs:
-        data.append({
-            "Date": log.get("start_time", "")[:10],
-            "Employee": user_map.get(log.get("user_id", ""), "Unknown"),
-            "Start Time": log.get("start_time", ""),
-            "End Time": log.get("end_time", ""),
-            "Break Duration (hours)": log.get("break_duration", 0),
-            "Total Hours": log.get("total_hours", 0),
-            "Overtime": "Yes" if log.get("is_overtime", False) else "No"
-        })
-    
-    df = pd.DataFrame(data)
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Time Logs')
-    output.seek(0)
-    
+    """Export time logs to Excel, built in a temporary file and then streamed."""
     return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        iter_excel(iter_export_rows(start_date, end_date, user_id)),
+        media_type=EXCEL_MEDIA_TYPE,
         headers={"Content-Disposition": "attachment; filename=timelogs_export.xlsx"}
     )
 
+@router.get("/export/parquet")
+async def export_parquet(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    user_id: Optional[str] = Query(None),
+    current_user = Depends(get_current_accountant_user)
+):
+    """
+    Export time logs to Parquet with typed columns, for analytics tools.
+    """
+    return StreamingResponse(
+        iter_parquet(start_date, end_date, user_id),
+        media_type=PARQUET_MEDIA_TYPE,
+        headers={"Content-Disposition": "attachment; filename=timelogs_export.parquet"}
+    )
+
+def _job_response(job: dict) -> ExportJobResponse:
+    response = ExportJobResponse(**job)
+    if job["status"] == ExportJobStatus.COMPLETED:
+        response.download_url = f"{settings.API_V1_STR}/reports/exports/{job['job_id']}/download"
+    return response
+
+def _parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" Range header into inclusive offsets.
+
+    Returns None for headers that are not a single byte range, which are
+    answered with the whole file.
+
+    Raises:
+        HTTPException: 416 if the range lies outside the file
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # "bytes=-N" is the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+async def _iter_file_range(path, start: int, end: int):
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(file.read, min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def _get_visible_job(job_id: str, current_user: dict) -> dict:
+    """
+    Get an export job requested by the current user; admins see every job.
+    
+    Raises:
+        NotFoundError: If the job does not exist or belongs to someone else,
+            so job ids of other users are not confirmed
+    """
+    job = export_jobs.get(job_id)
+    if not job or (current_user["role"] != "admin" and current_user["user_id"] not in job["requesters"]):
+        raise NotFoundError("Export job")
+    return job
+
+@router.post("/exports", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(request: ExportJobCreate, current_user = Depends(get_current_accountant_user)):
+    """
+    Start a background export. Poll the returned job until it is completed,
+    then fetch its download_url. An identical export that is still running
+    is returned instead of starting a new one.
+    """
+    return _job_response(export_jobs.submit(request, current_user["user_id"]))
+
+@router.get("/exports/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(job_id: str, current_user = Depends(get_current_accountant_user)):
+    """Get the status and progress of an export job."""
+    return _job_response(_get_visible_job(job_id, current_user))
+
+@router.get("/exports/{job_id}/download")
+async def download_export(job_id: str, request: Request, current_user = Depends(get_current_accountant_user)):
+    """Download a finished export. Supports single byte-range requests for resuming."""
+    job = _get_visible_job(job_id, current_user)
+    if job["status"] != ExportJobStatus.COMPLETED:
+        raise ConflictError(f"Export job is {job['status'].value}")
+
+    size = job["size_bytes"]
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename={export_file_name(job['format'], job['gzip'])}",
+    }
+    byte_range = _parse_byte_range(request.headers["range"], size) if "range" in request.headers and size else None
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        _iter_file_range(job["path"], start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=export_media_type(job["format"], job["gzip"]),
+        headers=headers
+    )
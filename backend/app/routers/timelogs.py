@@ -8,11 +8,12 @@ from app.core.security_utils import sanitize_input
 from app.core.logging_config import get_logger
 from app.core.config import settings
 from app.services.timelog_service import create_time_entry, update_time_entry
+from app.services.report_cache import report_cache
 from app.db.dynamodb import (
     get_timelog_by_id, get_timelogs_by_user, get_all_timelogs,
     delete_timelog, create_audit_log
 )
-from app.db.pagination import validate_pagination_params
+from app.db.pagination import PaginatedResponse, validate_pagination_params, decode_cursor
 
 logger = get_logger(__name__)
 
@@ -54,7 +55,8 @@ async def create_timelog_endpoint(
             attendance_type=timelog_data.attendance_type.value if hasattr(timelog_data.attendance_type, 'value') else timelog_data.attendance_type,
             work_location=timelog_data.work_location.value if timelog_data.work_location and hasattr(timelog_data.work_location, 'value') else timelog_data.work_location
         )
-        await create_audit_log("timelog_created", current_user["user_id"], {"log_id": log["log_id"]})
+        await create_audit_log("timelog_created", current_user["user_id"], {"log_id": log["log_id"]},
+                               entity_type="timelog", entity_id=log["log_id"])
         logger.info("Timelog created", log_id=log["log_id"], user_id=current_user["user_id"])
         return log
     except ValueError as e:
@@ -74,29 +76,29 @@ async def get_my_timelogs(
     )
     return logs
 
-@router.get("/", response_model=List[TimeLogResponse])
+@router.get("/", response_model=PaginatedResponse[TimeLogResponse])
 async def get_all_timelogs_endpoint(
     user_id: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     is_overtime: Optional[bool] = Query(None),
-    page: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     page_size: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
     current_user = Depends(get_current_accountant_user)
 ):
     """Get all time logs with filters (accountant/admin only)."""
     # Validate pagination
-    page, page_size = validate_pagination_params(page, page_size)
+    _, page_size = validate_pagination_params(None, page_size)
     
     logs, last_key = await get_all_timelogs(
         start_date=start_date,
         end_date=end_date,
         user_id=user_id,
         is_overtime=is_overtime,
-        page=page,
-        page_size=page_size
+        page_size=page_size,
+        last_evaluated_key=decode_cursor(cursor) if cursor else None
     )
-    return logs
+    return PaginatedResponse.from_page(logs, page_size, last_key)
 
 @router.get("/{log_id}", response_model=TimeLogResponse)
 async def get_timelog(log_id: str, current_user = Depends(get_current_user)):
@@ -126,8 +128,10 @@ async def update_timelog_endpoint(
     if current_user["role"] == "employee" and existing_log["user_id"] != current_user["user_id"]:
         raise AuthorizationError("Not enough permissions to edit this time log")
     
-    # Check if log is too old to edit
-    created_at = datetime.fromisoformat(existing_log["created_at"])
+    # Check if log is too old to edit (normalized items already hold datetimes)
+    created_at = existing_log["created_at"]
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
     days_old = (datetime.utcnow() - created_at).days
     if current_user["role"] == "employee" and days_old > settings.MAX_EDIT_DAYS:
         raise ValidationError(f"Cannot edit logs older than {settings.MAX_EDIT_DAYS} days")
@@ -158,7 +162,8 @@ async def update_timelog_endpoint(
             attendance_type=timelog_data.attendance_type.value if timelog_data.attendance_type and hasattr(timelog_data.attendance_type, 'value') else timelog_data.attendance_type,
             work_location=timelog_data.work_location.value if timelog_data.work_location and hasattr(timelog_data.work_location, 'value') else timelog_data.work_location
         )
-        await create_audit_log("timelog_updated", current_user["user_id"], {"log_id": log_id})
+        await create_audit_log("timelog_updated", current_user["user_id"], {"log_id": log_id},
+                               entity_type="timelog", entity_id=log_id)
         logger.info("Timelog updated", log_id=log_id, user_id=current_user["user_id"])
         return updated_log
     except ValueError as e:
@@ -167,7 +172,7 @@ async def update_timelog_endpoint(
 @router.delete("/{log_id}", status_code=204)
 async def delete_timelog_endpoint(log_id: str, current_user = Depends(get_current_user)):
     """Delete a time log entry."""
-    from app.services.timelog_service import calculate_daily_overtime
+    from app.services.timelog_service import recalculate_overtime_after_write
     
     existing_log = await get_timelog_by_id(log_id)
     if not existing_log:
@@ -226,10 +231,14 @@ async def delete_timelog_endpoint(log_id: str, current_user = Depends(get_curren
     
     await delete_timelog(log_id)
     
-    # Recalculate overtime for all remaining logs on this day
-    await calculate_daily_overtime(user_id, start_time)
+    try:
+        # Recalculate overtime for all remaining logs on this day
+        await recalculate_overtime_after_write(user_id, start_time, deleted_log_id=log_id)
+    finally:
+        report_cache.invalidate_user_month(user_id, start_time)
     
-    await create_audit_log("timelog_deleted", current_user["user_id"], {"log_id": log_id})
+    await create_audit_log("timelog_deleted", current_user["user_id"], {"log_id": log_id},
+                           entity_type="timelog", entity_id=log_id)
     logger.info("Timelog deleted", log_id=log_id, user_id=current_user["user_id"])
     return None
 
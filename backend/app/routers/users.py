@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query
-from typing import List
+from typing import List, Optional
 from app.models.user import UserCreate, UserUpdate, UserResponse
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.core.security_utils import validate_password_strength, sanitize_string
 from app.core.dependencies import get_current_admin_user, get_current_user
 from app.core.exceptions import NotFoundError, ConflictError, ValidationError
@@ -12,23 +12,26 @@ from app.db.dynamodb import (
     update_user, delete_user, get_user_by_email
 )
 from app.db.dynamodb import create_audit_log
-from app.db.pagination import validate_pagination_params
+from app.db.pagination import PaginatedResponse, validate_pagination_params, decode_cursor
 from datetime import datetime
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=PaginatedResponse[UserResponse])
 async def get_users(
-    page: int = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     page_size: int = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
     current_user = Depends(get_current_admin_user)
 ):
     """Get all users (admin only)."""
-    page, page_size = validate_pagination_params(page, page_size)
-    users, last_key = await get_all_users(page=page, page_size=page_size)
-    return users
+    _, page_size = validate_pagination_params(None, page_size)
+    users, last_key = await get_all_users(
+        page_size=page_size,
+        last_evaluated_key=decode_cursor(cursor) if cursor else None
+    )
+    return PaginatedResponse.from_page(users, page_size, last_key)
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(user_id: str, current_user = Depends(get_current_admin_user)):
@@ -59,12 +62,13 @@ async def create_user_endpoint(user_data: UserCreate, current_user = Depends(get
         "name": user_data.name,
         "email": user_data.email,
         "role": user_data.role.value,
-        "password_hash": get_password_hash(user_data.password),
+        "password_hash": await get_password_hash_async(user_data.password),
         "must_change_password": True
     }
     
     user = await create_user(user_dict)
-    await create_audit_log("user_created", current_user["user_id"], {"created_user_id": user["user_id"]})
+    await create_audit_log("user_created", current_user["user_id"], {"created_user_id": user["user_id"]},
+                           entity_type="user", entity_id=user["user_id"])
     logger.info("User created", created_user_id=user["user_id"], created_by=current_user["user_id"])
     return user
 
@@ -97,10 +101,11 @@ async def update_user_endpoint(
         is_valid, errors = validate_password_strength(user_data.password)
         if not is_valid:
             raise ValidationError(f"Password validation failed: {', '.join(errors)}")
-        update_dict["password_hash"] = get_password_hash(user_data.password)
+        update_dict["password_hash"] = await get_password_hash_async(user_data.password)
     
     updated_user = await update_user(user_id, update_dict)
-    await create_audit_log("user_updated", current_user["user_id"], {"updated_user_id": user_id})
+    await create_audit_log("user_updated", current_user["user_id"], {"updated_user_id": user_id},
+                           entity_type="user", entity_id=user_id)
     logger.info("User updated", updated_user_id=user_id, updated_by=current_user["user_id"])
     return updated_user
 
@@ -115,7 +120,8 @@ async def delete_user_endpoint(user_id: str, current_user = Depends(get_current_
         raise NotFoundError("User")
     
     await delete_user(user_id)
-    await create_audit_log("user_deleted", current_user["user_id"], {"deleted_user_id": user_id})
+    await create_audit_log("user_deleted", current_user["user_id"], {"deleted_user_id": user_id},
+                           entity_type="user", entity_id=user_id)
     logger.info("User deleted", deleted_user_id=user_id, deleted_by=current_user["user_id"])
     return None
 
@@ -139,9 +145,10 @@ async def reset_user_password(
     if not is_valid:
         raise ValidationError(f"Password validation failed: {', '.join(errors)}")
     
-    update_dict = {"password_hash": get_password_hash(new_password), "must_change_password": True}
+    update_dict = {"password_hash": await get_password_hash_async(new_password), "must_change_password": True}
     await update_user(user_id, update_dict)
-    await create_audit_log("password_reset", current_user["user_id"], {"reset_user_id": user_id})
+    await create_audit_log("password_reset", current_user["user_id"], {"reset_user_id": user_id},
+                           entity_type="user", entity_id=user_id)
     logger.info("Password reset", reset_user_id=user_id, reset_by=current_user["user_id"])
     return {"message": "Password reset successfully"}
 
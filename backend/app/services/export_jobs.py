@@ -0,0 +1,243 @@
+"""
+Background export jobs.
+
+Large exports are produced outside the HTTP request: a job is queued, a
+worker task writes the file to EXPORT_DIR while reporting progress, and the
+finished file can be downloaded until it expires. At most
+EXPORT_MAX_CONCURRENT_JOBS exports run at once, and a request identical to
+an export that is still pending or running joins that job instead of
+starting another one.
+
+Job state lives in this process, so every request for a job must reach the
+process that created it. A job is only visible to the users who requested
+it, including those who joined it, and to admins.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.models.export import ExportFormat, ExportJobCreate, ExportJobStatus
+from app.services.report_export import (
+    EXCEL_MEDIA_TYPE, PARQUET_MEDIA_TYPE, iter_csv, iter_export_rows, write_excel, write_parquet
+)
+
+logger = get_logger(__name__)
+
+ACTIVE_STATUSES = (ExportJobStatus.PENDING, ExportJobStatus.RUNNING)
+
+FILE_EXTENSIONS = {
+    ExportFormat.CSV: ".csv",
+    ExportFormat.EXCEL: ".xlsx",
+    ExportFormat.PARQUET: ".parquet",
+}
+
+
+def export_file_name(export_format: ExportFormat, gzip: bool) -> str:
+    """Download file name for an export."""
+    extension = FILE_EXTENSIONS[export_format]
+    return f"timelogs_export{extension}.gz" if gzip else f"timelogs_export{extension}"
+
+
+def export_media_type(export_format: ExportFormat, gzip: bool) -> str:
+    """Content type for an export file."""
+    if export_format == ExportFormat.EXCEL:
+        return EXCEL_MEDIA_TYPE
+    if export_format == ExportFormat.PARQUET:
+        return PARQUET_MEDIA_TYPE
+    return "application/gzip" if gzip else "text/csv"
+
+
+def _dedup_key(request: ExportJobCreate) -> str:
+    """Identify requests that produce the same file."""
+    return json.dumps(request.model_dump(mode="json"), sort_keys=True)
+
+
+class ExportJobManager:
+    """Runs export jobs in background tasks and keeps their files until they expire."""
+
+    def __init__(self, export_dir: Path, ttl_seconds: float, max_concurrent_jobs: int):
+        self.export_dir = export_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.deduplicated = 0
+        self._jobs: Dict[str, dict] = {}
+        self._active_by_key: Dict[str, str] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    def submit(self, request: ExportJobCreate, requested_by: str) -> dict:
+        """
+        Queue an export, or return the pending or running job for an identical request.
+
+        Must be called from the event loop the jobs should run on.
+        """
+        key = _dedup_key(request)
+        active_id = self._active_by_key.get(key)
+        if active_id and self._jobs[active_id]["status"] in ACTIVE_STATUSES:
+            self.deduplicated += 1
+            self._jobs[active_id]["requesters"].add(requested_by)
+            logger.info("Export request joined running job", job_id=active_id, requested_by=requested_by)
+            return self._jobs[active_id]
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        job_id = str(uuid.uuid4())
+        job = {
+            "job_id": job_id,
+            "format": request.format,
+            "gzip": request.gzip and request.format == ExportFormat.CSV,
+            "status": ExportJobStatus.PENDING,
+            "rows_written": 0,
+            "size_bytes": None,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "completed_at": None,
+            "expires_at": None,
+            "requested_by": requested_by,
+            "requesters": {requested_by},
+            "path": None,
+        }
+        self._jobs[job_id] = job
+        self._active_by_key[key] = job_id
+        self._tasks[job_id] = asyncio.create_task(self._run(job, request, key))
+        logger.info("Export job queued", job_id=job_id, format=request.format.value, requested_by=requested_by)
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Get a job, or None if it is unknown or has expired."""
+        job = self._jobs.get(job_id)
+        if job and job["expires_at"] and job["expires_at"] <= datetime.utcnow():
+            self._remove(job_id)
+            return None
+        return job
+
+    async def _count_rows(self, job: dict, rows: AsyncIterator[List[Any]]) -> AsyncIterator[List[Any]]:
+        async for row in rows:
+            job["rows_written"] += 1
+            yield row
+
+    async def _write(self, job: dict, request: ExportJobCreate, path: Path) -> None:
+        def count_row() -> None:
+            job["rows_written"] += 1
+
+        with open(path, "wb") as file:
+            if request.format == ExportFormat.PARQUET:
+                await write_parquet(file, request.start_date, request.end_date, request.user_id, on_row=count_row)
+                return
+            rows = self._count_rows(job, iter_export_rows(request.start_date, request.end_date, request.user_id))
+            if request.format == ExportFormat.EXCEL:
+                await write_excel(rows, file)
+            else:
+                async for chunk in iter_csv(rows, compress=job["gzip"]):
+                    await asyncio.to_thread(file.write, chunk)
+
+    async def _run(self, job: dict, request: ExportJobCreate, key: str) -> None:
+        path = self.export_dir / f"{job['job_id']}{FILE_EXTENSIONS[request.format]}"
+        try:
+            async with self._slots:
+                job.update(status=ExportJobStatus.RUNNING, path=path)
+                started = time.perf_counter()
+                self.export_dir.mkdir(parents=True, exist_ok=True)
+                await self._write(job, request, path)
+                job.update(status=ExportJobStatus.COMPLETED, size_bytes=path.stat().st_size)
+                logger.info(
+                    "Export job completed",
+                    job_id=job["job_id"],
+                    rows=job["rows_written"],
+                    size_bytes=job["size_bytes"],
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1)
+                )
+        except Exception as e:
+            job.update(status=ExportJobStatus.FAILED, error=str(e), path=None)
+            path.unlink(missing_ok=True)
+            logger.error("Export job failed", job_id=job["job_id"], error=str(e))
+        finally:
+            # Failed jobs expire too, so their status can still be polled for a while
+            job["completed_at"] = datetime.utcnow()
+            job["expires_at"] = job["completed_at"] + timedelta(seconds=self.ttl_seconds)
+            self._tasks.pop(job["job_id"], None)
+            if self._active_by_key.get(key) == job["job_id"]:
+                del self._active_by_key[key]
+
+    def _remove(self, job_id: str) -> None:
+        job = self._jobs.pop(job_id)
+        if job["path"]:
+            job["path"].unlink(missing_ok=True)
+
+    def cleanup_expired(self) -> int:
+        """
+        Delete expired jobs and their files.
+
+        Files in EXPORT_DIR older than the TTL that no job refers to, such as
+        those left by a previous process, are deleted as well.
+
+        Returns:
+            Number of files deleted
+        """
+        now = datetime.utcnow()
+        removed = 0
+        for job_id, job in list(self._jobs.items()):
+            if job["expires_at"] and job["expires_at"] <= now:
+                removed += 1 if job["path"] else 0
+                self._remove(job_id)
+
+        known = {job["path"] for job in self._jobs.values() if job["path"]}
+        if self.export_dir.is_dir():
+            cutoff = time.time() - self.ttl_seconds
+            for path in self.export_dir.iterdir():
+                if path.is_file() and path not in known and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        if removed:
+            logger.info("Expired exports removed", files=removed)
+        return removed
+
+    async def _cleanup_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.cleanup_expired()
+            except OSError as e:
+                logger.error("Export cleanup failed", error=str(e))
+
+    def start(self, cleanup_interval: float) -> None:
+        """Start periodic cleanup on the running event loop."""
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop(cleanup_interval))
+
+    async def stop(self) -> None:
+        """Cancel cleanup and running exports, and delete every export file of this process."""
+        tasks = list(self._tasks.values())
+        if self._cleanup_task is not None:
+            tasks.append(self._cleanup_task)
+            self._cleanup_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job_id in list(self._jobs):
+            self._remove(job_id)
+        self._active_by_key.clear()
+        self._slots = None
+
+    def stats(self) -> Dict[str, int]:
+        """Job counts by status, for health and metrics endpoints."""
+        counts = {status.value: 0 for status in ExportJobStatus}
+        for job in self._jobs.values():
+            counts[job["status"].value] += 1
+        counts["deduplicated"] = self.deduplicated
+        return counts
+
+
+export_jobs = ExportJobManager(
+    Path(settings.EXPORT_DIR or os.path.join(tempfile.gettempdir(), "time_tracking_exports")),
+    ttl_seconds=settings.EXPORT_JOB_TTL_SECONDS,
+    max_concurrent_jobs=settings.EXPORT_MAX_CONCURRENT_JOBS,
+)
@@ -0,0 +1,57 @@
+"""
+Process-wide holiday calendar.
+
+Overtime checks run on every time log write, so the holiday dates are loaded
+once into a set and served from memory until HOLIDAY_CACHE_TTL_SECONDS have
+passed. Endpoints that change holidays invalidate the calendar right away;
+other processes pick up the change when their TTL expires.
+"""
+import time
+from datetime import date
+from typing import FrozenSet, Optional
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.db.dynamodb import get_holidays_as_dates
+
+logger = get_logger(__name__)
+
+
+class HolidayCalendar:
+    """Holiday dates cached in memory with a time-to-live."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._dates: Optional[FrozenSet[date]] = None
+        self._loaded_at = 0.0
+        # Bumped by every invalidation, so a load that started before a
+        # holiday changed is not stored afterwards
+        self.generation = 0
+
+    def _is_fresh(self) -> bool:
+        return self._dates is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def get_dates(self) -> FrozenSet[date]:
+        """Get all holiday dates, loading them from DynamoDB if the cache is empty or expired."""
+        if self._is_fresh():
+            return self._dates
+        # Concurrent misses may load twice; either result is valid unless the
+        # calendar was invalidated while loading, in which case it is not kept
+        generation = self.generation
+        dates = frozenset(await get_holidays_as_dates())
+        if generation == self.generation:
+            self._dates = dates
+            self._loaded_at = time.monotonic()
+            logger.info("Holiday calendar loaded", holidays=len(dates))
+        return dates
+
+    async def is_holiday(self, day: date) -> bool:
+        """Check whether a date is a holiday."""
+        return day in await self.get_dates()
+
+    def invalidate(self) -> None:
+        """Drop the cached dates so the next lookup reloads them."""
+        self.generation += 1
+        self._dates = None
+
+
+holiday_calendar = HolidayCalendar(settings.HOLIDAY_CACHE_TTL_SECONDS)
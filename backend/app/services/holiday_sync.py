@@ -0,0 +1,122 @@
+"""
+Japanese public holiday sync.
+
+Holidays are read from the holidays-jp API, a local JSON file or the bundled
+dataset, compared against the stored dates once, and only the new ones are
+written in BatchWriteItem batches.
+"""
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+import httpx
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.core.logging_config import get_logger
+from app.db.dynamodb import iter_holidays, batch_create_holidays
+from app.models.holiday import HolidaySource
+from app.services.holiday_calendar import holiday_calendar
+
+logger = get_logger(__name__)
+
+BUNDLED_HOLIDAYS_FILE = Path(__file__).resolve().parent.parent / "data" / "holidays_jp.json"
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _read_holidays_file(path: Path) -> Dict[str, str]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error("Failed to read holidays file", path=str(path), error=str(e))
+        raise ValidationError(f"Could not read holidays file {path.name}") from e
+    if not isinstance(data, dict):
+        raise ValidationError(f"Holidays file {path.name} must map dates to names")
+    return data
+
+
+async def load_holidays(source: HolidaySource) -> Dict[str, str]:
+    """
+    Load holidays as { "YYYY-MM-DD": "name" } from the given source.
+
+    Raises:
+        httpx.HTTPError: If the holidays-jp API cannot be reached
+        ValidationError: If a local file is missing, unreadable or malformed
+    """
+    if source == HolidaySource.API:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(settings.HOLIDAYS_JP_API_URL)
+            response.raise_for_status()
+            return response.json()
+    if source == HolidaySource.FILE:
+        if not settings.HOLIDAYS_JP_FILE:
+            raise ValidationError("HOLIDAYS_JP_FILE is not configured")
+        return _read_holidays_file(Path(settings.HOLIDAYS_JP_FILE))
+    return _read_holidays_file(BUNDLED_HOLIDAYS_FILE)
+
+
+async def sync_holidays(holidays_data: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Store the holidays whose dates are not in the table yet.
+
+    Returns:
+        Counts of synced and skipped holidays, per-entry errors, the number
+        of holidays written by each batch and the time spent comparing and
+        writing, in milliseconds
+    """
+    started = time.perf_counter()
+    existing_dates = set()
+    async for holiday in iter_holidays():
+        if holiday.get("date"):
+            existing_dates.add(holiday["date"])
+
+    new_holidays: List[dict] = []
+    skipped_count = 0
+    errors = []
+    for date_str, holiday_name in holidays_data.items():
+        try:
+            holiday_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except (TypeError, ValueError) as e:
+            logger.error("Invalid holiday date", date=date_str, error=str(e))
+            errors.append(f"{date_str}: {str(e)}")
+            continue
+        if holiday_date.isoformat() in existing_dates:
+            skipped_count += 1
+            continue
+        # Also guards against a date listed twice in the source
+        existing_dates.add(holiday_date.isoformat())
+        new_holidays.append({"name": holiday_name, "date": holiday_date})
+    diff_ms = _elapsed_ms(started)
+
+    write_started = time.perf_counter()
+    batches = []
+    try:
+        batches = await batch_create_holidays(new_holidays)
+    finally:
+        if new_holidays:
+            # Even a partly failed sync may have written some holidays
+            holiday_calendar.invalidate()
+    write_ms = _elapsed_ms(write_started)
+
+    logger.info("Holidays synced", synced=sum(batches), skipped=skipped_count, batches=len(batches))
+    return {
+        "synced": sum(batches),
+        "skipped": skipped_count,
+        "errors": errors if errors else None,
+        "batches": batches,
+        "timing_ms": {"diff": diff_ms, "write": write_ms},
+    }
+
+
+async def sync_jp_holidays(source: HolidaySource = HolidaySource.API) -> Dict[str, Any]:
+    """Load Japanese holidays from a source and store the new ones."""
+    started = time.perf_counter()
+    holidays_data = await load_holidays(source)
+    fetch_ms = _elapsed_ms(started)
+
+    result = await sync_holidays(holidays_data)
+    result["timing_ms"] = {"fetch": fetch_ms, **result["timing_ms"], "total": _elapsed_ms(started)}
+    return {"message": "Holidays synced successfully", "source": source.value, **result}
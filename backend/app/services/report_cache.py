@@ -0,0 +1,91 @@
+"""
+Cache of summary report results.
+
+Results are keyed by the normalized filter set. A time log write
+invalidates every cached report that could include the log: reports
+covering its user, or all users, whose date range overlaps the month of its
+start_time. Unaffected reports stay cached.
+
+Invalidation only reaches this process; other processes serve their copy
+until REPORT_CACHE_TTL_SECONDS have passed.
+"""
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# (user_id, start_date, end_date, group_by), dates as ISO strings; None means unfiltered
+ReportKey = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+def report_key(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    user_id: Optional[str],
+    group_by: Optional[str]
+) -> ReportKey:
+    """Normalize report filters into a cache key."""
+    return (
+        user_id or None,
+        start_date.isoformat() if start_date else None,
+        end_date.isoformat() if end_date else None,
+        group_by or None,
+    )
+
+
+def _covers(key: Hashable, user_id: str, month: str) -> bool:
+    """Whether a report with this key can include a log of user_id starting in month (YYYY-MM)."""
+    key_user_id, start_date, end_date, _ = key
+    # Same ISO prefix comparison as the start_time filters the reports run
+    return (
+        (key_user_id is None or key_user_id == user_id)
+        and (start_date is None or start_date[:7] <= month)
+        and (end_date is None or month <= end_date[:7])
+    )
+
+
+class ReportCache:
+    """Report results cached by filters and invalidated per user and month."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize, ttl)
+        # Bumped by every invalidation, so a report computed while a write
+        # happened is not stored afterwards
+        self.generation = 0
+        self.invalidations = 0
+
+    def get(self, key: ReportKey) -> Optional[Any]:
+        return self._entries.get(key)
+
+    def set(self, key: ReportKey, value: Any, generation: int) -> None:
+        """
+        Store a report computed from data read after ``generation`` was taken.
+
+        Dropped if a time log was written since, as the report may miss it.
+        """
+        if generation == self.generation:
+            self._entries.set(key, value)
+
+    def invalidate_user_month(self, user_id: str, start_time: datetime) -> int:
+        """
+        Drop cached reports that can include a log of user_id starting at start_time.
+
+        Returns:
+            Number of reports dropped
+        """
+        month = start_time.isoformat()[:7]
+        self.generation += 1
+        dropped = self._entries.invalidate_where(lambda key: _covers(key, user_id, month))
+        self.invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, hit/miss counters and reports dropped by writes."""
+        return {**self._entries.stats(), "invalidations": self.invalidations}
+
+
+report_cache = ReportCache(settings.REPORT_CACHE_MAX_ENTRIES, ttl=settings.REPORT_CACHE_TTL_SECONDS)
@@ -0,0 +1,270 @@
+"""
+Streaming time log exports.
+
+Rows are produced while the time logs are paged out of DynamoDB, and each
+format encoder turns them into output chunks as they arrive, so memory use
+does not grow with the size of the export.
+"""
+import asyncio
+import csv
+import io
+import tempfile
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from app.core.config import settings
+from app.db.dynamodb import get_all_users, iter_all_timelogs
+
+EXPORT_COLUMNS = [
+    "Date",
+    "Employee",
+    "Start Time",
+    "End Time",
+    "Break Duration (hours)",
+    "Total Hours",
+    "Overtime",
+]
+
+# CSV output is sent in chunks of about this many bytes
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Finished files are read back and sent in chunks of this many bytes
+FILE_CHUNK_SIZE = 64 * 1024
+
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Rows buffered per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+# Rows appended to the Excel sheet per worker thread call
+EXCEL_APPEND_CHUNK_SIZE = 1_000
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime) else (value or "")
+
+
+async def _iter_logs_with_names(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    user_id: Optional[str]
+) -> AsyncIterator[Tuple[dict, str]]:
+    """Stream matching time logs paired with their employee's name."""
+    users, _ = await get_all_users()
+    user_map = {user["user_id"]: user["name"] for user in users}
+
+    async for log in iter_all_timelogs(
+        start_date=start_date,
+        end_date=end_date,
+        user_id=user_id,
+        segments=settings.DYNAMODB_SCAN_SEGMENTS
+    ):
+        yield log, user_map.get(log.get("user_id", ""), "Unknown")
+
+
+async def iter_export_rows(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None
+) -> AsyncIterator[List[Any]]:
+    """
+    Stream export rows, in EXPORT_COLUMNS order, for the matching time logs.
+
+    Only the user id to name map is held in memory; logs are read page by page.
+    """
+    async for log, employee in _iter_logs_with_names(start_date, end_date, user_id):
+        start_time = _isoformat(log.get("start_time"))
+        yield [
+            start_time[:10],
+            employee,
+            start_time,
+            _isoformat(log.get("end_time")),
+            log.get("break_duration", 0),
+            log.get("total_hours", 0),
+            "Yes" if log.get("is_overtime", False) else "No",
+        ]
+
+
+async def iter_csv(rows: AsyncIterator[List[Any]], compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Encode rows as UTF-8 CSV with an EXPORT_COLUMNS header, in chunks of about CSV_CHUNK_SIZE.
+
+    Args:
+        compress: gzip the output as it is produced
+    """
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take_chunk() -> bytes:
+        chunk = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(chunk) if compressor else chunk
+
+    # Send the header right away, before the first page of logs is read
+    writer.writerow(EXPORT_COLUMNS)
+    header = take_chunk()
+    yield header + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else header
+
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CSV_CHUNK_SIZE:
+            chunk = take_chunk()
+            if chunk:
+                yield chunk
+
+    chunk = take_chunk()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+async def write_excel(rows: AsyncIterator[List[Any]], file: BinaryIO) -> None:
+    """
+    Write rows to an .xlsx file with a write-only workbook.
+
+    Write-only worksheets serialize each appended row to their own temporary
+    file instead of keeping cell objects, so memory stays flat however many
+    rows there are. That makes every append blocking I/O, so rows are
+    appended in a worker thread, EXCEL_APPEND_CHUNK_SIZE rows at a time.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Time Logs")
+
+    def append_rows(chunk: List[List[Any]]) -> None:
+        for row in chunk:
+            sheet.append(row)
+
+    chunk: List[List[Any]] = [EXPORT_COLUMNS]
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= EXCEL_APPEND_CHUNK_SIZE:
+            await asyncio.to_thread(append_rows, chunk)
+            chunk = []
+    if chunk:
+        await asyncio.to_thread(append_rows, chunk)
+    # Zipping the sheet into the file is blocking I/O
+    await asyncio.to_thread(workbook.save, file)
+
+
+async def iter_file(file: BinaryIO) -> AsyncIterator[bytes]:
+    """Stream a file object from its start in FILE_CHUNK_SIZE chunks."""
+    file.seek(0)
+    while True:
+        chunk = await asyncio.to_thread(file.read, FILE_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_excel(rows: AsyncIterator[List[Any]]) -> AsyncIterator[bytes]:
+    """
+    Build an .xlsx export in a temporary file and stream it out.
+
+    An .xlsx file is a zip archive whose directory is written last, so the
+    file must be complete before its first byte can be sent; it is spooled
+    to disk rather than memory and removed once sent.
+    """
+    with tempfile.TemporaryFile(suffix=".xlsx") as file:
+        await write_excel(rows, file)
+        async for chunk in iter_file(file):
+            yield chunk
+
+
+def _parquet_schema() -> pa.Schema:
+    # Times are the logs' local wall-clock times, like the CSV and Excel
+    # exports, so start_time and the date column always agree
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("log_id", pa.string()),
+        ("user_id", pa.string()),
+        ("employee", pa.string()),
+        ("date", pa.date32()),
+        ("start_time", pa.timestamp("us")),
+        ("end_time", pa.timestamp("us")),
+        ("break_duration", pa.float64()),
+        ("total_hours", pa.float64()),
+        ("overtime_hours", pa.float64()),
+        ("is_overtime", pa.bool_()),
+        ("attendance_type", category),
+        ("work_location", category),
+    ])
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    # pyarrow would convert an aware time to UTC in a timestamp column
+    # without a time zone; keep the wall-clock time the log was recorded in
+    return value.replace(tzinfo=None) if isinstance(value, datetime) else None
+
+
+async def write_parquet(
+    file: BinaryIO,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    on_row: Optional[Callable[[], None]] = None
+) -> None:
+    """
+    Write the matching time logs to a Parquet file with typed columns.
+
+    Rows are gathered into columns and written out as a row group every
+    PARQUET_ROW_GROUP_SIZE rows, so at most one row group is held in memory.
+
+    Args:
+        on_row: Called once per row written, for progress reporting
+    """
+    schema = _parquet_schema()
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+
+    with pq.ParquetWriter(file, schema, compression="snappy") as writer:
+        async def write_row_group() -> None:
+            batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+            for values in columns.values():
+                values.clear()
+            await asyncio.to_thread(writer.write_batch, batch)
+
+        async for log, employee in _iter_logs_with_names(start_date, end_date, user_id):
+            start_time = _timestamp(log.get("start_time"))
+            columns["log_id"].append(log.get("log_id"))
+            columns["user_id"].append(log.get("user_id"))
+            columns["employee"].append(employee)
+            columns["date"].append(start_time.date() if start_time else None)
+            columns["start_time"].append(start_time)
+            columns["end_time"].append(_timestamp(log.get("end_time")))
+            columns["break_duration"].append(float(log.get("break_duration") or 0))
+            columns["total_hours"].append(float(log.get("total_hours") or 0))
+            columns["overtime_hours"].append(float(log.get("overtime_hours") or 0))
+            columns["is_overtime"].append(bool(log.get("is_overtime", False)))
+            columns["attendance_type"].append(log.get("attendance_type"))
+            columns["work_location"].append(log.get("work_location"))
+            if on_row:
+                on_row()
+            if len(columns["log_id"]) >= PARQUET_ROW_GROUP_SIZE:
+                await write_row_group()
+
+        if columns["log_id"]:
+            await write_row_group()
+
+
+async def iter_parquet(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """
+    Build a Parquet export in a temporary file and stream it out.
+
+    Like .xlsx, a Parquet file ends with its metadata footer, so the file is
+    spooled to disk and sent once complete.
+    """
+    with tempfile.TemporaryFile(suffix=".parquet") as file:
+        await write_parquet(file, start_date, end_date, user_id)
+        async for chunk in iter_file(file):
+            yield chunk
@@ -0,0 +1,135 @@
+"""
+Streaming summary report aggregation.
+
+Time logs are folded into running totals while they stream out of
+DynamoDB, in a single pass, so the report covers the whole range without
+holding the logs in memory. Only the set of distinct days worked is kept
+per group, which is bounded by the length of the range.
+"""
+import copy
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+from app.core.config import settings
+from app.db.dynamodb import iter_all_timelogs
+from app.models.report import SummaryGroupBy
+from app.services.report_cache import report_cache, report_key
+
+
+def _log_day(log: dict) -> Optional[str]:
+    start_time = log.get("start_time")
+    if isinstance(start_time, datetime):
+        return start_time.strftime("%Y-%m-%d")
+    if isinstance(start_time, str):
+        return start_time[:10]
+    return None
+
+
+def _log_week(log: dict) -> Optional[str]:
+    start_time = log.get("start_time")
+    if not isinstance(start_time, datetime):
+        return None
+    year, week, _ = start_time.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+GROUP_KEYS: Dict[SummaryGroupBy, Callable[[dict], Any]] = {
+    SummaryGroupBy.USER: lambda log: log.get("user_id"),
+    SummaryGroupBy.DAY: _log_day,
+    SummaryGroupBy.WEEK: _log_week,
+    SummaryGroupBy.MONTH: lambda log: (_log_day(log) or "")[:7] or None,
+    SummaryGroupBy.ATTENDANCE_TYPE: lambda log: log.get("attendance_type"),
+    SummaryGroupBy.WORK_LOCATION: lambda log: log.get("work_location"),
+}
+
+
+class SummaryTotals:
+    """Running totals for one summary row."""
+
+    def __init__(self):
+        self.total_hours = 0.0
+        self.total_overtime_hours = 0.0
+        self.total_entries = 0
+        self.overtime_entries = 0
+        self.days: Set[str] = set()
+
+    def add(self, log: dict, day: Optional[str]) -> None:
+        total_hours = float(log.get("total_hours", 0) or 0)
+        is_overtime = log.get("is_overtime", False)
+        self.total_hours += total_hours
+        # Use overtime_hours if available, otherwise fall back to total_hours for overtime logs
+        self.total_overtime_hours += float(log.get("overtime_hours", total_hours if is_overtime else 0) or 0)
+        self.total_entries += 1
+        if is_overtime:
+            self.overtime_entries += 1
+        if day:
+            self.days.add(day)
+
+    def result(self) -> Dict[str, Any]:
+        unique_days = len(self.days)
+        return {
+            "total_hours": round(self.total_hours, 2),
+            "total_overtime_hours": round(self.total_overtime_hours, 2),
+            "total_entries": self.total_entries,
+            "average_hours_per_day": round(self.total_hours / unique_days, 2) if unique_days else 0,
+            "overtime_entries": self.overtime_entries,
+        }
+
+
+async def summarize_timelogs(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    group_by: Optional[SummaryGroupBy] = None
+) -> Dict[str, Any]:
+    """
+    Summarize every time log matching the filters.
+
+    Returns:
+        Overall totals; with group_by, also a "groups" list holding the same
+        totals per group key, ordered by key
+    """
+    overall = SummaryTotals()
+    groups: Dict[Any, SummaryTotals] = {}
+    group_key = GROUP_KEYS[group_by] if group_by else None
+
+    async for log in iter_all_timelogs(
+        start_date=start_date,
+        end_date=end_date,
+        user_id=user_id,
+        segments=settings.DYNAMODB_SCAN_SEGMENTS
+    ):
+        day = _log_day(log)
+        overall.add(log, day)
+        if group_key:
+            key = group_key(log)
+            totals = groups.get(key)
+            if totals is None:
+                totals = groups[key] = SummaryTotals()
+            totals.add(log, day)
+
+    summary = overall.result()
+    if group_by:
+        summary["group_by"] = group_by.value
+        summary["groups"] = [
+            {"key": key, **groups[key].result()}
+            # Logs without a value for the group sort last
+            for key in sorted(groups, key=lambda key: (key is None, str(key)))
+        ]
+    return summary
+
+
+async def get_summary(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    group_by: Optional[SummaryGroupBy] = None
+) -> Dict[str, Any]:
+    """Summarize the matching time logs, answering repeated filters from the report cache."""
+    key = report_key(start_date, end_date, user_id, group_by.value if group_by else None)
+    summary = report_cache.get(key)
+    if summary is None:
+        generation = report_cache.generation
+        summary = await summarize_timelogs(start_date, end_date, user_id, group_by)
+        report_cache.set(key, summary, generation)
+    # Callers get their own copy so the cached result cannot be changed
+    return copy.deepcopy(summary)
@@ -1,7 +1,21 @@
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Tuple
 from app.core.config import settings
-from app.db.dynamodb import create_timelog, update_timelog, get_timelog_by_id, get_holidays_as_dates, get_timelogs_by_user_and_exact_time, get_timelogs_by_user
+from app.core.exceptions import DatabaseError
+from app.core.logging_config import get_logger
+from app.services.holiday_calendar import holiday_calendar
+from app.services.report_cache import report_cache
+from app.db.dynamodb import create_timelog, update_timelog, get_timelog_by_id, get_timelogs_by_user_and_exact_time, get_timelogs_by_user, get_timelogs_by_user_for_day, update_timelogs_overtime, get_daily_total, daily_total_item
+
+logger = get_logger(__name__)
+
+# Times a day's overtime is recomputed when a concurrent edit cancels the write
+OVERTIME_RECALC_ATTEMPTS = 4
+
+# Wait before the second attempt, doubled for each later one, so the day's
+# logs read from the eventually consistent user_id-start_time-index can catch up
+OVERTIME_RECALC_BACKOFF_SECONDS = 0.1
 
 def calculate_hours(start_time: datetime, end_time: datetime, break_duration: float = 0.0) -> float:
     """Calculate total hours worked."""
@@ -14,93 +28,154 @@ def calculate_hours(start_time: datetime, end_time: datetime, break_duration: fl
 
 async def is_overtime_day(start_time: datetime) -> bool:
     """Check if a day is automatically overtime (weekends or holidays)."""
-    holidays = await get_holidays_as_dates()
-    if start_time.date() in holidays:
+    if await holiday_calendar.is_holiday(start_time.date()):
         return True
     # Weekend (Saturday=5, Sunday=6)
     if start_time.weekday() >= 5:
         return True
     return False
 
-async def calculate_daily_overtime(user_id: str, date: datetime) -> None:
+def daily_overtime_hours(total_hours: float, total_entries: int, is_holiday_or_weekend: bool) -> float:
+    """Overtime for a day's WORK hours: all of them on weekends/holidays, otherwise the excess over the threshold."""
+    if is_holiday_or_weekend:
+        # All hours are overtime on weekends/holidays
+        return total_hours
+    # Expected hours = entries * threshold
+    expected_hours = total_entries * settings.OVERTIME_THRESHOLD_HOURS
+    # Overtime = excess hours beyond expected
+    return max(0, total_hours - expected_hours)
+
+def _apply_own_write(day_logs: List[dict], target_date, written_log: Optional[dict],
+                     deleted_log_id: Optional[str]) -> List[dict]:
+    """Bring the day's logs read from the index up to date with the caller's own write."""
+    replaced = {deleted_log_id, written_log["log_id"] if written_log else None}
+    logs = [log for log in day_logs if log["log_id"] not in replaced]
+    if written_log and written_log["start_time"].date() == target_date:
+        logs.append(dict(written_log))
+        logs.sort(key=lambda log: log["start_time"].isoformat())
+    return logs
+
+async def calculate_daily_overtime(user_id: str, date: datetime, written_log: Optional[dict] = None,
+                                   deleted_log_id: Optional[str] = None) -> List[dict]:
     """
     Recalculate overtime for all logs on a specific day based on daily totals.
     Overtime = max(0, total_hours - (entries * OVERTIME_THRESHOLD_HOURS))
     Distributes overtime proportionally across all logs for that day.
     Only applies to WORK attendance type logs.
-    """
-    # Get all logs for this user (we'll filter by date in Python to handle timezones correctly)
-    all_user_logs = await get_timelogs_by_user(user_id)
     
-    # Filter logs for the specific date and WORK attendance type only
-    same_day_logs = []
-    target_date = date.date() if isinstance(date, datetime) else date
+    The day's totals item is read first: if the day has no overtime now and
+    had none before, every log already holds zero and the logs are not read.
+    A day without a totals item is computed from its logs, and the item is
+    created from them in the same transaction.
     
-    for log in all_user_logs:
-        start_time = log.get("start_time")
-        if not start_time:
-            continue
-        
-        # Only process WORK attendance type logs for overtime calculation
-        attendance_type = log.get("attendance_type", "work")
-        if attendance_type != "work":
-            continue
-        
-        # Handle both datetime objects and strings
-        if isinstance(start_time, datetime):
-            log_date = start_time.date()
-        elif isinstance(start_time, str):
-            try:
-                log_date = datetime.fromisoformat(start_time.replace('Z', '+00:00')).date()
-            except:
-                continue
-        else:
-            continue
-        
-        # Check if log is on the target date
-        if log_date == target_date:
-            same_day_logs.append(log)
+    Only logs whose overtime actually changes are written, all in a single
+    transaction together with the day's total overtime. If another request
+    adds, edits or deletes one of the day's logs in the meantime the
+    transaction is cancelled and the day is recomputed.
     
-    if not same_day_logs:
-        return
+    The day's logs are read from an eventually consistent index that may not
+    show a write made just before. Callers pass the log they just wrote
+    (written_log) or deleted (deleted_log_id) so it is taken into account
+    anyway; writes by other requests are caught up with by retrying after a
+    backoff.
+    
+    Returns:
+        The day's WORK logs with their recalculated overtime, or an empty
+        list if the day was skipped because nothing needed distributing
+    
+    Raises:
+        DatabaseError: If every attempt was cancelled by a concurrent change
+    """
+    target_date = date.date() if isinstance(date, datetime) else date
     
     # Check if it's a weekend or holiday (all hours are overtime)
     is_holiday_or_weekend = await is_overtime_day(date if isinstance(date, datetime) else datetime.combine(date, datetime.min.time()))
     
-    # Calculate daily totals (only for WORK logs)
-    total_entries = len(same_day_logs)
-    total_hours = sum(float(log.get("total_hours", 0)) for log in same_day_logs)
-    
-    # Calculate overtime
-    if is_holiday_or_weekend:
-        # All hours are overtime on weekends/holidays
-        daily_overtime_hours = total_hours
-    else:
-        # Expected hours = entries * threshold
-        expected_hours = total_entries * settings.OVERTIME_THRESHOLD_HOURS
-        # Overtime = excess hours beyond expected
-        daily_overtime_hours = max(0, total_hours - expected_hours)
-    
-    # Distribute overtime proportionally across logs
-    # Each log gets: (log_hours / total_hours) * daily_overtime_hours
-    for log in same_day_logs:
-        log_hours = float(log.get("total_hours", 0))
+    for attempt in range(OVERTIME_RECALC_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(OVERTIME_RECALC_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        totals = await get_daily_total(user_id, target_date)
+        if totals is not None:
+            expected_overtime_hours = daily_overtime_hours(
+                totals["work_hours"], totals["work_entry_count"], is_holiday_or_weekend
+            )
+            if expected_overtime_hours == 0 and totals["overtime_hours"] == 0:
+                return []
+        
+        # Read only this day's logs via the user_id + start_time index
+        day_logs = _apply_own_write(
+            await get_timelogs_by_user_for_day(user_id, target_date), target_date, written_log, deleted_log_id
+        )
+        if totals is None and not day_logs:
+            return []
         
-        if total_hours > 0 and daily_overtime_hours > 0:
-            # Proportional distribution
-            overtime_hours = round((log_hours / total_hours) * daily_overtime_hours, 2)
-        else:
-            overtime_hours = 0.0
+        # Only process WORK attendance type logs for overtime calculation
+        same_day_logs = [log for log in day_logs if log.get("attendance_type", "work") == "work"]
         
-        is_overtime = overtime_hours > 0
+        # Calculate daily totals (only for WORK logs) from the logs themselves,
+        # since the distribution needs each log's hours anyway
+        total_entries = len(same_day_logs)
+        total_hours = sum(float(log.get("total_hours", 0)) for log in same_day_logs)
+        day_overtime_hours = round(daily_overtime_hours(total_hours, total_entries, is_holiday_or_weekend), 2)
         
-        # Update the log with new overtime calculations
-        update_data = {
-            "is_overtime": is_overtime,
-            "overtime_hours": overtime_hours
-        }
+        # Distribute overtime proportionally across logs
+        # Each log gets: (log_hours / total_hours) * daily_overtime_hours
+        changed_logs = []
+        for log in same_day_logs:
+            log_hours = float(log.get("total_hours", 0))
+            
+            if total_hours > 0 and day_overtime_hours > 0:
+                # Proportional distribution
+                overtime_hours = round((log_hours / total_hours) * day_overtime_hours, 2)
+            else:
+                overtime_hours = 0.0
+            
+            is_overtime = overtime_hours > 0
+            
+            # Skip logs that already hold the right values
+            if log.get("is_overtime") == is_overtime and float(log.get("overtime_hours", 0)) == overtime_hours:
+                continue
+            
+            log["is_overtime"] = is_overtime
+            log["overtime_hours"] = overtime_hours
+            changed_logs.append(log)
         
-        await update_timelog(log["log_id"], update_data)
+        new_daily_total = None
+        if totals is None:
+            new_daily_total = daily_total_item(user_id, target_date, day_logs, day_overtime_hours)
+        elif not changed_logs and day_overtime_hours == totals["overtime_hours"]:
+            return same_day_logs
+        if await update_timelogs_overtime(
+            changed_logs, user_id, target_date, day_overtime_hours,
+            work_logs=same_day_logs, new_daily_total=new_daily_total
+        ):
+            return same_day_logs
+        
+        logger.info("Retrying overtime recalculation", user_id=user_id, date=target_date.isoformat(), attempt=attempt + 1)
+    
+    raise DatabaseError("Failed to recalculate overtime after concurrent edits")
+
+async def recalculate_overtime_after_write(user_id: str, date: datetime, written_log: Optional[dict] = None,
+                                          deleted_log_id: Optional[str] = None) -> List[dict]:
+    """
+    Recalculate a day's overtime after one of its logs was written or deleted.
+    
+    The log write has already succeeded at this point, so a recalculation
+    that keeps being cancelled is logged instead of failing the request;
+    recalculate_overtime.py repairs the day.
+    
+    Returns:
+        The day's WORK logs with their recalculated overtime, or an empty
+        list if the day was skipped or could not be recalculated
+    """
+    try:
+        return await calculate_daily_overtime(user_id, date, written_log, deleted_log_id)
+    except DatabaseError as e:
+        logger.error(
+            "Overtime recalculation failed after a time log write",
+            user_id=user_id, date=date.date().isoformat(), error=str(e)
+        )
+        return []
 
 async def create_time_entry(user_id: str, start_time: datetime, end_time: datetime, 
                            break_duration: float = 0.0, context: Optional[str] = None,
@@ -139,14 +214,18 @@ async def create_time_entry(user_id: str, start_time: datetime, end_time: dateti
     
     log = await create_timelog(timelog_data)
     
-    # Recalculate overtime for all logs on this day (only for WORK attendance type)
-    # Overtime only applies to work days, not leave days
-    if attendance_type == "work":
-        await calculate_daily_overtime(user_id, start_time)
+    try:
+        # Recalculate overtime for all logs on this day (only for WORK attendance type)
+        # Overtime only applies to work days, not leave days
+        if attendance_type == "work":
+            day_logs = await recalculate_overtime_after_write(user_id, start_time, written_log=log)
+            # Use the recalculated copy of the new log instead of reading it back
+            log = next((l for l in day_logs if l["log_id"] == log["log_id"]), log)
+    finally:
+        # After the overtime pass, so no report is cached between the two writes
+        report_cache.invalidate_user_month(user_id, start_time)
     
-    # Get the updated log with recalculated overtime
-    updated_log = await get_timelog_by_id(log["log_id"])
-    return updated_log or log
+    return log
 
 async def update_time_entry(log_id: str, start_time: Optional[datetime] = None,
                             end_time: Optional[datetime] = None,
@@ -159,9 +238,9 @@ async def update_time_entry(log_id: str, start_time: Optional[datetime] = None,
     if not existing_log:
         return None
     
-    # Use existing values if not provided
-    start = start_time or datetime.fromisoformat(existing_log["start_time"])
-    end = end_time or datetime.fromisoformat(existing_log["end_time"])
+    # Use existing values if not provided (normalized items already hold datetimes)
+    start = start_time or existing_log["start_time"]
+    end = end_time or existing_log["end_time"]
     break_dur = break_duration if break_duration is not None else existing_log.get("break_duration", 0.0)
 
     # Enforce max 1 log per day only if configured (exclude current log)
@@ -202,11 +281,17 @@ async def update_time_entry(log_id: str, start_time: Optional[datetime] = None,
     # Update the log
     updated_log = await update_timelog(log_id, update_data)
     
-    # Recalculate overtime for all logs on this day (only for WORK attendance type)
-    if final_attendance_type == "work":
-        await calculate_daily_overtime(existing_log["user_id"], date_for_recalc)
+    try:
+        # Recalculate overtime for all logs on this day (only for WORK attendance type)
+        if final_attendance_type == "work":
+            day_logs = await recalculate_overtime_after_write(
+                existing_log["user_id"], date_for_recalc, written_log=updated_log
+            )
+            updated_log = next((l for l in day_logs if l["log_id"] == log_id), updated_log)
+    finally:
+        # The log may have moved to another month
+        report_cache.invalidate_user_month(existing_log["user_id"], existing_log["start_time"])
+        report_cache.invalidate_user_month(existing_log["user_id"], start)
     
-    # Get the updated log with recalculated overtime
-    final_log = await get_timelog_by_id(log_id)
-    return final_log
+    return updated_log
 
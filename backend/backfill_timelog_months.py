@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Backfill the month index attributes on existing time logs.
+
+Date-range reports across all users query the month_shard-start_time-index
+GSI, which only contains logs that carry month and month_shard attributes.
+New and edited logs get them automatically; this script adds them to logs
+written before the index existed, and reshards every log after
+DYNAMODB_MONTH_SHARDS has changed.
+
+Run it after migrate_dynamodb.py has created the index. A completed backfill
+is recorded in the migrations table for the current DYNAMODB_MONTH_SHARDS, so
+start.sh can run it on every start: it scans the table once, and again only
+after the shard count changes. An interrupted run starts over, skipping logs
+that already hold the right attributes.
+
+Usage: python backfill_timelog_months.py
+"""
+import asyncio
+from datetime import datetime
+from app.core.config import settings
+from app.db.dynamodb import iter_all_timelogs, set_timelog_month, timelog_month_attributes
+from migrate_dynamodb import migration_done, mark_migration_done
+
+async def backfill_timelog_months():
+    """Add month and month_shard to every time log that lacks the current values."""
+    marker = f"timelog_months:shards={settings.DYNAMODB_MONTH_SHARDS}"
+    if migration_done(marker):
+        print("Time log months already backfilled, skipping.")
+        return
+
+    print("Backfilling time log months...")
+
+    scanned = 0
+    updated = 0
+    pending = []
+
+    async def flush():
+        nonlocal updated
+        results = await asyncio.gather(*pending)
+        updated += sum(1 for result in results if result)
+        pending.clear()
+
+    async for log in iter_all_timelogs(segments=settings.DYNAMODB_SCAN_SEGMENTS):
+        scanned += 1
+        if scanned % 1000 == 0:
+            print(f"Scanned {scanned} logs, updated {updated}...")
+
+        start_time = log.get("start_time")
+        if not isinstance(start_time, datetime):
+            print(f"Warning: skipping log {log.get('log_id')} without a valid start_time")
+            continue
+
+        expected = timelog_month_attributes(log["log_id"], start_time)
+        if log.get("month") == expected["month"] and log.get("month_shard") == expected["month_shard"]:
+            continue
+
+        # Keep about as many updates in flight as there are executor threads
+        pending.append(set_timelog_month(log["log_id"], start_time))
+        if len(pending) >= settings.DYNAMODB_MAX_WORKERS:
+            await flush()
+
+    await flush()
+    mark_migration_done(marker)
+
+    print(f"\n✓ Completed!")
+    print(f"  Scanned: {scanned} time logs")
+    print(f"  Updated: {updated} time logs")
+
+if __name__ == "__main__":
+    asyncio.run(backfill_timelog_months())
@@ -4,7 +4,7 @@ Debug script to check overtime calculations for logs.
 """
 import asyncio
 from datetime import datetime
-from app.db.dynamodb import get_all_timelogs, get_all_users
+from app.db.dynamodb import iter_all_timelogs, get_all_users
 from app.core.config import settings
 
 async def debug_overtime():
@@ -15,15 +15,8 @@ async def debug_overtime():
     users, _ = await get_all_users()
     user_map = {user["user_id"]: user["name"] for user in users}
     
-    # Get all timelogs
-    all_logs = []
-    last_key = None
-    
-    while True:
-        logs, last_key = await get_all_timelogs(page_size=100, last_evaluated_key=last_key)
-        all_logs.extend(logs)
-        if not last_key:
-            break
+    # Get all timelogs with a parallel scan
+    all_logs = [log async for log in iter_all_timelogs(segments=settings.DYNAMODB_SCAN_SEGMENTS)]
     
     print(f"Total logs: {len(all_logs)}\n")
     
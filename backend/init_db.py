@@ -4,6 +4,7 @@ Initialize DynamoDB tables - can be run on startup to ensure tables exist.
 import boto3
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from migrate_dynamodb import run_migrations
 import time
 
 # Initialize DynamoDB client
@@ -105,12 +106,30 @@ def init_tables():
         key_schema=[{'AttributeName': 'log_id', 'KeyType': 'HASH'}],
         attribute_definitions=[
             {'AttributeName': 'log_id', 'AttributeType': 'S'},
-            {'AttributeName': 'user_id', 'AttributeType': 'S'}
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'start_time', 'AttributeType': 'S'},
+            {'AttributeName': 'month_shard', 'AttributeType': 'S'}
         ],
         gsi=[{
             'IndexName': 'user_id-index',
             'KeySchema': [{'AttributeName': 'user_id', 'KeyType': 'HASH'}],
             'Projection': {'ProjectionType': 'ALL'}
+        },
+        {
+            'IndexName': 'user_id-start_time-index',
+            'KeySchema': [
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'start_time', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        },
+        {
+            'IndexName': 'month_shard-start_time-index',
+            'KeySchema': [
+                {'AttributeName': 'month_shard', 'KeyType': 'HASH'},
+                {'AttributeName': 'start_time', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
         }]
     )
     
@@ -119,8 +138,27 @@ def init_tables():
         table_name=settings.DYNAMODB_AUDIT_TABLE,
         key_schema=[{'AttributeName': 'audit_id', 'KeyType': 'HASH'}],
         attribute_definitions=[
-            {'AttributeName': 'audit_id', 'AttributeType': 'S'}
-        ]
+            {'AttributeName': 'audit_id', 'AttributeType': 'S'},
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'entity_id', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+        ],
+        gsi=[{
+            'IndexName': 'user_id-timestamp-index',
+            'KeySchema': [
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        },
+        {
+            'IndexName': 'entity_id-timestamp-index',
+            'KeySchema': [
+                {'AttributeName': 'entity_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }]
     )
     
     # Holidays table
@@ -167,6 +205,29 @@ def init_tables():
         }]
     )
     
+    # Daily totals table (one item per user per day)
+    create_table_if_not_exists(
+        table_name=settings.DYNAMODB_DAILY_TOTALS_TABLE,
+        key_schema=[
+            {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'date', 'KeyType': 'RANGE'}
+        ],
+        attribute_definitions=[
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'date', 'AttributeType': 'S'}
+        ]
+    )
+    
+    # Migrations table (one marker item per completed one-off migration)
+    create_table_if_not_exists(
+        table_name=settings.DYNAMODB_MIGRATIONS_TABLE,
+        key_schema=[{'AttributeName': 'migration_id', 'KeyType': 'HASH'}],
+        attribute_definitions=[{'AttributeName': 'migration_id', 'AttributeType': 'S'}]
+    )
+    
+    # Tables that already existed may predate newer indexes
+    run_migrations()
+    
     print("✓ All tables initialized!")
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
-from app.routers import auth, users, timelogs, reports, holidays, leave_requests
+from app.routers import auth, users, timelogs, reports, holidays, leave_requests, audit
 from app.core.config import settings
 from app.core.logging_config import setup_logging, get_logger
 from app.core.error_handlers import (
@@ -13,6 +13,11 @@ from app.core.error_handlers import (
     general_exception_handler
 )
 from app.core.exceptions import AppException
+from app.db.executor import shutdown_executor
+from app.core.security import shutdown_password_executor, token_cache_stats
+from app.db.dynamodb import audit_writer, user_cache
+from app.services.export_jobs import export_jobs
+from app.services.report_cache import report_cache
 
 # Set up logging
 setup_logging()
@@ -90,20 +95,28 @@ app.include_router(timelogs.router, prefix="/api/timelogs", tags=["Time Logs"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
 app.include_router(holidays.router, prefix="/api/holidays", tags=["Holidays"])
 app.include_router(leave_requests.router, prefix="/api/leave-requests", tags=["Leave Requests"])
+app.include_router(audit.router, prefix="/api/audit", tags=["Audit"])
 
 @app.on_event("startup")
 async def startup_event():
-    """Log application startup."""
+    """Log application startup and start background tasks."""
     logger.info(
         "Application starting",
         environment=settings.ENVIRONMENT,
         version="1.0.0"
     )
+    audit_writer.start()
+    export_jobs.start(settings.EXPORT_CLEANUP_INTERVAL_SECONDS)
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log application shutdown."""
+    """Stop background tasks, flush queued audit entries and release worker threads."""
     logger.info("Application shutting down")
+    # Exports and audit entries use the DynamoDB executor, so stop them first
+    await export_jobs.stop()
+    await audit_writer.stop()
+    shutdown_executor()
+    shutdown_password_executor()
 
 @app.get("/")
 async def root():
@@ -115,7 +128,14 @@ async def health_check():
     # TODO: Add DynamoDB connectivity check
     return {
         "status": "healthy",
-        "environment": settings.ENVIRONMENT
+        "environment": settings.ENVIRONMENT,
+        "caches": {
+            "verified_tokens": token_cache_stats(),
+            "users": user_cache.stats(),
+            "reports": report_cache.stats()
+        },
+        "audit_queue": audit_writer.stats(),
+        "export_jobs": export_jobs.stats()
     }
 
 @app.get("/ws")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Add missing global secondary indexes to existing DynamoDB tables.
+
+setup_dynamodb.py and init_db.py only create indexes together with a new table,
+so deployments whose tables predate an index need this one-off migration.
+Each index is recorded in the migrations table once it is active, so later
+runs, such as the one in init_db.py on every start, skip it with a single
+read instead of waiting on the table.
+
+The migrations table also holds the markers of the other one-off data
+migrations (see migration_done and mark_migration_done).
+
+Usage: python migrate_dynamodb.py
+"""
+import time
+from datetime import datetime
+import boto3
+from botocore.exceptions import ClientError
+from app.core.config import settings
+
+# Initialize DynamoDB client
+dynamodb_kwargs = {
+    'region_name': settings.AWS_REGION,
+    'aws_access_key_id': settings.AWS_ACCESS_KEY_ID or 'dummy',
+    'aws_secret_access_key': settings.AWS_SECRET_ACCESS_KEY or 'dummy'
+}
+
+# Add endpoint URL for DynamoDB Local if provided
+if settings.DYNAMODB_ENDPOINT_URL:
+    dynamodb_kwargs['endpoint_url'] = settings.DYNAMODB_ENDPOINT_URL
+
+dynamodb = boto3.resource('dynamodb', **dynamodb_kwargs)
+
+# (table name, attribute definitions for the index keys, index definition)
+INDEX_MIGRATIONS = [
+    (
+        settings.DYNAMODB_USERS_TABLE,
+        [{'AttributeName': 'email', 'AttributeType': 'S'}],
+        {
+            'IndexName': 'email-index',
+            'KeySchema': [{'AttributeName': 'email', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ),
+    (
+        settings.DYNAMODB_TIMELOGS_TABLE,
+        [
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'start_time', 'AttributeType': 'S'}
+        ],
+        {
+            'IndexName': 'user_id-start_time-index',
+            'KeySchema': [
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'start_time', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ),
+    (
+        settings.DYNAMODB_HOLIDAYS_TABLE,
+        [{'AttributeName': 'date', 'AttributeType': 'S'}],
+        {
+            'IndexName': 'date-index',
+            'KeySchema': [{'AttributeName': 'date', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ),
+    (
+        # Existing logs only appear in this index after backfill_timelog_months.py
+        settings.DYNAMODB_TIMELOGS_TABLE,
+        [
+            {'AttributeName': 'month_shard', 'AttributeType': 'S'},
+            {'AttributeName': 'start_time', 'AttributeType': 'S'}
+        ],
+        {
+            'IndexName': 'month_shard-start_time-index',
+            'KeySchema': [
+                {'AttributeName': 'month_shard', 'KeyType': 'HASH'},
+                {'AttributeName': 'start_time', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ),
+    (
+        settings.DYNAMODB_AUDIT_TABLE,
+        [
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+        ],
+        {
+            'IndexName': 'user_id-timestamp-index',
+            'KeySchema': [
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ),
+    (
+        # Only entries written since audit entries record their entity
+        settings.DYNAMODB_AUDIT_TABLE,
+        [
+            {'AttributeName': 'entity_id', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+        ],
+        {
+            'IndexName': 'entity_id-timestamp-index',
+            'KeySchema': [
+                {'AttributeName': 'entity_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ),
+]
+
+
+def migration_done(name):
+    """Check whether a one-off migration has already completed."""
+    try:
+        response = dynamodb.Table(settings.DYNAMODB_MIGRATIONS_TABLE).get_item(
+            Key={'migration_id': name},
+            ConsistentRead=True
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ResourceNotFoundException':
+            return False
+        raise
+    return 'Item' in response
+
+
+def mark_migration_done(name):
+    """Record that a one-off migration has completed, so later runs skip it."""
+    dynamodb.Table(settings.DYNAMODB_MIGRATIONS_TABLE).put_item(Item={
+        'migration_id': name,
+        'completed_at': datetime.utcnow().isoformat()
+    })
+
+
+def get_index_status(table_name, index_name):
+    """Return the status of a GSI, or None if the table has no such index."""
+    description = dynamodb.meta.client.describe_table(TableName=table_name)["Table"]
+    for index in description.get("GlobalSecondaryIndexes", []):
+        if index["IndexName"] == index_name:
+            return index.get("IndexStatus", "ACTIVE")
+    return None
+
+
+def wait_for_index(table_name, index_name, poll_seconds=5):
+    """Block until a GSI has finished backfilling."""
+    while True:
+        status = get_index_status(table_name, index_name)
+        if status == "ACTIVE":
+            return
+        print(f"  {index_name} on {table_name} is {status}, waiting...")
+        time.sleep(poll_seconds)
+
+
+def add_index_if_missing(table_name, attribute_definitions, index):
+    """Create a GSI on an existing table and wait for its backfill to finish."""
+    index_name = index['IndexName']
+    try:
+        status = get_index_status(table_name, index_name)
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ResourceNotFoundException':
+            print(f"Table {table_name} does not exist, skipping {index_name}.")
+            return False
+        raise
+
+    if status is None:
+        print(f"Creating index {index_name} on {table_name}...")
+        dynamodb.meta.client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=attribute_definitions,
+            GlobalSecondaryIndexUpdates=[{'Create': index}]
+        )
+    elif status == "ACTIVE":
+        print(f"Index {index_name} on {table_name} already exists.")
+        mark_migration_done(index_marker(table_name, index_name))
+        return False
+
+    # DynamoDB backfills the index from existing items before it becomes ACTIVE
+    wait_for_index(table_name, index_name)
+    mark_migration_done(index_marker(table_name, index_name))
+    print(f"✓ Index {index_name} on {table_name} is active!")
+    return True
+
+
+def index_marker(table_name, index_name):
+    """Migration marker name of an index migration."""
+    return f"index:{table_name}:{index_name}"
+
+
+def run_migrations():
+    """Apply the index migrations that have not completed yet."""
+    print("Migrating DynamoDB indexes...")
+    for table_name, attribute_definitions, index in INDEX_MIGRATIONS:
+        if migration_done(index_marker(table_name, index['IndexName'])):
+            continue
+        add_index_if_missing(table_name, attribute_definitions, index)
+    print("✓ All indexes migrated!")
+
+
+if __name__ == "__main__":
+    run_migrations()
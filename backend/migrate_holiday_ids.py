@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Re-key holidays created before holiday ids were derived from their dates.
+
+Holidays are stored under holiday-YYYY-MM-DD so that a conditional put
+rejects a second holiday on the same date. Older holidays have random ids
+that this check cannot see; this script moves each of them to its
+date-derived id, and deletes it instead if that date already has one.
+
+A completed run is recorded in the migrations table, so start.sh can run it
+on every start and only the first one scans the holidays. An interrupted
+run starts over, skipping holidays already keyed by date.
+
+Usage: python migrate_holiday_ids.py
+"""
+import asyncio
+from app.db.dynamodb import iter_holidays, migrate_holiday_id
+from migrate_dynamodb import migration_done, mark_migration_done
+
+MIGRATION_MARKER = "holiday_ids:date_keys"
+
+async def migrate_holiday_ids():
+    """Move every holiday to its date-derived id."""
+    if migration_done(MIGRATION_MARKER):
+        print("Holiday ids already migrated, skipping.")
+        return
+
+    print("Migrating holiday ids...")
+
+    # Collect first, so the scan does not see the items it writes
+    legacy = [holiday async for holiday in iter_holidays() if not holiday["id"].startswith("holiday-")]
+
+    moved = 0
+    for holiday in legacy:
+        if await migrate_holiday_id(holiday):
+            moved += 1
+        else:
+            print(f"Removed duplicate holiday {holiday['name']} on {holiday['date']}")
+    mark_migration_done(MIGRATION_MARKER)
+
+    print(f"\n✓ Completed!")
+    print(f"  Moved: {moved} holidays")
+    print(f"  Removed: {len(legacy) - moved} duplicates")
+
+if __name__ == "__main__":
+    asyncio.run(migrate_holiday_ids())
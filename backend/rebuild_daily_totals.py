@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Rebuild the per-user daily totals table from the time logs.
+
+Time log writes keep the daily totals up to date with atomic counters, but a
+failed counter update or logs written before the table existed leave them out
+of sync. This script recomputes every user-day from the logs, overwrites the
+stored totals and deletes totals for days that no longer have logs.
+
+Run it once after upgrading, and again whenever the totals are suspected to
+have drifted. Best run while no one is editing time logs.
+
+Usage: python rebuild_daily_totals.py
+"""
+import asyncio
+from decimal import Decimal
+from datetime import datetime
+from app.core.config import settings
+from app.db.dynamodb import iter_all_timelogs, iter_all_daily_totals, replace_daily_totals
+
+async def rebuild_daily_totals():
+    """Recompute all daily totals from the time logs."""
+    print("Rebuilding daily totals from time logs...")
+
+    totals = {}
+    log_count = 0
+
+    async for log in iter_all_timelogs(segments=settings.DYNAMODB_SCAN_SEGMENTS):
+        log_count += 1
+        if log_count % 1000 == 0:
+            print(f"Scanned {log_count} logs...")
+
+        user_id = log.get("user_id")
+        start_time = log.get("start_time")
+        if not user_id or not isinstance(start_time, datetime):
+            continue
+
+        key = (user_id, start_time.date().isoformat())
+        day = totals.setdefault(key, {
+            "user_id": user_id,
+            "date": key[1],
+            "total_hours": Decimal(0),
+            "entry_count": 0,
+            "work_hours": Decimal(0),
+            "work_entry_count": 0,
+            "overtime_hours": Decimal(0),
+        })
+
+        # total_hours is stored with two decimals, so str() round-trips exactly
+        hours = Decimal(str(log.get("total_hours", 0)))
+        day["total_hours"] += hours
+        day["entry_count"] += 1
+        if log.get("attendance_type", "work") == "work":
+            day["work_hours"] += hours
+            day["work_entry_count"] += 1
+            day["overtime_hours"] += Decimal(str(log.get("overtime_hours", 0)))
+
+    print(f"Found {log_count} time logs across {len(totals)} user-days")
+
+    stale_keys = [
+        {"user_id": item["user_id"], "date": item["date"]}
+        async for item in iter_all_daily_totals()
+        if (item["user_id"], item["date"]) not in totals
+    ]
+
+    updated_at = datetime.utcnow().isoformat()
+    items = [dict(day, updated_at=updated_at) for day in totals.values()]
+    await replace_daily_totals(items, stale_keys)
+
+    print(f"\n✓ Completed!")
+    print(f"  Written: {len(items)} daily totals")
+    print(f"  Deleted: {len(stale_keys)} stale daily totals")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_daily_totals())
@@ -6,7 +6,8 @@ This is a one-time migration script to update existing logs with the new overtim
 import asyncio
 import sys
 from datetime import datetime, date
-from app.db.dynamodb import get_all_timelogs, get_all_users
+from app.core.config import settings
+from app.db.dynamodb import iter_all_timelogs, get_all_users
 from app.services.timelog_service import calculate_daily_overtime
 
 async def recalculate_all_overtime():
@@ -17,28 +18,15 @@ async def recalculate_all_overtime():
     users, _ = await get_all_users()
     print(f"Found {len(users)} users")
     
-    # Get all timelogs (handle pagination)
-    all_logs = []
-    last_key = None
-    page_count = 0
+    # Stream all timelogs with a parallel scan, keeping only the user-date keys
+    user_date_keys = set()
+    log_count = 0
     
-    while True:
-        logs, last_key = await get_all_timelogs(page_size=100, last_evaluated_key=last_key)
-        all_logs.extend(logs)
-        page_count += 1
-        print(f"Fetched page {page_count}: {len(logs)} logs (total: {len(all_logs)})")
-        if not last_key:
-            break
-    
-    print(f"Found {len(all_logs)} total time logs")
-    
-    if not all_logs:
-        print("No time logs found. Nothing to recalculate.")
-        return
-    
-    # Group logs by user and date
-    user_date_logs = {}
-    for log in all_logs:
+    async for log in iter_all_timelogs(segments=settings.DYNAMODB_SCAN_SEGMENTS):
+        log_count += 1
+        if log_count % 1000 == 0:
+            print(f"Scanned {log_count} logs...")
+        
         user_id = log.get("user_id")
         start_time = log.get("start_time")
         
@@ -60,19 +48,20 @@ async def recalculate_all_overtime():
         else:
             continue
         
-        # Create date key
-        user_date_key = (user_id, log_date)
-        
-        if user_date_key not in user_date_logs:
-            user_date_logs[user_date_key] = []
-        user_date_logs[user_date_key].append(log)
+        user_date_keys.add((user_id, log_date))
+    
+    print(f"Found {log_count} total time logs")
+    
+    if not log_count:
+        print("No time logs found. Nothing to recalculate.")
+        return
     
-    print(f"Found {len(user_date_logs)} unique user-date combinations")
+    print(f"Found {len(user_date_keys)} unique user-date combinations")
     
     # Recalculate overtime for each user-date combination
     processed = 0
     errors = 0
-    for (user_id, log_date), date_logs in user_date_logs.items():
+    for user_id, log_date in user_date_keys:
         # Create datetime for the date (use UTC midnight for consistency)
         date_dt = datetime.combine(log_date, datetime.min.time())
         
@@ -80,7 +69,7 @@ async def recalculate_all_overtime():
             await calculate_daily_overtime(user_id, date_dt)
             processed += 1
             if processed % 10 == 0:
-                print(f"Processed {processed}/{len(user_date_logs)} user-date combinations...")
+                print(f"Processed {processed}/{len(user_date_keys)} user-date combinations...")
         except Exception as e:
             errors += 1
             print(f"Error processing user {user_id} date {log_date}: {e}")
@@ -91,7 +80,7 @@ async def recalculate_all_overtime():
     print(f"\n✓ Completed!")
     print(f"  Processed: {processed} user-date combinations")
     print(f"  Errors: {errors}")
-    print(f"  Total logs affected: {len(all_logs)}")
+    print(f"  Total logs affected: {log_count}")
 
 if __name__ == "__main__":
     asyncio.run(recalculate_all_overtime())
@@ -5,6 +5,7 @@ Run this script once to create the necessary tables.
 import boto3
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from migrate_dynamodb import run_migrations
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -83,7 +84,9 @@ def setup_tables():
         ],
         attribute_definitions=[
             {'AttributeName': 'log_id', 'AttributeType': 'S'},
-            {'AttributeName': 'user_id', 'AttributeType': 'S'}
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'start_time', 'AttributeType': 'S'},
+            {'AttributeName': 'month_shard', 'AttributeType': 'S'}
         ],
         gsi=[{
             'IndexName': 'user_id-index',
@@ -91,6 +94,22 @@ def setup_tables():
                 {'AttributeName': 'user_id', 'KeyType': 'HASH'}
             ],
             'Projection': {'ProjectionType': 'ALL'}
+        },
+        {
+            'IndexName': 'user_id-start_time-index',
+            'KeySchema': [
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'start_time', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        },
+        {
+            'IndexName': 'month_shard-start_time-index',
+            'KeySchema': [
+                {'AttributeName': 'month_shard', 'KeyType': 'HASH'},
+                {'AttributeName': 'start_time', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
         }]
     )
     
@@ -101,8 +120,27 @@ def setup_tables():
             {'AttributeName': 'audit_id', 'KeyType': 'HASH'}
         ],
         attribute_definitions=[
-            {'AttributeName': 'audit_id', 'AttributeType': 'S'}
-        ]
+            {'AttributeName': 'audit_id', 'AttributeType': 'S'},
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'entity_id', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+        ],
+        gsi=[{
+            'IndexName': 'user_id-timestamp-index',
+            'KeySchema': [
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        },
+        {
+            'IndexName': 'entity_id-timestamp-index',
+            'KeySchema': [
+                {'AttributeName': 'entity_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }]
     )
 
     # Holidays table
@@ -124,6 +162,29 @@ def setup_tables():
         }]
     )
     
+    # Daily totals table (one item per user per day)
+    create_table(
+        table_name=settings.DYNAMODB_DAILY_TOTALS_TABLE,
+        key_schema=[
+            {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'date', 'KeyType': 'RANGE'}
+        ],
+        attribute_definitions=[
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'date', 'AttributeType': 'S'}
+        ]
+    )
+    
+    # Migrations table (one marker item per completed one-off migration)
+    create_table(
+        table_name=settings.DYNAMODB_MIGRATIONS_TABLE,
+        key_schema=[{'AttributeName': 'migration_id', 'KeyType': 'HASH'}],
+        attribute_definitions=[{'AttributeName': 'migration_id', 'AttributeType': 'S'}]
+    )
+    
+    # Tables that already existed may predate newer indexes
+    run_migrations()
+    
     print("\nAll tables set up successfully!")
 
 if __name__ == "__main__":
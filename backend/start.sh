@@ -19,6 +19,16 @@ sleep 10
 echo "Initializing database tables..."
 python init_db.py
 
+# Add the month index attributes to existing time logs, which all-user
+# date-range reports read through (one-off: skipped once recorded as done)
+echo "Backfilling time log months..."
+python backfill_timelog_months.py
+
+# Move holidays to date-derived ids, so duplicate dates are rejected
+# (one-off: skipped once recorded as done)
+echo "Migrating holiday ids..."
+python migrate_holiday_ids.py
+
 # Create default admin user
 echo "Creating default admin user..."
 python create_default_admin.py
@@ -1,9 +1,13 @@
 """
 Pytest configuration and fixtures.
 """
+import asyncio
+from datetime import datetime, timedelta
 import pytest
+from moto import mock_aws
 from fastapi.testclient import TestClient
-from app.main import app
+from main import app
+from app.db import dynamodb
 
 @pytest.fixture
 def client():
@@ -20,3 +24,64 @@ def test_user_data():
         "role": "employee"
     }
 
+@pytest.fixture
+def dynamodb_tables():
+    """Create all application tables in an in-memory DynamoDB."""
+    from app.services.holiday_calendar import holiday_calendar
+    from app.services.report_cache import report_cache
+    with mock_aws():
+        import init_db
+        init_db.init_tables()
+        # Holidays, users and reports cached from an earlier test's tables must not leak in
+        holiday_calendar.invalidate()
+        dynamodb.user_cache.clear()
+        report_cache.clear()
+        yield
+        # Write queued audit entries while the in-memory tables still exist
+        asyncio.run(dynamodb.audit_writer.flush())
+
+@pytest.fixture
+def create_timelog(dynamodb_tables):
+    """
+    Store a time log directly in the in-memory tables.
+
+    Returns a coroutine function create(user_id, start, hours=8, **fields)
+    for an office work log; synchronous tests run it with asyncio.run.
+    """
+    async def create(user_id: str, start: datetime, hours: float = 8, **fields) -> dict:
+        return await dynamodb.create_timelog({
+            "user_id": user_id,
+            "start_time": start,
+            "end_time": start + timedelta(hours=hours),
+            "total_hours": hours,
+            "work_location": "office",
+            **fields,
+        })
+    return create
+
+@pytest.fixture
+def dynamodb_calls(dynamodb_tables):
+    """Record the name of every DynamoDB API operation made by the data layer."""
+    calls = []
+
+    def record(model, **kwargs):
+        calls.append(model.name)
+
+    events = dynamodb.dynamodb.meta.client.meta.events
+    events.register("before-call.dynamodb", record)
+    yield calls
+    events.unregister("before-call.dynamodb", record)
+
+@pytest.fixture
+def admin_user():
+    """Authenticated admin user returned by the auth dependencies."""
+    return {"user_id": "admin-1", "name": "Admin", "email": "admin@example.com", "role": "admin"}
+
+@pytest.fixture
+def admin_client(client, admin_user, dynamodb_tables):
+    """Test client authenticated as an admin against the in-memory tables."""
+    from app.core.dependencies import get_current_user, get_current_admin_user, get_current_accountant_user
+    for dependency in (get_current_user, get_current_admin_user, get_current_accountant_user):
+        app.dependency_overrides[dependency] = lambda: admin_user
+    yield client
+    app.dependency_overrides.clear()
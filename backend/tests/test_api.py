@@ -0,0 +1,160 @@
+"""
+Tests for API endpoints.
+"""
+import asyncio
+from datetime import datetime
+from app.db import dynamodb
+
+
+def test_timelogs_cursor_pagination_fills_filtered_pages(admin_client, create_timelog):
+    """Test that filtered pages are full and the cursor walks every match."""
+    for day in range(1, 8):
+        asyncio.run(create_timelog("user-1", datetime(2024, 1, day, 9)))
+        asyncio.run(create_timelog("user-2", datetime(2024, 1, day, 9)))
+
+    seen = []
+    params = {"user_id": "user-1", "page_size": 3}
+    while True:
+        response = admin_client.get("/api/timelogs/", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(log["log_id"] for log in body["items"])
+        assert all(log["user_id"] == "user-1" for log in body["items"])
+        if not body["has_next"]:
+            assert len(body["items"]) == 1
+            break
+        assert len(body["items"]) == 3
+        params["cursor"] = body["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_users_cursor_pagination(admin_client):
+    """Test that users can be listed page by page without leaking password hashes."""
+    for i in range(5):
+        asyncio.run(dynamodb.create_user({
+            "name": f"User {i}", "email": f"user{i}@example.com", "password_hash": "x", "role": "employee"
+        }))
+
+    first = admin_client.get("/api/users/", params={"page_size": 3}).json()
+    second = admin_client.get("/api/users/", params={"page_size": 3, "cursor": first["next_cursor"]}).json()
+
+    assert len(first["items"]) == 3 and first["has_next"]
+    assert len(second["items"]) == 2 and not second["has_next"]
+    assert "password_hash" not in first["items"][0]
+
+
+def test_tampered_cursor_is_rejected(admin_client, create_timelog):
+    """Test that a cursor that was not issued by the server is refused."""
+    asyncio.run(create_timelog("user-1", datetime(2024, 1, 1, 9)))
+    asyncio.run(create_timelog("user-1", datetime(2024, 1, 2, 9)))
+    cursor = admin_client.get("/api/timelogs/", params={"page_size": 1}).json()["next_cursor"]
+    payload, signature = cursor.split(".")
+
+    response = admin_client.get("/api/timelogs/", params={"cursor": payload[:-2] + "xx." + signature})
+
+    assert response.status_code == 400
+
+
+def test_update_user_call_count(admin_client, dynamodb_calls):
+    """Test that updating a user costs one read and one update, with the audit entry queued."""
+    user = asyncio.run(dynamodb.create_user({
+        "name": "Before", "email": "before@example.com", "password_hash": "x", "role": "employee"
+    }))
+    dynamodb_calls.clear()
+
+    response = admin_client.put(f"/api/users/{user['user_id']}", json={"name": "After"})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "After"
+    assert dynamodb_calls == ["GetItem", "UpdateItem"]
+    assert dynamodb.audit_writer.stats()["queue_depth"] == 1
+
+
+def test_update_timelog_call_count(admin_client, dynamodb_calls, create_timelog):
+    """Test that editing a log does not re-read it after each update."""
+    log = asyncio.run(create_timelog("admin-1", datetime(2024, 1, 10, 9)))
+    dynamodb_calls.clear()
+
+    response = admin_client.put(f"/api/timelogs/{log['log_id']}", json={
+        "start_time": "2024-01-10T09:00:00", "end_time": "2024-01-10T19:00:00"
+    })
+
+    assert response.status_code == 200
+    assert response.json()["overtime_hours"] == 2.0
+    # endpoint + service lookups, the edit and its daily totals, the day's
+    # overtime pass in one transaction; the audit entry is only queued
+    assert dynamodb_calls == [
+        "GetItem", "GetItem", "UpdateItem", "UpdateItem",
+        "Scan", "GetItem", "Query", "TransactWriteItems",
+    ]
+
+
+def test_approve_leave_request_call_count(admin_client, dynamodb_calls):
+    """Test that approving a leave request costs one read and one update."""
+    leave_request = asyncio.run(dynamodb.create_leave_request({
+        "user_id": "user-1", "leave_type": "paid_leave", "description": "Trip",
+        "start_date": datetime(2024, 2, 1), "end_date": datetime(2024, 2, 2),
+    }))
+    dynamodb_calls.clear()
+
+    response = admin_client.put(f"/api/leave-requests/{leave_request['request_id']}/approve", json={})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "approved"
+    assert dynamodb_calls == ["GetItem", "UpdateItem"]
+
+
+def test_audit_entries_are_batched_with_structured_details(admin_client, dynamodb_calls):
+    """Test that queued audit entries are written in one batch with details as a map."""
+    users = [
+        asyncio.run(dynamodb.create_user({
+            "name": f"User {i}", "email": f"audit{i}@example.com", "password_hash": "x", "role": "employee"
+        }))
+        for i in range(3)
+    ]
+    for user in users:
+        assert admin_client.put(f"/api/users/{user['user_id']}", json={"name": "Renamed"}).status_code == 200
+    dynamodb_calls.clear()
+
+    asyncio.run(dynamodb.audit_writer.flush())
+
+    assert dynamodb_calls == ["BatchWriteItem"]
+    entries = dynamodb.audit_table.scan()["Items"]
+    assert {entry["details"]["updated_user_id"] for entry in entries} == {user["user_id"] for user in users}
+    assert all(entry["user_id"] == "admin-1" for entry in entries)
+
+
+def test_audit_trail_by_entity_and_actor(admin_client, dynamodb_calls, create_timelog):
+    """Test that an entity's and an actor's audit entries are read from one index partition."""
+    log = asyncio.run(create_timelog("admin-1", datetime(2024, 1, 10, 9)))
+    for hours in (10, 11):
+        admin_client.put(f"/api/timelogs/{log['log_id']}", json={
+            "start_time": "2024-01-10T09:00:00", "end_time": f"2024-01-10T{9 + hours}:00:00"
+        })
+    admin_client.delete(f"/api/timelogs/{log['log_id']}")
+    asyncio.run(dynamodb.audit_writer.flush())
+    dynamodb_calls.clear()
+
+    first = admin_client.get("/api/audit/", params={"entity_id": log["log_id"], "page_size": 2}).json()
+    second = admin_client.get("/api/audit/", params={
+        "entity_id": log["log_id"], "page_size": 2, "cursor": first["next_cursor"]
+    }).json()
+
+    assert [entry["action"] for entry in first["items"] + second["items"]] == [
+        "timelog_deleted", "timelog_updated", "timelog_updated"
+    ]
+    assert first["items"][0]["entity_type"] == "timelog"
+    assert not second["has_next"]
+    assert dynamodb_calls == ["Query", "Query"]
+
+    by_actor = admin_client.get("/api/audit/", params={
+        "actor_id": "admin-1", "start_time": "2000-01-01T00:00:00"
+    }).json()
+    assert len(by_actor["items"]) == 3
+    assert admin_client.get("/api/audit/", params={"actor_id": "admin-1", "end_time": "2000-01-01T00:00:00"}).json()["items"] == []
+
+
+def test_audit_trail_requires_actor_or_entity(admin_client):
+    """Test that the audit endpoint refuses reads that would need a scan."""
+    assert admin_client.get("/api/audit/").status_code == 400
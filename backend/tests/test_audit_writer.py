@@ -0,0 +1,105 @@
+"""
+Tests for the buffered audit log writer.
+"""
+import asyncio
+import pytest
+from app.db.audit_writer import AuditLogWriter
+
+
+def _writer(batches, **kwargs):
+    async def write_batch(items):
+        batches.append([item["n"] for item in items])
+
+    options = {"max_queue_size": 100, "flush_interval": 60, "batch_size": 2}
+    options.update(kwargs)
+    return AuditLogWriter(write_batch, **options)
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_queued_entries_in_batches():
+    """Test that queued entries are written in order, batch_size at a time."""
+    batches = []
+    writer = _writer(batches)
+    for n in range(5):
+        writer.enqueue({"n": n})
+
+    await writer.flush()
+
+    assert batches == [[0, 1], [2, 3], [4]]
+    assert writer.stats()["queue_depth"] == 0
+    assert writer.stats()["written"] == 5
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_and_counts_entries():
+    """Test that entries beyond the queue bound are dropped instead of blocking."""
+    writer = _writer([], max_queue_size=2)
+
+    assert writer.enqueue({"n": 0}) and writer.enqueue({"n": 1})
+    assert not writer.enqueue({"n": 2})
+
+    assert writer.stats()["dropped"] == 1
+    assert writer.stats()["queue_depth"] == 2
+
+
+@pytest.mark.asyncio
+async def test_background_task_writes_full_batches_and_stop_flushes_rest():
+    """Test that a full batch wakes the writer and stop() writes the remainder."""
+    batches = []
+    writer = _writer(batches)
+    writer.start()
+    writer.enqueue({"n": 0})
+    writer.enqueue({"n": 1})
+    for _ in range(100):
+        if batches:
+            break
+        await asyncio.sleep(0.01)
+    assert batches == [[0, 1]]
+
+    writer.enqueue({"n": 2})
+    await writer.stop()
+
+    assert batches == [[0, 1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_counted_not_raised():
+    """Test that a write error is recorded without propagating."""
+    async def write_batch(items):
+        raise RuntimeError("throttled")
+
+    writer = AuditLogWriter(write_batch, max_queue_size=10, flush_interval=60)
+    writer.enqueue({"n": 0})
+
+    await writer.flush()
+
+    assert writer.stats()["failed"] == 1
+    assert writer.stats()["written"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_during_a_write_keeps_the_batch():
+    """Test that stopping while a batch is being written lets that write finish."""
+    batches = []
+    writing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def write_batch(items):
+        writing.set()
+        await release.wait()
+        batches.append([item["n"] for item in items])
+
+    writer = AuditLogWriter(write_batch, max_queue_size=10, flush_interval=60, batch_size=2)
+    writer.start()
+    writer.enqueue({"n": 0})
+    writer.enqueue({"n": 1})
+    writer.enqueue({"n": 2})
+    await writing.wait()
+
+    stopping = asyncio.create_task(writer.stop())
+    await asyncio.sleep(0.01)
+    release.set()
+    await stopping
+
+    assert batches == [[0, 1], [2]]
+    assert writer.stats()["written"] == 3
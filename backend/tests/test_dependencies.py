@@ -0,0 +1,42 @@
+"""
+Tests for the authentication dependencies.
+"""
+import asyncio
+import pytest
+from app.core.security import create_access_token
+from app.db import dynamodb
+
+
+@pytest.fixture
+def employee(dynamodb_tables):
+    """A stored employee and a bearer header for them."""
+    user = asyncio.run(dynamodb.create_user({
+        "name": "Employee", "email": "employee@example.com", "password_hash": "x", "role": "employee"
+    }))
+    token = create_access_token({"sub": user["user_id"], "role": "employee"})
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+def test_authenticated_user_is_read_once(client, employee, dynamodb_calls):
+    """Test that repeat requests resolve the user from the cache instead of DynamoDB."""
+    user, headers = employee
+
+    for _ in range(3):
+        response = client.get("/api/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["user_id"] == user["user_id"]
+
+    assert dynamodb_calls == ["GetItem"]
+    assert "password_hash" not in dynamodb.user_cache.get(user["user_id"])
+
+
+def test_user_changes_invalidate_the_cache(client, employee):
+    """Test that a role change or deletion takes effect on the next request."""
+    user, headers = employee
+    client.get("/api/auth/me", headers=headers)
+
+    asyncio.run(dynamodb.update_user(user["user_id"], {"role": "accountant"}))
+    assert client.get("/api/auth/me", headers=headers).json()["role"] == "accountant"
+
+    asyncio.run(dynamodb.delete_user(user["user_id"]))
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
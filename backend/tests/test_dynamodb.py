@@ -0,0 +1,295 @@
+"""
+Tests for the DynamoDB data layer.
+"""
+import asyncio
+import time
+from datetime import date, datetime
+import pytest
+from botocore.exceptions import ClientError
+from app.core.exceptions import ConflictError, DatabaseError
+from app.db import dynamodb
+
+
+class SlowTable:
+    """Table stand-in whose calls block like a real network round trip."""
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def get_item(self, Key):
+        time.sleep(self.delay)
+        return {"Item": {"log_id": Key["log_id"], "user_id": "user-1"}}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_overlap(monkeypatch):
+    """Test that concurrent DynamoDB calls run in parallel instead of serially."""
+    delay = 0.2
+    monkeypatch.setattr(dynamodb, "timelogs_table", SlowTable(delay))
+
+    started = time.perf_counter()
+    logs = await asyncio.gather(*(dynamodb.get_timelog_by_id(str(i)) for i in range(4)))
+    elapsed = time.perf_counter() - started
+
+    assert [log["log_id"] for log in logs] == ["0", "1", "2", "3"]
+    assert elapsed < delay * 2
+
+
+@pytest.mark.asyncio
+async def test_event_loop_not_blocked(monkeypatch):
+    """Test that the event loop keeps running while a DynamoDB call is in flight."""
+    monkeypatch.setattr(dynamodb, "timelogs_table", SlowTable(0.2))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await dynamodb.get_timelog_by_id("log-1")
+    task.cancel()
+
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_email_queries_index(dynamodb_calls):
+    """Test that email lookups use the email-index GSI instead of a scan."""
+    await dynamodb.create_user({"name": "A", "email": "a@example.com", "password_hash": "x", "role": "employee"})
+    created = await dynamodb.create_user({"name": "B", "email": "b@example.com", "password_hash": "x", "role": "admin"})
+    dynamodb_calls.clear()
+
+    user = await dynamodb.get_user_by_email("b@example.com")
+
+    assert user["user_id"] == created["user_id"]
+    assert dynamodb_calls == ["Query"]
+    assert await dynamodb.get_user_by_email("missing@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_holiday_creation_is_one_conditional_write(dynamodb_calls):
+    """Test that duplicate holiday checks cost a single write and find the date via the index."""
+    created, was_created = await dynamodb.create_holiday_if_not_exists({"name": "New Year", "date": date(2024, 1, 1)})
+    duplicate, duplicate_created = await dynamodb.create_holiday_if_not_exists({"name": "Other", "date": "2024-01-01"})
+
+    assert was_created and not duplicate_created
+    assert duplicate == created
+    assert dynamodb_calls == ["PutItem", "PutItem"]
+
+    dynamodb_calls.clear()
+    assert (await dynamodb.get_holiday_by_date(date(2024, 1, 1)))["name"] == "New Year"
+    assert await dynamodb.get_holiday_by_date(date(2024, 1, 2)) is None
+    assert dynamodb_calls == ["Query", "Query"]
+
+    with pytest.raises(ConflictError):
+        await dynamodb.create_holiday({"name": "Again", "date": date(2024, 1, 1)})
+
+
+@pytest.mark.asyncio
+async def test_batch_put_retries_unprocessed_items(monkeypatch):
+    """Test that items DynamoDB leaves unprocessed are resent until written."""
+    class ThrottlingResource:
+        def __init__(self):
+            self.requests = []
+
+        def batch_write_item(self, RequestItems):
+            self.requests.append(RequestItems)
+            puts = RequestItems["table"]
+            # Process only the first item of every request
+            return {"UnprocessedItems": {"table": puts[1:]} if len(puts) > 1 else {}}
+
+    resource = ThrottlingResource()
+    monkeypatch.setattr(dynamodb, "dynamodb", resource)
+    monkeypatch.setattr(dynamodb, "BATCH_WRITE_MAX_ITEMS", 3)
+
+    batches = await dynamodb.batch_put_items("table", [{"id": str(i)} for i in range(4)])
+
+    assert batches == [3, 1]
+    assert [len(request["table"]) for request in resource.requests] == [3, 2, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_timelog_range_queries_use_sort_key(dynamodb_tables, create_timelog):
+    """Test that date ranges are served by the user_id + start_time index."""
+    await create_timelog("user-1", datetime(2024, 1, 9, 9), 8)
+    await create_timelog("user-1", datetime(2024, 1, 10, 9), 4)
+    await create_timelog("user-1", datetime(2024, 1, 10, 14), 3)
+    await create_timelog("user-2", datetime(2024, 1, 10, 9), 8)
+
+    day_logs = await dynamodb.get_timelogs_by_user_for_day("user-1", date(2024, 1, 10))
+    assert sorted(log["total_hours"] for log in day_logs) == [3.0, 4.0]
+
+    range_logs = await dynamodb.get_timelogs_by_user(
+        "user-1", start_date=datetime(2024, 1, 10), end_date=datetime(2024, 1, 10, 12)
+    )
+    assert [log["total_hours"] for log in range_logs] == [4.0]
+
+    exact = await dynamodb.get_timelogs_by_user_and_exact_time(
+        "user-1", datetime(2024, 1, 10, 14), datetime(2024, 1, 10, 17)
+    )
+    assert len(exact) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_all_timelogs_parallel_scan(dynamodb_tables, create_timelog):
+    """Test that a segmented scan returns every matching log."""
+    for day in range(1, 11):
+        await create_timelog("user-1", datetime(2024, 1, day, 9), 8)
+
+    logs, last_key = await dynamodb.get_all_timelogs(start_date=datetime(2024, 1, 3), segments=3)
+
+    assert last_key is None
+    assert len(logs) == 8
+
+
+@pytest.mark.asyncio
+async def test_date_range_across_users_queries_month_index(dynamodb_tables, dynamodb_calls, create_timelog):
+    """Test that an all-user date range reads only the month index partitions in range."""
+    in_range = await create_timelog("user-1", datetime(2024, 2, 28, 9), 8)
+    await create_timelog("user-2", datetime(2024, 3, 1, 9), 8)
+    await create_timelog("user-2", datetime(2024, 1, 15, 9), 8)
+    await create_timelog("user-1", datetime(2024, 4, 2, 9), 8)
+    # Moving a log into the range moves it to another month partition
+    moved = await create_timelog("user-3", datetime(2024, 5, 1, 9), 8)
+    await dynamodb.update_timelog(moved["log_id"], {"start_time": datetime(2024, 3, 10, 9)})
+    dynamodb_calls.clear()
+
+    logs = [log async for log in dynamodb.iter_all_timelogs(datetime(2024, 2, 20), datetime(2024, 3, 31, 23, 59))]
+
+    assert len(logs) == 3
+    assert {log["user_id"] for log in logs} == {"user-1", "user-2", "user-3"}
+    assert in_range["log_id"] in {log["log_id"] for log in logs}
+    # Two months, each spread over its shards
+    assert dynamodb_calls == ["Query"] * (2 * dynamodb.settings.DYNAMODB_MONTH_SHARDS)
+
+
+@pytest.mark.asyncio
+async def test_user_filter_reads_one_partition(dynamodb_tables, dynamodb_calls, create_timelog):
+    """Test that filtering all logs by user queries the user index instead of scanning."""
+    for day in range(1, 6):
+        await create_timelog("user-1", datetime(2024, 1, day, 9), 8)
+        await create_timelog("user-2", datetime(2024, 1, day, 9), 8)
+    dynamodb_calls.clear()
+
+    first, last_key = await dynamodb.get_all_timelogs(user_id="user-1", page_size=3)
+    second, last_key = await dynamodb.get_all_timelogs(user_id="user-1", page_size=3, last_evaluated_key=last_key)
+
+    assert last_key is None
+    assert len({log["log_id"] for log in first + second}) == 5
+    assert {log["user_id"] for log in first + second} == {"user-1"}
+    assert dynamodb_calls == ["Query", "Query"]
+
+
+@pytest.mark.asyncio
+async def test_month_index_pages_cover_every_partition(dynamodb_tables, create_timelog):
+    """Test that paging through a cross-user date range returns each log once."""
+    created = set()
+    for day in range(1, 31, 3):
+        for user_id in ("user-1", "user-2"):
+            log = await create_timelog(user_id, datetime(2024, 1 + day % 2, day, 9), 8)
+            created.add(log["log_id"])
+
+    seen = []
+    last_key = None
+    while True:
+        page, last_key = await dynamodb.get_all_timelogs(
+            start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 29, 23, 59),
+            page_size=4, last_evaluated_key=last_key
+        )
+        assert len(page) <= 4
+        seen.extend(log["log_id"] for log in page)
+        if not last_key:
+            break
+
+    assert sorted(seen) == sorted(created)
+
+
+@pytest.mark.asyncio
+async def test_query_errors_do_not_fall_back_to_scan(monkeypatch):
+    """Test that a throttled user query is reported instead of degrading to a scan."""
+    class ThrottledTable:
+        def __init__(self):
+            self.scanned = False
+
+        def query(self, **kwargs):
+            raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "Query")
+
+        def scan(self, **kwargs):
+            self.scanned = True
+            return {"Items": []}
+
+    table = ThrottledTable()
+    monkeypatch.setattr(dynamodb, "timelogs_table", table)
+
+    with pytest.raises(DatabaseError):
+        await dynamodb.get_timelogs_by_user("user-1")
+    assert table.scanned is False
+
+
+@pytest.mark.asyncio
+async def test_overtime_transaction_rejects_stale_logs(dynamodb_tables, create_timelog):
+    """Test that overtime is not written over a log edited since it was read."""
+    first = await create_timelog("user-1", datetime(2024, 1, 10, 6), 12)
+    second = await create_timelog("user-1", datetime(2024, 1, 10, 19), 8)
+    await dynamodb.update_timelog(second["log_id"], {"total_hours": 6.0})
+
+    first.update(is_overtime=True, overtime_hours=2.4)
+    second.update(is_overtime=True, overtime_hours=1.6)
+    assert await dynamodb.update_timelogs_overtime([first, second]) is False
+
+    # Nothing from the cancelled transaction was applied
+    assert (await dynamodb.get_timelog_by_id(first["log_id"]))["overtime_hours"] == 0.0
+
+    second["total_hours"] = 6.0
+    assert await dynamodb.update_timelogs_overtime([first, second]) is True
+    assert (await dynamodb.get_timelog_by_id(first["log_id"]))["overtime_hours"] == 2.4
+
+
+@pytest.mark.asyncio
+async def test_overtime_transaction_rejects_log_added_to_the_day(dynamodb_tables, create_timelog):
+    """Test that overtime split over a day's logs is not written once another log joins the day."""
+    first = await create_timelog("user-1", datetime(2024, 1, 10, 6), 12)
+    first.update(is_overtime=True, overtime_hours=4.0)
+    await create_timelog("user-1", datetime(2024, 1, 10, 19), 2)
+
+    assert await dynamodb.update_timelogs_overtime(
+        [first], "user-1", date(2024, 1, 10), 4.0, work_logs=[first]
+    ) is False
+    assert (await dynamodb.get_timelog_by_id(first["log_id"]))["overtime_hours"] == 0.0
+    assert (await dynamodb.get_daily_total("user-1", date(2024, 1, 10)))["overtime_hours"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_legacy_holidays_move_to_date_keys(dynamodb_tables):
+    """Test that random-id holidays are re-keyed by date, and dropped if the date is taken."""
+    legacy = {"id": "3f2b8c1e-legacy", "name": "New Year", "date": "2024-01-01", "created_at": "2023-12-01T00:00:00"}
+    duplicate = {"id": "9a7d4e2f-legacy", "name": "Labour Day", "date": "2024-05-01", "created_at": "2023-12-01T00:00:00"}
+    for item in (legacy, duplicate):
+        await asyncio.to_thread(dynamodb.holidays_table.put_item, Item=item)
+    await dynamodb.create_holiday({"name": "May Day", "date": date(2024, 5, 1)})
+
+    assert await dynamodb.migrate_holiday_id(legacy) is True
+    assert await dynamodb.migrate_holiday_id(duplicate) is False
+
+    holidays = {holiday["id"]: holiday["name"] for holiday in await dynamodb.get_all_holidays()}
+    assert holidays == {"holiday-2024-01-01": "New Year", "holiday-2024-05-01": "May Day"}
+    with pytest.raises(ConflictError):
+        await dynamodb.create_holiday({"name": "Again", "date": date(2024, 1, 1)})
+
+
+@pytest.mark.asyncio
+async def test_first_log_of_a_day_creates_totals_without_reading_the_index(dynamodb_calls, create_timelog):
+    """Test that a missing totals item is created from the written log, not from an index read."""
+    await create_timelog("user-1", datetime(2024, 1, 10, 9), 8)
+
+    # the log, the conditional counter update, the totals item
+    assert dynamodb_calls == ["PutItem", "UpdateItem", "PutItem"]
+    totals = await dynamodb.get_daily_total("user-1", date(2024, 1, 10))
+    assert (totals["total_hours"], totals["entry_count"], totals["work_entry_count"]) == (8.0, 1, 1)
+
+    # Deleting a log whose day has no totals leaves none behind
+    log = await create_timelog("user-1", datetime(2024, 1, 11, 9), 8)
+    await asyncio.to_thread(dynamodb.daily_totals_table.delete_item, Key={"user_id": "user-1", "date": "2024-01-11"})
+    await dynamodb.delete_timelog(log["log_id"])
+    assert await dynamodb.get_daily_total("user-1", date(2024, 1, 11)) is None
@@ -0,0 +1,131 @@
+"""
+Tests for background export jobs.
+"""
+import asyncio
+import csv
+import gzip
+import io
+import os
+import time
+import pytest
+import pyarrow.parquet as pq
+from datetime import datetime
+from fastapi.testclient import TestClient
+from main import app
+from app.models.export import ExportFormat, ExportJobCreate, ExportJobStatus
+from app.services.export_jobs import ExportJobManager, export_jobs
+
+
+@pytest.fixture
+def job_client(admin_client, tmp_path, monkeypatch):
+    """Test client whose startup and shutdown events run, writing exports to tmp_path."""
+    monkeypatch.setattr(export_jobs, "export_dir", tmp_path)
+    with TestClient(app) as client:
+        yield client
+
+
+def _wait_for_job(client, job_id: str) -> dict:
+    for _ in range(200):
+        job = client.get(f"/api/reports/exports/{job_id}").json()
+        if job["status"] not in ("pending", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("export job did not finish")
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_job(dynamodb_tables, tmp_path):
+    """Test that a request identical to a running export joins it, and a different one does not."""
+    manager = ExportJobManager(tmp_path, ttl_seconds=60, max_concurrent_jobs=1)
+    request = ExportJobCreate(format=ExportFormat.CSV, user_id="user-1")
+
+    first = manager.submit(request, "accountant-1")
+    second = manager.submit(ExportJobCreate(format=ExportFormat.CSV, user_id="user-1"), "accountant-2")
+    other = manager.submit(ExportJobCreate(format=ExportFormat.EXCEL, user_id="user-1"), "accountant-1")
+
+    assert first is second
+    assert first["requesters"] == {"accountant-1", "accountant-2"}
+    assert other["job_id"] != first["job_id"]
+    assert manager.stats()["deduplicated"] == 1
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_expired_jobs_and_files_are_removed(dynamodb_tables, tmp_path):
+    """Test that finished exports disappear with their files once the TTL has passed."""
+    manager = ExportJobManager(tmp_path, ttl_seconds=0, max_concurrent_jobs=1)
+    job = manager.submit(ExportJobCreate(), "accountant-1")
+    for _ in range(200):
+        if job["status"] == ExportJobStatus.COMPLETED:
+            break
+        await asyncio.sleep(0.01)
+    assert job["path"].exists()
+    stray = tmp_path / "left-by-previous-process.csv"
+    stray.write_text("x")
+    os.utime(stray, (0, 0))
+
+    assert manager.cleanup_expired() == 2
+
+    assert manager.get(job["job_id"]) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_export_job_lifecycle_and_range_download(job_client, tmp_path, create_timelog):
+    """Test creating, polling and downloading an export, in full and by byte range."""
+    for day in range(1, 4):
+        asyncio.run(create_timelog("user-1", datetime(2024, 5, day, 9)))
+
+    response = job_client.post("/api/reports/exports", json={"user_id": "user-1", "gzip": True})
+    assert response.status_code == 202
+    job = _wait_for_job(job_client, response.json()["job_id"])
+
+    assert job["status"] == "completed"
+    assert job["rows_written"] == 3
+    full = job_client.get(job["download_url"])
+    assert full.status_code == 200
+    assert full.headers["content-type"] == "application/gzip"
+    assert len(full.content) == job["size_bytes"]
+    rows = list(csv.reader(io.StringIO(gzip.decompress(full.content).decode())))
+    assert len(rows) == 4
+
+    partial = job_client.get(job["download_url"], headers={"Range": "bytes=10-"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 10-{job['size_bytes'] - 1}/{job['size_bytes']}"
+    assert partial.content == full.content[10:]
+    assert job_client.get(job["download_url"], headers={"Range": "bytes=-5"}).content == full.content[-5:]
+    assert job_client.get(job["download_url"], headers={"Range": f"bytes={job['size_bytes']}-"}).status_code == 416
+
+
+def test_unknown_export_job_is_not_found(job_client):
+    """Test that polling or downloading a job that does not exist returns 404."""
+    assert job_client.get("/api/reports/exports/missing").status_code == 404
+    assert job_client.get("/api/reports/exports/missing/download").status_code == 404
+
+
+def test_export_jobs_are_only_visible_to_their_requesters(job_client, admin_user):
+    """Test that another accountant cannot poll or download someone else's export."""
+    job = _wait_for_job(job_client, job_client.post("/api/reports/exports", json={}).json()["job_id"])
+    status_url = f"/api/reports/exports/{job['job_id']}"
+
+    admin_user.update(user_id="accountant-2", role="accountant")
+    assert job_client.get(status_url).status_code == 404
+    assert job_client.get(job["download_url"]).status_code == 404
+
+    admin_user.update(user_id="admin-1")
+    assert job_client.get(status_url).status_code == 200
+    assert job_client.get(job["download_url"]).status_code == 200
+
+
+def test_parquet_export_job(job_client, create_timelog):
+    """Test that Parquet exports can run as jobs and report their progress."""
+    for day in range(1, 3):
+        asyncio.run(create_timelog("user-1", datetime(2024, 5, day, 9)))
+
+    job_id = job_client.post("/api/reports/exports", json={"format": "parquet"}).json()["job_id"]
+    job = _wait_for_job(job_client, job_id)
+
+    assert job["status"] == "completed"
+    assert job["rows_written"] == 2
+    download = job_client.get(job["download_url"])
+    assert download.headers["content-disposition"] == "attachment; filename=timelogs_export.parquet"
+    assert pq.read_table(io.BytesIO(download.content)).num_rows == 2
@@ -0,0 +1,83 @@
+"""
+Tests for the in-process holiday calendar.
+"""
+import asyncio
+import pytest
+from datetime import date, datetime
+from app.db import dynamodb
+from app.services.holiday_calendar import HolidayCalendar, holiday_calendar
+from app.services.timelog_service import is_overtime_day
+
+
+@pytest.mark.asyncio
+async def test_calendar_loads_holidays_once(dynamodb_tables, dynamodb_calls):
+    """Test that repeated overtime checks are answered from memory."""
+    await dynamodb.create_holiday({"name": "New Year", "date": date(2024, 1, 1)})
+    dynamodb_calls.clear()
+
+    assert await is_overtime_day(datetime(2024, 1, 1, 9))
+    assert not await is_overtime_day(datetime(2024, 1, 2, 9))
+    assert await is_overtime_day(datetime(2024, 1, 6, 9))  # Saturday
+
+    assert dynamodb_calls == ["Scan"]
+
+
+@pytest.mark.asyncio
+async def test_calendar_reloads_after_ttl_or_invalidation(dynamodb_tables, dynamodb_calls):
+    """Test that an expired or invalidated calendar reads the table again."""
+    calendar = HolidayCalendar(ttl_seconds=0)
+    await calendar.get_dates()
+    await calendar.get_dates()
+    assert dynamodb_calls == ["Scan", "Scan"]
+
+    dynamodb_calls.clear()
+    calendar.ttl_seconds = 3600
+    await calendar.get_dates()
+    await dynamodb.create_holiday({"name": "Founding Day", "date": date(2024, 2, 11)})
+    assert not await calendar.is_holiday(date(2024, 2, 11))
+
+    calendar.invalidate()
+    assert await calendar.is_holiday(date(2024, 2, 11))
+
+
+@pytest.mark.asyncio
+async def test_load_overlapping_an_invalidation_is_not_kept(monkeypatch):
+    """Test that dates read before a holiday changed are not cached after it."""
+    from app.services import holiday_calendar as calendar_module
+    stored = [date(2024, 1, 1)]
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def get_holidays_as_dates():
+        snapshot = list(stored)
+        loading.set()
+        await release.wait()
+        return snapshot
+
+    monkeypatch.setattr(calendar_module, "get_holidays_as_dates", get_holidays_as_dates)
+    calendar = HolidayCalendar(ttl_seconds=3600)
+    load = asyncio.create_task(calendar.get_dates())
+    await loading.wait()
+
+    stored.append(date(2024, 2, 11))
+    calendar.invalidate()
+    release.set()
+    assert await load == {date(2024, 1, 1)}
+
+    assert await calendar.is_holiday(date(2024, 2, 11))
+
+
+def test_holiday_endpoints_invalidate_calendar(admin_client):
+    """Test that adding and deleting a holiday through the API takes effect immediately."""
+    assert not admin_client.get("/api/holidays/").json()
+    day = date(2024, 5, 3)
+
+    assert not asyncio.run(holiday_calendar.is_holiday(day))
+
+    response = admin_client.post("/api/holidays/", json={"name": "Constitution Day", "date": day.isoformat()})
+    assert response.status_code == 201
+    assert asyncio.run(holiday_calendar.is_holiday(day))
+
+    response = admin_client.delete(f"/api/holidays/{response.json()['id']}")
+    assert response.status_code == 204
+    assert not asyncio.run(holiday_calendar.is_holiday(day))
@@ -0,0 +1,49 @@
+"""
+Tests for the Japanese holiday sync.
+"""
+import json
+from app.core.config import settings
+
+
+def test_sync_bundled_holidays_in_batches(admin_client, dynamodb_calls):
+    """Test that a sync writes only new holidays, 25 per batch, and reports each batch."""
+    admin_client.post("/api/holidays/", json={"name": "元日", "date": "2024-01-01"})
+    dynamodb_calls.clear()
+
+    response = admin_client.post("/api/holidays/sync-jp-holidays", params={"source": "bundled"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["source"] == "bundled"
+    assert body["skipped"] == 1
+    assert body["synced"] == 57
+    assert body["batches"] == [25, 25, 7]
+    assert set(body["timing_ms"]) == {"fetch", "diff", "write", "total"}
+    assert dynamodb_calls == ["Scan", "BatchWriteItem", "BatchWriteItem", "BatchWriteItem"]
+
+    response = admin_client.post("/api/holidays/sync-jp-holidays", params={"source": "bundled"})
+    assert response.json()["synced"] == 0
+    assert response.json()["batches"] == []
+    assert len(admin_client.get("/api/holidays/").json()) == 58
+
+
+def test_sync_from_local_file(admin_client, monkeypatch, tmp_path):
+    """Test that a configured JSON file can be synced offline, reporting bad entries."""
+    holidays_file = tmp_path / "holidays.json"
+    holidays_file.write_text(json.dumps({"2030-01-01": "元日", "2030-13-01": "Broken"}), encoding="utf-8")
+    monkeypatch.setattr(settings, "HOLIDAYS_JP_FILE", str(holidays_file))
+
+    response = admin_client.post("/api/holidays/sync-jp-holidays", params={"source": "file"})
+
+    assert response.status_code == 200
+    assert response.json()["synced"] == 1
+    assert response.json()["errors"][0].startswith("2030-13-01")
+
+
+def test_sync_from_unconfigured_file_is_rejected(admin_client, monkeypatch):
+    """Test that the file source needs HOLIDAYS_JP_FILE."""
+    monkeypatch.setattr(settings, "HOLIDAYS_JP_FILE", "")
+
+    response = admin_client.post("/api/holidays/sync-jp-holidays", params={"source": "file"})
+
+    assert response.status_code == 400
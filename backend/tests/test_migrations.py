@@ -0,0 +1,61 @@
+"""
+Tests for the one-off migrations run at startup.
+"""
+import asyncio
+from datetime import datetime
+import pytest
+import migrate_dynamodb
+from backfill_timelog_months import backfill_timelog_months
+from migrate_holiday_ids import migrate_holiday_ids
+from app.core.config import settings
+from app.db import dynamodb
+
+
+def test_index_migrations_are_skipped_once_recorded(dynamodb_tables, monkeypatch):
+    """Test that a later start reads the markers instead of describing the tables."""
+    # init_tables already ran the migrations once
+    for table_name, _, index in migrate_dynamodb.INDEX_MIGRATIONS:
+        assert migrate_dynamodb.migration_done(migrate_dynamodb.index_marker(table_name, index["IndexName"]))
+
+    def describe_table(**kwargs):
+        raise AssertionError("tables must not be described again")
+
+    monkeypatch.setattr(migrate_dynamodb.dynamodb.meta.client, "describe_table", describe_table)
+    migrate_dynamodb.run_migrations()
+
+
+@pytest.mark.asyncio
+async def test_month_backfill_runs_once_per_shard_count(dynamodb_tables, create_timelog, monkeypatch):
+    """Test that a completed backfill is not repeated until the shard count changes."""
+    await create_timelog("user-1", datetime(2024, 1, 10, 9))
+    scans = []
+    iter_all_timelogs = dynamodb.iter_all_timelogs
+
+    def counting_iter(**kwargs):
+        scans.append(kwargs)
+        return iter_all_timelogs(**kwargs)
+
+    monkeypatch.setattr("backfill_timelog_months.iter_all_timelogs", counting_iter)
+
+    await backfill_timelog_months()
+    await backfill_timelog_months()
+    assert len(scans) == 1
+
+    monkeypatch.setattr(settings, "DYNAMODB_MONTH_SHARDS", settings.DYNAMODB_MONTH_SHARDS + 1)
+    await backfill_timelog_months()
+    assert len(scans) == 2
+
+
+@pytest.mark.asyncio
+async def test_holiday_id_migration_runs_once(dynamodb_tables):
+    """Test that legacy holidays are re-keyed on the first run and later runs do nothing."""
+    legacy = {"id": "3f2b8c1e-legacy", "name": "New Year", "date": "2024-01-01", "created_at": "2023-12-01T00:00:00"}
+    await asyncio.to_thread(dynamodb.holidays_table.put_item, Item=legacy)
+
+    await migrate_holiday_ids()
+    assert [holiday["id"] for holiday in await dynamodb.get_all_holidays()] == ["holiday-2024-01-01"]
+
+    # A holiday written with an old id afterwards is left alone
+    await asyncio.to_thread(dynamodb.holidays_table.put_item, Item=dict(legacy, id="late-legacy"))
+    await migrate_holiday_ids()
+    assert len(await dynamodb.get_all_holidays()) == 2
@@ -0,0 +1,114 @@
+"""
+Tests for DynamoDB pagination utilities.
+"""
+import threading
+import time
+import pytest
+from app.db.pagination import paginate, parallel_paginate, parallel_scan
+
+
+class PagedTable:
+    """Table stand-in that returns items a few at a time with LastEvaluatedKey."""
+    def __init__(self, items, page_size):
+        self.items = items
+        self.page_size = page_size
+        self.requests = []
+
+    def scan(self, **kwargs):
+        self.requests.append(kwargs)
+        start = kwargs.get("ExclusiveStartKey", {}).get("index", 0)
+        page = self.items[start:start + self.page_size]
+        response = {"Items": page}
+        if start + self.page_size < len(self.items):
+            response["LastEvaluatedKey"] = {"index": start + self.page_size}
+        return response
+
+
+@pytest.mark.asyncio
+async def test_paginate_follows_last_evaluated_key():
+    """Test that paginate streams every page, not just the first."""
+    table = PagedTable([{"id": i} for i in range(7)], page_size=3)
+
+    items = [item async for item in paginate(table.scan, FilterExpression="x")]
+
+    assert [item["id"] for item in items] == list(range(7))
+    assert len(table.requests) == 3
+    assert all(request["FilterExpression"] == "x" for request in table.requests)
+    assert table.requests[1]["ExclusiveStartKey"] == {"index": 3}
+
+
+@pytest.mark.asyncio
+async def test_paginate_fetches_pages_lazily():
+    """Test that later pages are only requested as the stream is consumed."""
+    table = PagedTable([{"id": i} for i in range(10)], page_size=2)
+    stream = paginate(table.scan)
+
+    first = await stream.__anext__()
+    await stream.aclose()
+
+    assert first == {"id": 0}
+    assert len(table.requests) == 1
+
+
+class SegmentedTable:
+    """Table stand-in that serves each scan segment in pages of two items."""
+    def __init__(self, segments):
+        self.segments = segments
+        self.requests = []
+
+    def scan(self, **kwargs):
+        self.requests.append(kwargs)
+        items = self.segments[kwargs["Segment"]]
+        start = kwargs.get("ExclusiveStartKey", {}).get("index", 0)
+        response = {"Items": items[start:start + 2]}
+        if start + 2 < len(items):
+            response["LastEvaluatedKey"] = {"index": start + 2}
+        return response
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_merges_every_segment():
+    """Test that a parallel scan reads all pages of all segments."""
+    segments = [[{"id": f"{s}-{i}"} for i in range(5)] for s in range(3)]
+    table = SegmentedTable(segments)
+
+    items = [item async for item in parallel_scan(table.scan, 3, Limit=10)]
+
+    assert sorted(item["id"] for item in items) == sorted(item["id"] for segment in segments for item in segment)
+    assert {request["Segment"] for request in table.requests} == {0, 1, 2}
+    assert all(request["TotalSegments"] == 3 and request["Limit"] == 10 for request in table.requests)
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_propagates_errors():
+    """Test that a failing segment fails the whole scan."""
+    def scan(**kwargs):
+        if kwargs["Segment"] == 1:
+            raise RuntimeError("throttled")
+        return {"Items": [{"id": kwargs["Segment"]}]}
+
+    with pytest.raises(RuntimeError):
+        [item async for item in parallel_scan(scan, 2)]
+
+
+@pytest.mark.asyncio
+async def test_parallel_paginate_bounds_concurrent_requests():
+    """Test that many requests are read a few at a time, not all at once."""
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def query(**kwargs):
+        with lock:
+            running.append(kwargs["shard"])
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(kwargs["shard"])
+        return {"Items": [{"id": kwargs["shard"]}]}
+
+    requests = [{"shard": shard} for shard in range(12)]
+    items = [item async for item in parallel_paginate(query, requests, max_concurrency=3)]
+
+    assert sorted(item["id"] for item in items) == list(range(12))
+    assert max(peak) <= 3
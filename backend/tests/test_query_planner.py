@@ -0,0 +1,47 @@
+"""
+Tests for the time log access path planner.
+"""
+from datetime import datetime
+from app.core.config import settings
+from app.db.query_planner import AccessPath, plan_timelog_query
+
+
+def test_user_filter_uses_user_index():
+    """Test that a user filter is served by one partition query."""
+    plan = plan_timelog_query(user_id="user-1", is_overtime=True)
+
+    assert plan.path == AccessPath.USER_INDEX_QUERY
+    assert len(plan.requests) == 1
+    assert plan.requests[0]["KeyConditionExpression"] == "user_id = :user_id"
+    assert plan.requests[0]["FilterExpression"] == "is_overtime = :is_overtime"
+
+
+def test_user_and_dates_use_sort_key_range():
+    """Test that a date range for one user becomes a key condition, not a filter."""
+    plan = plan_timelog_query(datetime(2024, 1, 1), datetime(2024, 3, 31), user_id="user-1")
+
+    assert plan.path == AccessPath.USER_INDEX_RANGE_QUERY
+    assert plan.requests[0]["KeyConditionExpression"].endswith("start_time BETWEEN :start_date AND :end_date")
+    assert "FilterExpression" not in plan.requests[0]
+
+
+def test_date_range_across_users_uses_month_index():
+    """Test that a bounded range across users queries every shard of every month in it."""
+    plan = plan_timelog_query(datetime(2023, 12, 15), datetime(2024, 2, 1))
+
+    assert plan.path == AccessPath.MONTH_INDEX_RANGE_QUERY
+    partitions = [request["ExpressionAttributeValues"][":month_shard"] for request in plan.requests]
+    assert len(partitions) == 3 * settings.DYNAMODB_MONTH_SHARDS
+    assert partitions[0] == "2023-12#0"
+    assert partitions[-1] == f"2024-02#{settings.DYNAMODB_MONTH_SHARDS - 1}"
+
+
+def test_open_ended_range_falls_back_to_scan():
+    """Test that filters no index can narrow are read with a scan."""
+    plan = plan_timelog_query(start_date=datetime(2024, 1, 1))
+
+    assert plan.path == AccessPath.PARALLEL_SCAN
+    assert plan.requests == [{
+        "FilterExpression": "start_time >= :start_date",
+        "ExpressionAttributeValues": {":start_date": "2024-01-01T00:00:00"},
+    }]
@@ -0,0 +1,61 @@
+"""
+Tests for the summary report cache.
+"""
+import asyncio
+from datetime import datetime
+from app.services.report_cache import ReportCache, report_cache, report_key
+from app.services.timelog_service import create_time_entry
+
+
+def _add_entry(user_id: str, day: datetime) -> dict:
+    return asyncio.run(create_time_entry(user_id, day.replace(hour=9), day.replace(hour=17)))
+
+
+def test_invalidation_is_limited_to_user_and_month():
+    """Test that a write only drops reports that can include the written log."""
+    cache = ReportCache(maxsize=10, ttl=60)
+    march = report_key(datetime(2024, 3, 1), datetime(2024, 3, 31), None, None)
+    march_user_1 = report_key(datetime(2024, 3, 1), datetime(2024, 3, 31), "user-1", "day")
+    march_user_2 = report_key(datetime(2024, 3, 1), datetime(2024, 3, 31), "user-2", None)
+    april = report_key(datetime(2024, 4, 1), None, None, None)
+    for key in (march, march_user_1, march_user_2, april):
+        cache.set(key, {"total_entries": 1}, cache.generation)
+
+    assert cache.invalidate_user_month("user-1", datetime(2024, 3, 15, 9)) == 2
+
+    assert cache.get(march) is None and cache.get(march_user_1) is None
+    assert cache.get(march_user_2) is not None and cache.get(april) is not None
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_result_computed_across_a_write_is_not_stored():
+    """Test that a report started before an invalidation is not cached."""
+    cache = ReportCache(maxsize=10, ttl=60)
+    key = report_key(None, None, None, None)
+    generation = cache.generation
+
+    cache.invalidate_user_month("user-1", datetime(2024, 3, 15))
+    cache.set(key, {"total_entries": 1}, generation)
+
+    assert cache.get(key) is None
+
+
+def test_summary_is_cached_until_a_matching_log_changes(admin_client, dynamodb_calls):
+    """Test that repeated summaries skip DynamoDB and writes in the range show up immediately."""
+    _add_entry("user-1", datetime(2024, 3, 4))
+    params = {"start_date": "2024-03-01T00:00:00", "end_date": "2024-03-31T23:59:59"}
+    assert admin_client.get("/api/reports/summary", params=params).json()["total_entries"] == 1
+    dynamodb_calls.clear()
+
+    assert admin_client.get("/api/reports/summary", params=params).json()["total_entries"] == 1
+    assert dynamodb_calls == []
+
+    _add_entry("user-2", datetime(2024, 5, 6))
+    admin_client.get("/api/reports/summary", params=params)
+    assert report_cache.stats()["hits"] == 2
+
+    log = _add_entry("user-2", datetime(2024, 3, 5))
+    assert admin_client.get("/api/reports/summary", params=params).json()["total_entries"] == 2
+
+    assert admin_client.delete(f"/api/timelogs/{log['log_id']}").status_code == 204
+    assert admin_client.get("/api/reports/summary", params=params).json()["total_entries"] == 1
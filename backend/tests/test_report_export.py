@@ -0,0 +1,144 @@
+"""
+Tests for streaming report exports.
+"""
+import asyncio
+import csv
+import gzip
+import io
+import threading
+import pytest
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from datetime import date, datetime, timedelta, timezone
+from app.db import dynamodb
+from app.services import report_export
+from app.services.report_export import EXCEL_MEDIA_TYPE, EXPORT_COLUMNS, iter_csv, iter_excel
+
+
+async def _rows(count):
+    for n in range(count):
+        yield [f"2024-01-{n % 28 + 1:02d}", f"User {n}", "", "", 0, 8.0, "No"]
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_csv_is_streamed_in_bounded_chunks(monkeypatch):
+    """Test that the header goes out first and rows follow in chunks of about CSV_CHUNK_SIZE."""
+    monkeypatch.setattr(report_export, "CSV_CHUNK_SIZE", 1024)
+
+    chunks = await _collect(iter_csv(_rows(500)))
+
+    assert chunks[0].decode().strip() == ",".join(EXPORT_COLUMNS)
+    assert len(chunks) > 10
+    assert max(len(chunk) for chunk in chunks) < 2048
+    assert len(list(csv.reader(io.StringIO(b"".join(chunks).decode())))) == 501
+
+
+@pytest.mark.asyncio
+async def test_gzip_csv_decompresses_to_plain_csv():
+    """Test that the compressed stream is one valid gzip member with the same content."""
+    plain = b"".join(await _collect(iter_csv(_rows(200))))
+    compressed = b"".join(await _collect(iter_csv(_rows(200), compress=True)))
+
+    assert gzip.decompress(compressed) == plain
+    assert len(compressed) < len(plain)
+
+
+def test_export_csv_endpoint(admin_client, create_timelog):
+    """Test that the CSV endpoint exports every matching log with employee names."""
+    user = asyncio.run(dynamodb.create_user({
+        "name": "Hanako", "email": "hanako@example.com", "password_hash": "x", "role": "employee"
+    }))
+    for day in range(1, 4):
+        asyncio.run(create_timelog(user["user_id"], datetime(2024, 3, day, 9), hours=10))
+
+    response = admin_client.get("/api/reports/export/csv", params={"user_id": user["user_id"], "gzip": True})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted(row["Date"] for row in rows) == ["2024-03-01", "2024-03-02", "2024-03-03"]
+    assert {row["Employee"] for row in rows} == {"Hanako"}
+    assert rows[0]["Start Time"].startswith(rows[0]["Date"] + "T09:00")
+
+
+@pytest.mark.asyncio
+async def test_excel_export_is_a_complete_workbook():
+    """Test that the write-only workbook holds the header and every row."""
+    data = b"".join(await _collect(iter_excel(_rows(300))))
+
+    sheet = load_workbook(io.BytesIO(data), read_only=True)["Time Logs"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert len(rows) == 301
+    assert rows[-1][1] == "User 299"
+
+
+@pytest.mark.asyncio
+async def test_excel_rows_are_appended_off_the_event_loop(monkeypatch):
+    """Test that sheet appends run in worker threads, one chunk per call."""
+    monkeypatch.setattr(report_export, "EXCEL_APPEND_CHUNK_SIZE", 100)
+    loop_thread = threading.get_ident()
+    append_threads = set()
+    append = WriteOnlyWorksheet.append
+
+    def recording_append(sheet, row):
+        append_threads.add(threading.get_ident())
+        append(sheet, row)
+
+    monkeypatch.setattr(WriteOnlyWorksheet, "append", recording_append)
+    data = b"".join(await _collect(iter_excel(_rows(250))))
+
+    assert append_threads and loop_thread not in append_threads
+    rows = list(load_workbook(io.BytesIO(data), read_only=True)["Time Logs"].iter_rows(values_only=True))
+    assert len(rows) == 251
+    assert rows[-1][1] == "User 249"
+
+
+def test_export_excel_endpoint(admin_client, create_timelog):
+    """Test that the Excel endpoint streams a workbook of the matching logs."""
+    asyncio.run(create_timelog("user-1", datetime(2024, 3, 1, 9)))
+
+    response = admin_client.get("/api/reports/export/excel", params={"user_id": "user-1"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == EXCEL_MEDIA_TYPE
+    rows = list(load_workbook(io.BytesIO(response.content), read_only=True)["Time Logs"].iter_rows(values_only=True))
+    assert rows[1][0] == "2024-03-01"
+    assert rows[1][1] == "Unknown"
+
+
+def test_export_parquet_endpoint_writes_typed_row_groups(admin_client, monkeypatch, create_timelog):
+    """Test that the Parquet export has typed columns and is written in row groups."""
+    monkeypatch.setattr(report_export, "PARQUET_ROW_GROUP_SIZE", 2)
+    for day in range(1, 6):
+        asyncio.run(create_timelog("user-1", datetime(2024, 3, day, 9), hours=10))
+
+    response = admin_client.get("/api/reports/export/parquet", params={"user_id": "user-1"})
+
+    assert response.status_code == 200
+    parquet_file = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.num_rows == 5
+    assert str(table.schema.field("start_time").type) == "timestamp[us]"
+    assert str(table.schema.field("attendance_type").type) == "dictionary<values=string, indices=int32, ordered=0>"
+    assert sorted(table.column("start_time").to_pylist())[0] == datetime(2024, 3, 1, 9)
+    assert table.column("total_hours").to_pylist() == [10.0] * 5
+    assert table.column("is_overtime").type == "bool"
+
+
+def test_export_parquet_keeps_local_times_of_aware_logs(admin_client, create_timelog):
+    """Test that a log recorded with a UTC offset keeps its wall-clock time and date."""
+    asyncio.run(create_timelog("user-1", datetime(2024, 3, 1, 1, tzinfo=timezone(timedelta(hours=2))), hours=4))
+
+    response = admin_client.get("/api/reports/export/parquet", params={"user_id": "user-1"})
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("date").to_pylist() == [date(2024, 3, 1)]
+    assert table.column("start_time").to_pylist() == [datetime(2024, 3, 1, 1)]
+    assert table.column("end_time").to_pylist() == [datetime(2024, 3, 1, 5)]
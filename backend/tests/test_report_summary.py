@@ -0,0 +1,67 @@
+"""
+Tests for the streaming summary report.
+"""
+import asyncio
+import pytest
+from datetime import datetime
+from app.models.report import SummaryGroupBy
+from app.services.report_summary import summarize_timelogs
+
+
+@pytest.mark.asyncio
+async def test_summary_covers_every_page(dynamodb_tables, monkeypatch, create_timelog):
+    """Test that totals include logs beyond the first DynamoDB page."""
+    from app.db import pagination
+    original = pagination.paginate_pages
+
+    async def small_pages(operation, **kwargs):
+        async for page in original(operation, **dict(kwargs, Limit=2)):
+            yield page
+
+    monkeypatch.setattr(pagination, "paginate_pages", small_pages)
+    for day in range(1, 11):
+        await create_timelog("user-1", datetime(2024, 4, day, 9), 8)
+
+    summary = await summarize_timelogs(datetime(2024, 4, 1), datetime(2024, 4, 30, 23, 59))
+
+    assert summary["total_entries"] == 10
+    assert summary["total_hours"] == 80
+    assert summary["average_hours_per_day"] == 8
+
+
+@pytest.mark.asyncio
+async def test_summary_groups(dynamodb_tables, create_timelog):
+    """Test the per-user, per-week and per-location breakdowns."""
+    await create_timelog("user-1", datetime(2024, 1, 1, 9), 10, is_overtime=True, overtime_hours=2.0,
+                         work_location="office")
+    await create_timelog("user-1", datetime(2024, 1, 1, 20), 2, work_location="remote")
+    await create_timelog("user-2", datetime(2024, 1, 8, 9), 8, work_location=None)
+
+    by_user = await summarize_timelogs(group_by=SummaryGroupBy.USER)
+    by_week = await summarize_timelogs(group_by=SummaryGroupBy.WEEK)
+    by_location = await summarize_timelogs(group_by=SummaryGroupBy.WORK_LOCATION)
+
+    assert by_user["total_entries"] == 3
+    assert by_user["total_overtime_hours"] == 2.0
+    assert by_user["groups"] == [
+        {"key": "user-1", "total_hours": 12.0, "total_overtime_hours": 2.0, "total_entries": 2,
+         "average_hours_per_day": 12.0, "overtime_entries": 1},
+        {"key": "user-2", "total_hours": 8.0, "total_overtime_hours": 0.0, "total_entries": 1,
+         "average_hours_per_day": 8.0, "overtime_entries": 0},
+    ]
+    assert [group["key"] for group in by_week["groups"]] == ["2024-W01", "2024-W02"]
+    assert [group["key"] for group in by_location["groups"]] == ["office", "remote", None]
+
+
+def test_summary_endpoint(admin_client, create_timelog):
+    """Test the summary endpoint with and without a breakdown."""
+    asyncio.run(create_timelog("user-1", datetime(2024, 2, 1, 9), 8))
+    asyncio.run(create_timelog("user-1", datetime(2024, 3, 1, 9), 6))
+
+    plain = admin_client.get("/api/reports/summary").json()
+    monthly = admin_client.get("/api/reports/summary", params={"group_by": "month"}).json()
+
+    assert plain["total_hours"] == 14 and "groups" not in plain
+    assert monthly["group_by"] == "month"
+    assert [(group["key"], group["total_hours"]) for group in monthly["groups"]] == [("2024-02", 8), ("2024-03", 6)]
+    assert admin_client.get("/api/reports/summary", params={"group_by": "year"}).status_code == 422
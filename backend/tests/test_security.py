@@ -0,0 +1,101 @@
+"""
+Tests for password hashing and tokens.
+"""
+import asyncio
+import time
+from datetime import timedelta
+import pytest
+from app.core import security
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.db import dynamodb
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    """Test that the event loop keeps running while bcrypt works."""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    hashed = await security.get_password_hash_async("Secret123!")
+    assert await security.verify_password_async("Secret123!", hashed)
+    task.cancel()
+
+    assert ticks > 2
+
+
+@pytest.mark.asyncio
+async def test_password_queue_depth_is_limited(monkeypatch):
+    """Test that calls beyond the pending limit are rejected instead of queued."""
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+
+    results = await asyncio.gather(
+        security.get_password_hash_async("Secret123!"),
+        security.get_password_hash_async("Secret123!"),
+        return_exceptions=True
+    )
+
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], ServiceUnavailableError)
+    assert results[1].headers == {"Retry-After": "1"}
+
+
+def test_login_rehashes_password_with_new_cost(client, dynamodb_tables, monkeypatch):
+    """Test that logging in upgrades a hash made with another bcrypt cost."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    user = asyncio.run(dynamodb.create_user({
+        "name": "Employee", "email": "employee@example.com", "role": "employee",
+        "password_hash": security.get_password_hash("Secret123!"),
+    }))
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+
+    response = client.post("/api/auth/login", json={"email": "employee@example.com", "password": "Secret123!"})
+
+    assert response.status_code == 200
+    stored = asyncio.run(dynamodb.get_user_by_id_with_secret(user["user_id"]))["password_hash"]
+    assert stored.startswith("$2b$05$")
+    assert security.verify_password("Secret123!", stored)
+    assert not security.password_needs_rehash(stored)
+
+
+def test_verified_tokens_skip_signature_check(monkeypatch):
+    """Test that a repeat token is served from the cache and counted as a hit."""
+    security.verified_token_cache.clear()
+    token = security.create_access_token({"sub": "user-1", "role": "employee"})
+    decodes = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *args, **kwargs: decodes.append(1) or real_decode(*args, **kwargs))
+    hits, misses = security.verified_token_cache.hits, security.verified_token_cache.misses
+
+    for _ in range(3):
+        assert security.decode_access_token(token)["sub"] == "user-1"
+
+    assert len(decodes) == 1
+    assert security.verified_token_cache.hits - hits == 2
+    assert security.verified_token_cache.misses - misses == 1
+    # Refresh tokens and tampered tokens are never cached as valid
+    assert security.decode_access_token(security.create_refresh_token({"sub": "user-1"})) is None
+    assert security.decode_access_token(token[:-2] + "xx") is None
+
+
+def test_cached_token_expires_with_token(monkeypatch):
+    """Test that a cache entry does not outlive the token's exp."""
+    security.verified_token_cache.clear()
+    token = security.create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=60))
+    assert security.decode_access_token(token)
+    assert security.decode_access_token(token)
+    misses = security.verified_token_cache.misses
+
+    # Past exp the entry is gone and the token goes through full verification again
+    later = time.monotonic() + 61
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    security.decode_access_token(token)
+
+    assert security.verified_token_cache.misses == misses + 1
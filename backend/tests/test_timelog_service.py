@@ -0,0 +1,167 @@
+"""
+Tests for the time log service.
+"""
+import asyncio
+import pytest
+from datetime import datetime, date
+from app.db import dynamodb
+from app.services import timelog_service
+from app.services.timelog_service import create_time_entry, update_time_entry, calculate_daily_overtime
+
+
+@pytest.mark.asyncio
+async def test_daily_overtime_is_distributed_across_same_day_logs(dynamodb_tables):
+    """Test that overtime is split proportionally across a weekday's logs."""
+    # 2024-01-10 is a Wednesday: 2 entries -> 16h expected, 20h worked -> 4h overtime
+    first = await create_time_entry("user-1", datetime(2024, 1, 10, 6), datetime(2024, 1, 10, 18))
+    second = await create_time_entry("user-1", datetime(2024, 1, 10, 19), datetime(2024, 1, 11, 3))
+    # A log on another day must not be touched
+    other = await create_time_entry("user-1", datetime(2024, 1, 9, 9), datetime(2024, 1, 9, 17))
+
+    first = await dynamodb.get_timelog_by_id(first["log_id"])
+    second = await dynamodb.get_timelog_by_id(second["log_id"])
+    other = await dynamodb.get_timelog_by_id(other["log_id"])
+
+    assert first["overtime_hours"] == 2.4
+    assert second["overtime_hours"] == 1.6
+    assert first["is_overtime"] and second["is_overtime"]
+    assert other["overtime_hours"] == 0.0
+    assert other["is_overtime"] is False
+
+
+@pytest.mark.asyncio
+async def test_weekend_hours_are_all_overtime(dynamodb_tables):
+    """Test that every hour logged on a weekend counts as overtime."""
+    # 2024-01-13 is a Saturday
+    log = await create_time_entry("user-1", datetime(2024, 1, 13, 9), datetime(2024, 1, 13, 12))
+    assert log["overtime_hours"] == 3.0
+
+    updated = await update_time_entry(
+        log["log_id"], start_time=datetime(2024, 1, 13, 9), end_time=datetime(2024, 1, 13, 11)
+    )
+    assert updated["overtime_hours"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_unchanged_overtime_is_not_rewritten(dynamodb_tables, dynamodb_calls):
+    """Test that recomputing a day whose overtime is already correct writes nothing."""
+    await create_time_entry("user-1", datetime(2024, 1, 10, 6), datetime(2024, 1, 10, 18))
+    await create_time_entry("user-1", datetime(2024, 1, 10, 19), datetime(2024, 1, 11, 3))
+    dynamodb_calls.clear()
+
+    await calculate_daily_overtime("user-1", datetime(2024, 1, 10))
+
+    assert "TransactWriteItems" not in dynamodb_calls
+    assert "UpdateItem" not in dynamodb_calls
+
+
+@pytest.mark.asyncio
+async def test_daily_totals_follow_log_writes(dynamodb_tables):
+    """Test that creating, moving and deleting logs keeps the daily totals in step."""
+    first = await create_time_entry("user-1", datetime(2024, 1, 10, 9), datetime(2024, 1, 10, 17))
+    await create_time_entry("user-1", datetime(2024, 1, 10, 18), datetime(2024, 1, 10, 20), attendance_type="paid_leave")
+
+    totals = await dynamodb.get_daily_total("user-1", date(2024, 1, 10))
+    assert totals["total_hours"] == 10.0
+    assert totals["entry_count"] == 2
+    assert totals["work_hours"] == 8.0
+    assert totals["work_entry_count"] == 1
+
+    # Moving the log to another day shifts its hours between the two totals
+    await update_time_entry(first["log_id"], start_time=datetime(2024, 1, 11, 9), end_time=datetime(2024, 1, 11, 19))
+    assert (await dynamodb.get_daily_total("user-1", date(2024, 1, 10)))["work_hours"] == 0.0
+    moved = await dynamodb.get_daily_total("user-1", date(2024, 1, 11))
+    assert moved["work_hours"] == 10.0
+    assert moved["overtime_hours"] == 2.0
+
+    await dynamodb.delete_timelog(first["log_id"])
+    assert (await dynamodb.get_daily_total("user-1", date(2024, 1, 11)))["entry_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_missing_daily_totals_are_built_from_the_logs(dynamodb_tables):
+    """Test that a day logged before its totals item existed is recomputed from its logs."""
+    log = await create_time_entry("user-1", datetime(2024, 1, 10, 6), datetime(2024, 1, 10, 18))
+    assert log["overtime_hours"] == 4.0
+    await asyncio.to_thread(dynamodb.daily_totals_table.delete_item, Key={"user_id": "user-1", "date": "2024-01-10"})
+
+    updated = await update_time_entry(log["log_id"], end_time=datetime(2024, 1, 10, 16))
+
+    assert updated["overtime_hours"] == 2.0
+    totals = await dynamodb.get_daily_total("user-1", date(2024, 1, 10))
+    assert totals["total_hours"] == 10.0
+    assert totals["entry_count"] == 1
+    assert totals["work_entry_count"] == 1
+    assert totals["overtime_hours"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_overtime_pass_creates_missing_daily_totals(dynamodb_tables, create_timelog):
+    """Test that recomputing a day without a totals item distributes it and creates the item."""
+    log = await create_timelog("user-1", datetime(2024, 1, 10, 6), 12)
+    await asyncio.to_thread(dynamodb.daily_totals_table.delete_item, Key={"user_id": "user-1", "date": "2024-01-10"})
+
+    day_logs = await calculate_daily_overtime("user-1", datetime(2024, 1, 10))
+
+    assert [l["overtime_hours"] for l in day_logs] == [4.0]
+    assert (await dynamodb.get_timelog_by_id(log["log_id"]))["overtime_hours"] == 4.0
+    totals = await dynamodb.get_daily_total("user-1", date(2024, 1, 10))
+    assert totals["work_hours"] == 12.0
+    assert totals["overtime_hours"] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_day_without_overtime_skips_reading_logs(dynamodb_tables, dynamodb_calls):
+    """Test that a weekday under the threshold is decided from the daily totals alone."""
+    await create_time_entry("user-1", datetime(2024, 1, 10, 9), datetime(2024, 1, 10, 17))
+    dynamodb_calls.clear()
+
+    await create_time_entry("user-1", datetime(2024, 1, 10, 18), datetime(2024, 1, 10, 20))
+
+    # duplicate check, the new log and its daily totals, the totals read; holidays are cached
+    assert dynamodb_calls == ["Query", "PutItem", "UpdateItem", "GetItem"]
+
+
+@pytest.fixture
+def lagging_index(monkeypatch):
+    """Make the day's log reads miss the logs whose ids are added to the returned set."""
+    hidden = set()
+    read_day = timelog_service.get_timelogs_by_user_for_day
+
+    async def stale_read(user_id, day):
+        return [log for log in await read_day(user_id, day) if log["log_id"] not in hidden]
+
+    monkeypatch.setattr(timelog_service, "get_timelogs_by_user_for_day", stale_read)
+    monkeypatch.setattr(timelog_service, "OVERTIME_RECALC_BACKOFF_SECONDS", 0)
+    return hidden
+
+
+@pytest.mark.asyncio
+async def test_own_write_counts_before_the_index_shows_it(dynamodb_tables, monkeypatch):
+    """Test that a log the index does not show yet still gets its overtime."""
+    read_day = timelog_service.get_timelogs_by_user_for_day
+
+    async def without_evening_log(user_id, day):
+        # The index has not caught up with the log being created
+        return [log for log in await read_day(user_id, day) if log["start_time"].hour != 19]
+
+    await create_time_entry("user-1", datetime(2024, 1, 10, 6), datetime(2024, 1, 10, 18))
+    monkeypatch.setattr(timelog_service, "get_timelogs_by_user_for_day", without_evening_log)
+    second = await create_time_entry("user-1", datetime(2024, 1, 10, 19), datetime(2024, 1, 11, 3))
+
+    assert second["overtime_hours"] == 1.6
+    assert (await dynamodb.get_timelog_by_id(second["log_id"]))["overtime_hours"] == 1.6
+    assert (await dynamodb.get_daily_total("user-1", date(2024, 1, 10)))["overtime_hours"] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_lagging_index_does_not_fail_the_write(dynamodb_tables, lagging_index):
+    """Test that a day that keeps failing to recalculate still keeps the saved log."""
+    first = await create_time_entry("user-1", datetime(2024, 1, 10, 6), datetime(2024, 1, 10, 18))
+    # Another request's log the index never catches up with
+    lagging_index.add(first["log_id"])
+
+    second = await create_time_entry("user-1", datetime(2024, 1, 10, 19), datetime(2024, 1, 11, 3))
+
+    assert (await dynamodb.get_timelog_by_id(second["log_id"]))["total_hours"] == 8.0
+    assert (await dynamodb.get_daily_total("user-1", date(2024, 1, 10)))["work_entry_count"] == 2